@@ -0,0 +1,45 @@
+"""add outbox table
+
+Revision ID: 5b7e2c9d41a6
+Revises: 81d335492936
+Create Date: 2026-10-18 10:12:41.327105
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e2c9d41a6'
+down_revision: Union[str, Sequence[str], None] = '81d335492936'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'outbox',
+        sa.Column('oid', sa.Uuid(), nullable=False),
+        sa.Column('notification_key', sa.String(), nullable=False),
+        sa.Column('chat_id', sa.Integer(), nullable=False),
+        sa.Column('text', sa.String(), nullable=False),
+        sa.Column('reply_markup', sa.String(), nullable=True),
+        sa.Column('is_group', sa.Boolean(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('error', sa.String(), nullable=True),
+        sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('oid'),
+        sa.UniqueConstraint('notification_key', 'chat_id'),
+    )
+    op.create_index('ix_outbox_status_created_at', 'outbox', ['status', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_outbox_status_created_at', table_name='outbox')
+    op.drop_table('outbox')
@@ -0,0 +1,34 @@
+"""add push_up created_at indexes
+
+Revision ID: e41f6a0c83d2
+Revises: 5b7e2c9d41a6
+Create Date: 2026-10-18 11:47:05.118342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41f6a0c83d2'
+down_revision: Union[str, Sequence[str], None] = '5b7e2c9d41a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ix_push_up_user_oid is a prefix of the new composite index
+    op.drop_index(op.f('ix_push_up_user_oid'), table_name='push_up')
+    op.create_index('ix_push_up_user_oid_created_at', 'push_up', ['user_oid', 'created_at', 'count'], unique=False)
+    op.create_index('ix_push_up_created_at', 'push_up', ['created_at', 'user_oid', 'count'], unique=False)
+    op.execute('ANALYZE push_up')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_push_up_created_at', table_name='push_up')
+    op.drop_index('ix_push_up_user_oid_created_at', table_name='push_up')
+    op.create_index(op.f('ix_push_up_user_oid'), 'push_up', ['user_oid'], unique=False)
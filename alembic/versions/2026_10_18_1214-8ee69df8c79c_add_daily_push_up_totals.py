@@ -0,0 +1,52 @@
+"""add daily push up totals
+
+Revision ID: 8ee69df8c79c
+Revises: e41f6a0c83d2
+Create Date: 2026-10-18 12:14:17.296976
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8ee69df8c79c'
+down_revision: Union[str, Sequence[str], None] = 'e41f6a0c83d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'daily_push_up_totals',
+        sa.Column('user_oid', sa.Uuid(), nullable=False),
+        sa.Column('moscow_date', sa.Date(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.Column('sets', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_oid'], ['users.oid'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_oid', 'moscow_date'),
+    )
+    op.create_index(
+        'ix_daily_push_up_totals_moscow_date',
+        'daily_push_up_totals',
+        ['moscow_date', 'user_oid', 'total', 'sets'],
+        unique=False,
+    )
+    # Backfill: created_at is stored in UTC, Moscow is UTC+3 all year round
+    op.execute(
+        """
+        INSERT INTO daily_push_up_totals (user_oid, moscow_date, total, sets)
+        SELECT user_oid, date(created_at, '+3 hours'), SUM(count), COUNT(*)
+        FROM push_up
+        GROUP BY user_oid, date(created_at, '+3 hours')
+        """,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_daily_push_up_totals_moscow_date', table_name='daily_push_up_totals')
+    op.drop_table('daily_push_up_totals')
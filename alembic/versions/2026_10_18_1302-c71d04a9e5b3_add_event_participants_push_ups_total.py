@@ -0,0 +1,45 @@
+"""add event_participants push_ups_total
+
+Revision ID: c71d04a9e5b3
+Revises: 8ee69df8c79c
+Create Date: 2026-10-18 13:02:48.604217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c71d04a9e5b3'
+down_revision: Union[str, Sequence[str], None] = '8ee69df8c79c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'event_participants',
+        sa.Column('push_ups_total', sa.Integer(), server_default='0', nullable=False),
+    )
+    # Backfill from the daily totals, Moscow is UTC+3 all year round
+    op.execute(
+        """
+        UPDATE event_participants
+        SET push_ups_total = (
+            SELECT COALESCE(SUM(d.total), 0)
+            FROM daily_push_up_totals AS d, events AS e
+            WHERE e.oid = event_participants.event_oid
+              AND d.user_oid = event_participants.user_oid
+              AND d.moscow_date >= date(e.start_at, '+3 hours')
+              AND (e.completed_at IS NULL OR d.moscow_date <= date(e.completed_at, '+3 hours'))
+        )
+        """,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('event_participants', 'push_ups_total')
@@ -0,0 +1,50 @@
+"""add push up video archive
+
+Revision ID: 3f0c9b7e2a14
+Revises: 8a5b59dfd42a
+Create Date: 2026-10-18 14:36:05.742918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f0c9b7e2a14'
+down_revision: Union[str, Sequence[str], None] = '8a5b59dfd42a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing push-ups keep NULL status, only new videos are queued for archiving.
+    # SQLite can't add a foreign key to an existing table, so the table is rebuilt in batch mode
+    with op.batch_alter_table('push_up') as batch_op:
+        batch_op.add_column(sa.Column('archive_status', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('stored_object_oid', sa.Uuid(), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_push_up_stored_object_oid_stored_object',
+            'stored_object',
+            ['stored_object_oid'],
+            ['oid'],
+            ondelete='SET NULL',
+        )
+    op.create_index(
+        'ix_push_up_archive_pending',
+        'push_up',
+        ['created_at'],
+        unique=False,
+        sqlite_where=sa.text("archive_status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_push_up_archive_pending', table_name='push_up')
+    with op.batch_alter_table('push_up') as batch_op:
+        batch_op.drop_constraint('fk_push_up_stored_object_oid_stored_object', type_='foreignkey')
+        batch_op.drop_column('stored_object_oid')
+        batch_op.drop_column('archive_status')
@@ -0,0 +1,47 @@
+"""add video fingerprints
+
+Revision ID: 059a19b63097
+Revises: 3f0c9b7e2a14
+Create Date: 2026-10-18 15:18:22.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '059a19b63097'
+down_revision: Union[str, Sequence[str], None] = '3f0c9b7e2a14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('push_up', sa.Column('is_duplicate', sa.Boolean(), server_default='0', nullable=False))
+    op.create_table(
+        'video_fingerprints',
+        sa.Column('file_unique_id', sa.String(), nullable=False),
+        sa.Column('push_up_oid', sa.Uuid(), nullable=False),
+        sa.Column('user_oid', sa.Uuid(), nullable=False),
+        sa.Column('content_hash', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['push_up_oid'], ['push_up.oid'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_oid'], ['users.oid'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('file_unique_id'),
+    )
+    op.create_index(
+        'ix_video_fingerprints_content_hash',
+        'video_fingerprints',
+        ['content_hash', 'created_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_video_fingerprints_content_hash', table_name='video_fingerprints')
+    op.drop_table('video_fingerprints')
+    op.drop_column('push_up', 'is_duplicate')
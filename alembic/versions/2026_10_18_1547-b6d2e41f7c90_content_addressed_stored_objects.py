@@ -0,0 +1,40 @@
+"""content addressed stored objects
+
+Revision ID: b6d2e41f7c90
+Revises: 059a19b63097
+Create Date: 2026-10-18 15:47:05.318264
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d2e41f7c90'
+down_revision: Union[str, Sequence[str], None] = '059a19b63097'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('stored_object', sa.Column('content_hash', sa.String(), nullable=True))
+    op.add_column('stored_object', sa.Column('ref_count', sa.Integer(), server_default='0', nullable=False))
+    op.create_index('ix_stored_object_content_hash', 'stored_object', ['content_hash'], unique=True)
+    op.create_index('ix_stored_object_ref_count', 'stored_object', ['ref_count'], unique=False)
+    op.create_index('ix_push_up_stored_object_oid', 'push_up', ['stored_object_oid'], unique=False)
+    op.execute(
+        'UPDATE stored_object SET ref_count = '
+        '(SELECT COUNT(*) FROM push_up WHERE push_up.stored_object_oid = stored_object.oid)'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_push_up_stored_object_oid', table_name='push_up')
+    op.drop_index('ix_stored_object_ref_count', table_name='stored_object')
+    op.drop_index('ix_stored_object_content_hash', table_name='stored_object')
+    op.drop_column('stored_object', 'ref_count')
+    op.drop_column('stored_object', 'content_hash')
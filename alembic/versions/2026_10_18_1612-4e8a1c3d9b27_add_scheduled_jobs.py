@@ -0,0 +1,36 @@
+"""add scheduled jobs
+
+Revision ID: 4e8a1c3d9b27
+Revises: b6d2e41f7c90
+Create Date: 2026-10-18 16:12:41.270931
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e8a1c3d9b27'
+down_revision: Union[str, Sequence[str], None] = 'b6d2e41f7c90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'scheduled_jobs',
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('due_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('key'),
+    )
+    op.create_index('ix_scheduled_jobs_due_at', 'scheduled_jobs', ['due_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_scheduled_jobs_due_at', table_name='scheduled_jobs')
+    op.drop_table('scheduled_jobs')
@@ -0,0 +1,53 @@
+"""add push up streaks
+
+Revision ID: 9d3f5b2a7e61
+Revises: 4e8a1c3d9b27
+Create Date: 2026-10-18 16:48:09.512377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d3f5b2a7e61'
+down_revision: Union[str, Sequence[str], None] = '4e8a1c3d9b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'push_up_streaks',
+        sa.Column('user_oid', sa.Uuid(), nullable=False),
+        sa.Column('first_day', sa.Date(), nullable=False),
+        sa.Column('last_day', sa.Date(), nullable=False),
+        sa.ForeignKeyConstraint(['user_oid'], ['users.oid'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_oid'),
+    )
+    # Backfill: the last run of consecutive days, in a run `day - row number` is constant
+    op.execute(
+        """
+        INSERT INTO push_up_streaks (user_oid, first_day, last_day)
+        SELECT user_oid, MIN(moscow_date), MAX(moscow_date)
+        FROM (
+            SELECT
+                user_oid,
+                moscow_date,
+                julianday(moscow_date) - ROW_NUMBER() OVER (PARTITION BY user_oid ORDER BY moscow_date) AS run,
+                julianday(MAX(moscow_date) OVER (PARTITION BY user_oid))
+                    - COUNT(*) OVER (PARTITION BY user_oid) AS last_run
+            FROM daily_push_up_totals
+        )
+        WHERE run = last_run
+        GROUP BY user_oid
+        """,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('push_up_streaks')
@@ -0,0 +1,32 @@
+"""add push up archive retries
+
+Revision ID: 5a7c2e9f1d48
+Revises: 9d3f5b2a7e61
+Create Date: 2026-10-18 18:15:37.804216
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a7c2e9f1d48'
+down_revision: Union[str, Sequence[str], None] = '9d3f5b2a7e61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('push_up') as batch_op:
+        batch_op.add_column(sa.Column('archive_retry_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.add_column(sa.Column('archive_attempts', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('push_up') as batch_op:
+        batch_op.drop_column('archive_attempts')
+        batch_op.drop_column('archive_retry_at')
@@ -1,12 +1,14 @@
+from collections.abc import Iterable
 from uuid import UUID
 
-from sqlalchemy import Select, select
+from sqlalchemy import Select, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from btc_challenge.chats.adapters.sqlite.mapper import SqliteChatMapper
 from btc_challenge.chats.adapters.sqlite.model import ChatORM
 from btc_challenge.chats.domain.entity import Chat
 from btc_challenge.chats.domain.repository import IChatRepository
+from btc_challenge.shared.providers import DatetimeProvider
 
 
 class ChatRepository(IChatRepository):
@@ -43,3 +45,14 @@ class ChatRepository(IChatRepository):
         cursor = await self._session.execute(query)
         rows = cursor.scalars().all()
         return [self._mapper.to_entity(row) for row in rows]
+
+    async def deactivate_many(self, telegram_chat_ids: Iterable[int]) -> None:
+        telegram_chat_ids = list(telegram_chat_ids)
+        if not telegram_chat_ids:
+            return
+        query = (
+            update(ChatORM)
+            .where(ChatORM.telegram_chat_id.in_(telegram_chat_ids), ChatORM.is_active.is_(True))
+            .values(is_active=False, updated_at=DatetimeProvider.provide())
+        )
+        await self._session.execute(query)
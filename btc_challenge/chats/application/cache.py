@@ -0,0 +1,50 @@
+from collections.abc import Iterable
+from functools import lru_cache
+
+from btc_challenge.chats.domain.entity import Chat
+from btc_challenge.chats.domain.repository import IChatRepository
+from btc_challenge.config import AppConfig
+from btc_challenge.shared.cache import SnapshotCache
+
+# Только для вебхука с несколькими процессами: изменения из других процессов видны через это время
+ACTIVE_CHAT_CACHE_TTL = 5.0
+
+
+class ActiveChatCache:
+    """Active group chats for notification fan-out, newest first like `IChatRepository.get_many`.
+
+    The list is loaded on first use and then kept up to date by the chat interactors and by the
+    outbox worker, which deactivates chats that fail to receive messages. Cached chats are shared,
+    callers must not modify them.
+    """
+
+    __slots__ = ('_snapshot',)
+
+    def __init__(self, ttl: float | None = None):
+        self._snapshot: SnapshotCache[list[Chat]] = SnapshotCache(ttl)
+
+    async def get_active_chats(self, chat_repository: IChatRepository) -> list[Chat]:
+        return await self._snapshot.get(lambda: chat_repository.get_many(is_active=True))
+
+    def add(self, chat: Chat) -> None:
+        """Add a created or reactivated chat."""
+        chats = self._snapshot.peek()
+        if chats is None:
+            self._snapshot.invalidate()
+            return
+        others = [cached for cached in chats if cached.telegram_chat_id != chat.telegram_chat_id]
+        self._snapshot.set([chat, *others])
+
+    def discard(self, telegram_chat_ids: Iterable[int]) -> None:
+        """Remove deactivated chats."""
+        chats = self._snapshot.peek()
+        if chats is None:
+            self._snapshot.invalidate()
+            return
+        removed = set(telegram_chat_ids)
+        self._snapshot.set([chat for chat in chats if chat.telegram_chat_id not in removed])
+
+
+@lru_cache(1)
+def get_active_chat_cache() -> ActiveChatCache:
+    return ActiveChatCache(ttl=ACTIVE_CHAT_CACHE_TTL if AppConfig.webhook.multiprocess else None)
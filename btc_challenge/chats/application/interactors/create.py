@@ -1,12 +1,19 @@
+from btc_challenge.chats.application.cache import ActiveChatCache
 from btc_challenge.chats.domain.entity import Chat
 from btc_challenge.chats.domain.repository import IChatRepository
-from btc_challenge.shared.application.commiter import ICommiter
+from btc_challenge.shared.application.write_queue import IResolver, IWriteQueue
 
 
 class CreateChatInteractor:
-    def __init__(self, chat_repository: IChatRepository, commiter: ICommiter):
+    def __init__(
+        self,
+        chat_repository: IChatRepository,
+        write_queue: IWriteQueue,
+        active_chat_cache: ActiveChatCache,
+    ):
         self._chat_repository = chat_repository
-        self._commiter = commiter
+        self._write_queue = write_queue
+        self._active_chat_cache = active_chat_cache
 
     async def execute(
         self,
@@ -25,8 +32,12 @@ class CreateChatInteractor:
             # Reactivate if it was deactivated
             if not existing_chat.is_active:
                 existing_chat.is_active = True
-                await self._chat_repository.update(existing_chat)
-                await self._commiter.commit()
+
+                async def update(scope: IResolver) -> None:
+                    await scope.resolve(IChatRepository).update(existing_chat)
+
+                await self._write_queue.submit(update)
+                self._active_chat_cache.add(existing_chat)
             return existing_chat
 
         chat = Chat.create(
@@ -34,6 +45,10 @@ class CreateChatInteractor:
             chat_type=chat_type,
             title=title,
         )
-        await self._chat_repository.create(chat)
-        await self._commiter.commit()
+
+        async def create(scope: IResolver) -> None:
+            await scope.resolve(IChatRepository).create(chat)
+
+        await self._write_queue.submit(create)
+        self._active_chat_cache.add(chat)
         return chat
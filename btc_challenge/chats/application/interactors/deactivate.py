@@ -1,11 +1,18 @@
+from btc_challenge.chats.application.cache import ActiveChatCache
 from btc_challenge.chats.domain.repository import IChatRepository
-from btc_challenge.shared.application.commiter import ICommiter
+from btc_challenge.shared.application.write_queue import IResolver, IWriteQueue
 
 
 class DeactivateChatInteractor:
-    def __init__(self, chat_repository: IChatRepository, commiter: ICommiter):
+    def __init__(
+        self,
+        chat_repository: IChatRepository,
+        write_queue: IWriteQueue,
+        active_chat_cache: ActiveChatCache,
+    ):
         self._chat_repository = chat_repository
-        self._commiter = commiter
+        self._write_queue = write_queue
+        self._active_chat_cache = active_chat_cache
 
     async def execute(self, telegram_chat_id: int) -> None:
         chat = await self._chat_repository.get_by_telegram_chat_id(telegram_chat_id)
@@ -13,5 +20,9 @@ class DeactivateChatInteractor:
             return
 
         chat.deactivate()
-        await self._chat_repository.update(chat)
-        await self._commiter.commit()
+
+        async def update(scope: IResolver) -> None:
+            await scope.resolve(IChatRepository).update(chat)
+
+        await self._write_queue.submit(update)
+        self._active_chat_cache.discard([telegram_chat_id])
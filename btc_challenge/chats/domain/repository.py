@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
 from uuid import UUID
 
 from btc_challenge.chats.domain.entity import Chat
@@ -24,3 +25,7 @@ class IChatRepository(ABC):
     @abstractmethod
     async def get_many(self, is_active: bool | None = None) -> list[Chat]:
         pass
+
+    @abstractmethod
+    async def deactivate_many(self, telegram_chat_ids: Iterable[int]) -> None:
+        """Deactivate the chats with one UPDATE."""
@@ -1,18 +1,18 @@
 import logging
 
 from aiogram import Router, types
-from aiogram.filters import ChatMemberUpdatedFilter, IS_MEMBER, IS_NOT_MEMBER
-from punq import Container
+from aiogram.filters import IS_MEMBER, IS_NOT_MEMBER, ChatMemberUpdatedFilter
 
 from btc_challenge.chats.application.interactors.create import CreateChatInteractor
 from btc_challenge.chats.application.interactors.deactivate import DeactivateChatInteractor
+from btc_challenge.container import RequestContainer
 
 chats_router = Router()
 logger = logging.getLogger(__name__)
 
 
 @chats_router.my_chat_member(ChatMemberUpdatedFilter(member_status_changed=IS_NOT_MEMBER >> IS_MEMBER))
-async def bot_added_to_chat(event: types.ChatMemberUpdated, container: Container) -> None:
+async def bot_added_to_chat(event: types.ChatMemberUpdated, container: RequestContainer) -> None:
     """Handle bot being added to a group."""
     chat = event.chat
 
@@ -32,7 +32,7 @@ async def bot_added_to_chat(event: types.ChatMemberUpdated, container: Container
 
 
 @chats_router.my_chat_member(ChatMemberUpdatedFilter(member_status_changed=IS_MEMBER >> IS_NOT_MEMBER))
-async def bot_removed_from_chat(event: types.ChatMemberUpdated, container: Container) -> None:
+async def bot_removed_from_chat(event: types.ChatMemberUpdated, container: RequestContainer) -> None:
     """Handle bot being removed from a group."""
     chat = event.chat
 
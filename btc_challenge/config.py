@@ -8,27 +8,103 @@ class TelegramConfig:
     admin_ids: list[int] = get_env_var(key="ADMIN_IDS", cast_to=json.loads, default=[])
 
 
+class WebhookConfig:
+    # polling - long polling, webhook - aiohttp сервер, принимающий апдейты от Telegram
+    mode: str = get_env_var("BOT_MODE", str, default="polling")
+    # Публичный адрес, по которому Telegram доступен сервер. Если не задан, вебхук не регистрируется
+    # (удобно для локальной проверки POST-запросами)
+    base_url: str = get_env_var("WEBHOOK_BASE_URL", str, default="")
+    path: str = get_env_var("WEBHOOK_PATH", str, default="/webhook")
+    secret_token: str = get_env_var("WEBHOOK_SECRET_TOKEN", str, default="")
+    host: str = get_env_var("WEBHOOK_HOST", str, default="0.0.0.0")
+    port: int = get_env_var("WEBHOOK_PORT", int, default=8080)
+    # Количество процессов, слушающих один порт (SO_REUSEPORT)
+    workers: int = get_env_var("WEBHOOK_WORKERS", int, default=1)
+    # Сколько одновременных соединений Telegram может открыть к вебхуку
+    max_connections: int = get_env_var("WEBHOOK_MAX_CONNECTIONS", int, default=40)
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode == "webhook"
+
+    @property
+    def url(self) -> str:
+        return f"{self.base_url.rstrip('/')}{self.path}"
+
+    @property
+    def multiprocess(self) -> bool:
+        """Апдейты обрабатывают несколько процессов, кэши в памяти не видят изменений друг друга"""
+        return self.enabled and self.workers > 1
+
+
 class SqliteConfig:
     database_path: str = get_env_var("DATABASE_PATH", str, default="./app.db")
+    # PRAGMA, применяемые к каждому новому соединению
+    journal_mode: str = get_env_var("SQLITE_JOURNAL_MODE", str, default="WAL")
+    synchronous: str = get_env_var("SQLITE_SYNCHRONOUS", str, default="NORMAL")
+    mmap_size: int = get_env_var("SQLITE_MMAP_SIZE", int, default=256 * 1024 * 1024)
+    cache_size: int = get_env_var("SQLITE_CACHE_SIZE", int, default=-64 * 1024)  # < 0 - размер в KiB
+    temp_store: str = get_env_var("SQLITE_TEMP_STORE", str, default="MEMORY")
+    busy_timeout: int = get_env_var("SQLITE_BUSY_TIMEOUT", int, default=5000)  # мс
+    # Пул read-only соединений для отчетов
+    read_pool_size: int = get_env_var("SQLITE_READ_POOL_SIZE", int, default=4)
+
+    @property
+    def pragmas(self) -> dict[str, str | int]:
+        return {
+            "journal_mode": self.journal_mode,
+            "synchronous": self.synchronous,
+            "mmap_size": self.mmap_size,
+            "cache_size": self.cache_size,
+            "temp_store": self.temp_store,
+            "busy_timeout": self.busy_timeout,
+        }
 
     @property
     def async_url(self) -> str:
         return f"sqlite+aiosqlite:///{self.database_path}"
 
+    @property
+    def readonly_async_url(self) -> str:
+        return f"sqlite+aiosqlite:///file:{self.database_path}?mode=ro&uri=true"
+
+    @property
+    def readonly_pragmas(self) -> dict[str, str | int]:
+        # journal_mode и synchronous относятся к записи, read-only соединение их не меняет
+        pragmas = self.pragmas
+        del pragmas["journal_mode"], pragmas["synchronous"]
+        return pragmas
+
     @property
     def sync_url(self) -> str:
         return f"sqlite:///{self.database_path}"
 
 
+class FsmConfig:
+    # Как часто изменения состояний FSM сбрасываются в SQLite, с
+    flush_interval: float = get_env_var("FSM_FLUSH_INTERVAL", float, default=0.5)
+
+
+class SchedulerConfig:
+    # Как часто планировщик перечитывает задачи из базы, если их могут добавлять другие процессы
+    # (вебхук с несколькими воркерами). В одном процессе планировщик спит до ближайшей задачи
+    resync_interval: float = get_env_var("SCHEDULER_RESYNC_INTERVAL", float, default=60.0)
+
+
 class MinioConfig:
     bucket_name: str = get_env_var("MINIO_BUCKET_NAME", str)
     host: str = get_env_var("MINIO_HOST", str)
     access_key: str = get_env_var("MINIO_ACCESS_KEY", str)
     secret_key: str = get_env_var("MINIO_SECRET_KEY", str)
     secure: bool = get_env_var("MINIO_SECURE", bool, default=False)
+    # Размер пула потоков для запросов к minio
+    max_workers: int = get_env_var("MINIO_MAX_WORKERS", int, default=4)
 
 
 class AppConfig:
     telegram: TelegramConfig = TelegramConfig()
+    webhook: WebhookConfig = WebhookConfig()
     sqlite: SqliteConfig = SqliteConfig()
+    fsm: FsmConfig = FsmConfig()
+    scheduler: SchedulerConfig = SchedulerConfig()
     minio: MinioConfig = MinioConfig()
@@ -1,18 +1,26 @@
-from punq import Container, Scope
+from collections.abc import Callable
+from inspect import isclass
+from typing import Any, TypeVar, get_type_hints
+
+from punq import Container, Scope, empty
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from btc_challenge.chats.adapters.sqlite.repository import ChatRepository
+from btc_challenge.chats.application.cache import ActiveChatCache, get_active_chat_cache
 from btc_challenge.chats.application.interactors.create import CreateChatInteractor
 from btc_challenge.chats.application.interactors.deactivate import DeactivateChatInteractor
 from btc_challenge.chats.application.interactors.get_all import GetAllChatsInteractor
 from btc_challenge.chats.domain.repository import IChatRepository
 from btc_challenge.events.adapters.sqlite.repository import EventRepository
+from btc_challenge.events.application.cache import ActiveEventCache, get_active_event_cache
 from btc_challenge.events.application.interactors.complete import CompleteEventInteractor
 from btc_challenge.events.application.interactors.create import CreateEventInteractor
 from btc_challenge.events.application.interactors.get_participants import GetEventParticipantsInteractor
 from btc_challenge.events.application.interactors.join import JoinEventInteractor
+from btc_challenge.events.application.interactors.rebuild_totals import RebuildEventTotalsInteractor
 from btc_challenge.events.domain.repository import IEventRepository
-from btc_challenge.push_ups.adapters.sqlite.repository import PushUpRepository
+from btc_challenge.push_ups.adapters.sqlite.repository import PushUpRepository, VideoFingerprintRepository
+from btc_challenge.push_ups.application.interactors.check_duplicate import CheckDuplicateVideoInteractor
 from btc_challenge.push_ups.application.interactors.create import CreatePushUpInteractor
 from btc_challenge.push_ups.application.interactors.create_penalty import CreatePushUpPenaltyInteractor
 from btc_challenge.push_ups.application.interactors.get_all_users_stats import GetAllUsersStatsInteractor
@@ -20,41 +28,156 @@ from btc_challenge.push_ups.application.interactors.get_all_users_stats_by_date
     GetAllUsersStatsByDateInteractor,
 )
 from btc_challenge.push_ups.application.interactors.get_daily_stats import GetDailyStatsInteractor
-from btc_challenge.push_ups.domain.repository import IPushUpRepository
+from btc_challenge.push_ups.application.interactors.rebuild_daily_totals import RebuildDailyTotalsInteractor
+from btc_challenge.push_ups.domain.repository import IPushUpRepository, IVideoFingerprintRepository
+from btc_challenge.shared.adapters.minio.storage import init_minio_storage
 from btc_challenge.shared.adapters.sqlite.commiter import Commiter
-from btc_challenge.shared.adapters.sqlite.session import get_async_sessionmaker
+from btc_challenge.shared.adapters.sqlite.session import (
+    ReadOnlySession,
+    get_async_readonly_sessionmaker,
+    get_async_sessionmaker,
+    get_async_writer_sessionmaker,
+)
+from btc_challenge.shared.adapters.sqlite.write_queue import SqliteWriteQueue
 from btc_challenge.shared.application.commiter import ICommiter
+from btc_challenge.shared.application.write_queue import IWriteQueue
+from btc_challenge.shared.storage import IS3Storage
 from btc_challenge.stored_object.adapters.sqlite.repository import StoredObjectRepository
 from btc_challenge.stored_object.domain.repository import IStoredObjectRepository
 from btc_challenge.users.adapters.sqlite.repository import UserRepository
+from btc_challenge.users.application.cache import UserCache, get_user_cache
 from btc_challenge.users.application.interactors.create import CreateUserInteractor
 from btc_challenge.users.application.interactors.get_one import GetUserByTelegramIdInteractor
+from btc_challenge.users.application.interactors.get_or_create import GetOrCreateUserInteractor
 from btc_challenge.users.application.interactors.verify import VerifyUserInteractor
 from btc_challenge.users.domain.repository import IUserRepository
 
+T = TypeVar('T')
+Factory = Callable[['RequestContainer'], Any]
+
+
+class RequestContainer:
+    """Update-scoped resolver over the factories compiled once by `AppContainer`.
+
+    Every update gets its own instance, so concurrent handlers never see each other's session.
+    The session is opened on the first resolve that needs it, so updates that never touch
+    the database don't open one at all.
+    """
+
+    __slots__ = ('_factories', '_session', '_readonly')
+
+    def __init__(self, factories: dict[Any, Factory], session: AsyncSession | None = None):
+        self._factories = factories
+        self._session = session
+        self._readonly: RequestContainer | None = None
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self.resolve(async_sessionmaker[AsyncSession])()
+        return self._session
+
+    @property
+    def readonly(self) -> 'RequestContainer':
+        """Scope whose `AsyncSession` is a `ReadOnlySession` from the read-only pool."""
+        if isinstance(self._session, ReadOnlySession):
+            return self
+        if self._readonly is None:
+            session = self.resolve(async_sessionmaker[ReadOnlySession])()
+            self._readonly = RequestContainer(self._factories, session)
+        return self._readonly
+
+    def resolve(self, service: Callable[..., T]) -> T:
+        return self._factories[service](self)
+
+    async def close(self) -> None:
+        if self._readonly is not None:
+            await self._readonly.close()
+            self._readonly = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+def _session_factory(scope: RequestContainer) -> AsyncSession:
+    return scope.session
 
-def build_container() -> Container:
-    container = Container()
+
+def _compile_factory(impl: Callable[..., Any]) -> Factory:
+    """Resolve constructor dependencies once, so building an object is a plain call."""
+    hints = get_type_hints(impl.__init__ if isclass(impl) else impl)
+    hints.pop('return', None)
+    dependencies = tuple(hints.items())
+
+    def factory(scope: RequestContainer) -> Any:
+        return impl(**{name: scope.resolve(service) for name, service in dependencies})
+
+    return factory
+
+
+class AppContainer(Container):
+    """Application container that also compiles a factory graph for request scopes."""
+
+    def __init__(self) -> None:
+        self._factories: dict[Any, Factory] = {AsyncSession: _session_factory}
+        super().__init__()
+
+    def register(self, service, factory=empty, instance=empty, scope=Scope.transient, readonly=False, **kwargs):  # type: ignore[no-untyped-def]
+        """`readonly=True` builds the service and its dependencies on the read-only session."""
+        super().register(service, factory, instance, scope, **kwargs)
+        if instance is not empty:
+            self._factories[service] = lambda _: instance
+            return self
+
+        compiled = _compile_factory(service if factory is empty else factory)
+        if readonly:
+            self._factories[service] = lambda request_scope: compiled(request_scope.readonly)
+        else:
+            self._factories[service] = compiled
+        return self
+
+    def scope(self, session: AsyncSession | None = None) -> RequestContainer:
+        return RequestContainer(self._factories, session)
+
+
+def build_container() -> AppContainer:
+    container = AppContainer()
 
     # Infrastructure - singletons
     container.register(async_sessionmaker[AsyncSession], instance=get_async_sessionmaker(), scope=Scope.singleton)
-    # container.register(IS3Storage, instance=init_minio_storage(), scope=Scope.singleton)
+    container.register(
+        async_sessionmaker[ReadOnlySession],
+        instance=get_async_readonly_sessionmaker(),
+        scope=Scope.singleton,
+    )
+    # Клиент minio создается при первом обращении, а не при сборке контейнера
+    container.register(IS3Storage, factory=init_minio_storage, scope=Scope.singleton)
+    container.register(UserCache, instance=get_user_cache(), scope=Scope.singleton)
+    container.register(ActiveEventCache, instance=get_active_event_cache(), scope=Scope.singleton)
+    container.register(ActiveChatCache, instance=get_active_chat_cache(), scope=Scope.singleton)
+    container.register(
+        IWriteQueue,
+        instance=SqliteWriteQueue(get_async_writer_sessionmaker(), container.scope),
+        scope=Scope.singleton,
+    )
 
     # Repositories - transient
     container.register(ICommiter, Commiter)
     container.register(IUserRepository, UserRepository)
     container.register(IPushUpRepository, PushUpRepository)
+    container.register(IVideoFingerprintRepository, VideoFingerprintRepository)
     container.register(IStoredObjectRepository, StoredObjectRepository)
     container.register(IEventRepository, EventRepository)
     container.register(IChatRepository, ChatRepository)
 
     # Interactors - transient
     container.register(CreateUserInteractor)
+    container.register(GetOrCreateUserInteractor)
     container.register(VerifyUserInteractor)
     container.register(CreatePushUpInteractor)
     container.register(GetDailyStatsInteractor)
-    container.register(GetAllUsersStatsInteractor)
-    container.register(GetAllUsersStatsByDateInteractor)
+    container.register(GetAllUsersStatsInteractor, readonly=True)
+    container.register(GetAllUsersStatsByDateInteractor, readonly=True)
     container.register(GetUserByTelegramIdInteractor)
     container.register(CreateEventInteractor)
     container.register(JoinEventInteractor)
@@ -64,10 +187,12 @@ def build_container() -> Container:
     container.register(DeactivateChatInteractor)
     container.register(GetAllChatsInteractor)
     container.register(CreatePushUpPenaltyInteractor)
+    container.register(CheckDuplicateVideoInteractor, readonly=True)
+    container.register(RebuildDailyTotalsInteractor)
+    container.register(RebuildEventTotalsInteractor)
 
     return container
 
 
-def build_request_container(container: Container, session: AsyncSession) -> Container:
-    container.register(AsyncSession, instance=session)
-    return container
+def build_request_container(container: AppContainer) -> RequestContainer:
+    return container.scope()
@@ -26,3 +26,5 @@ class EventParticipantORM(BaseORM):
     event_oid: Mapped[UUID] = mapped_column(ForeignKey('events.oid'), primary_key=True)
     user_oid: Mapped[UUID] = mapped_column(ForeignKey('users.oid'), primary_key=True)
     joined_at: Mapped[datetime]
+    push_ups_total: Mapped[int] = mapped_column(default=0, server_default='0')
+    'Сумма отжиманий участника с начала ивента'
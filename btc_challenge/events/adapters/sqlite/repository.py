@@ -1,13 +1,18 @@
+from collections import defaultdict
+from collections.abc import Sequence
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import Select, select
+from sqlalchemy import ColumnElement, Select, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from btc_challenge.events.adapters.sqlite.mapper import EventMapper
 from btc_challenge.events.adapters.sqlite.model import EventORM, EventParticipantORM
 from btc_challenge.events.domain.entity import Event
 from btc_challenge.events.domain.repository import IEventRepository
+from btc_challenge.push_ups.adapters.sqlite.model import DailyPushUpTotalORM
+from btc_challenge.shared.adapters.sqlite.functions import moscow_date
+from btc_challenge.shared.date import get_moscow_date
 from btc_challenge.shared.errors import ObjectNotFoundError
 from btc_challenge.shared.providers import DatetimeProvider
 
@@ -35,6 +40,27 @@ class EventRepository(IEventRepository):
         cursor = await self._session.execute(query)
         return list(cursor.scalars().all())
 
+    async def _load_participants_by_event(self, event_oids: list[UUID]) -> dict[UUID, list[UUID]]:
+        """Load participant OIDs for several events with a single query."""
+        participants: dict[UUID, list[UUID]] = defaultdict(list)
+        if not event_oids:
+            return participants
+        query = select(EventParticipantORM.event_oid, EventParticipantORM.user_oid).where(
+            EventParticipantORM.event_oid.in_(event_oids),
+        )
+        cursor = await self._session.execute(query)
+        for event_oid, user_oid in cursor.all():
+            participants[event_oid].append(user_oid)
+        return participants
+
+    async def _to_domain_many(self, rows: Sequence[EventORM]) -> list[Event]:
+        participants = await self._load_participants_by_event([row.oid for row in rows])
+        return [self._mapper.to_domain(row, participants[row.oid]) for row in rows]
+
+    async def _get_many_by(self, query: Select[tuple[EventORM]]) -> list[Event]:
+        cursor = await self._session.execute(query)
+        return await self._to_domain_many(cursor.scalars().all())
+
     async def _get_by(self, query: Select[tuple[EventORM]]) -> Event | None:
         cursor = await self._session.execute(query)
         row = cursor.scalar_one_or_none()
@@ -57,6 +83,10 @@ class EventRepository(IEventRepository):
             joined_at=DatetimeProvider.provide(),
         )
         self._session.add(participant)
+        # Отжимания, сделанные с начала ивента до вступления, тоже учитываются
+        await self._recount_participant_totals(
+            (EventParticipantORM.event_oid == event_oid) & (EventParticipantORM.user_oid == user_oid),
+        )
 
     async def get_events_starting_soon(
         self,
@@ -72,14 +102,7 @@ class EventRepository(IEventRepository):
             )
             .order_by(EventORM.start_at)
         )
-        cursor = await self._session.execute(query)
-        rows = cursor.scalars().all()
-
-        events = []
-        for row in rows:
-            participant_oids = await self._load_participants(row.oid)
-            events.append(self._mapper.to_domain(row, participant_oids))
-        return events
+        return await self._get_many_by(query)
 
     async def get_events_starting_now(self, now: datetime) -> list[Event]:
         query = (
@@ -90,14 +113,7 @@ class EventRepository(IEventRepository):
             )
             .order_by(EventORM.start_at)
         )
-        cursor = await self._session.execute(query)
-        rows = cursor.scalars().all()
-
-        events = []
-        for row in rows:
-            participant_oids = await self._load_participants(row.oid)
-            events.append(self._mapper.to_domain(row, participant_oids))
-        return events
+        return await self._get_many_by(query)
 
     async def get_active_events(self, now: datetime) -> list[Event]:
         """Get events that are currently active (started and not completed)."""
@@ -110,14 +126,7 @@ class EventRepository(IEventRepository):
             )
             .order_by(EventORM.start_at)
         )
-        cursor = await self._session.execute(query)
-        rows = cursor.scalars().all()
-
-        events = []
-        for row in rows:
-            participant_oids = await self._load_participants(row.oid)
-            events.append(self._mapper.to_domain(row, participant_oids))
-        return events
+        return await self._get_many_by(query)
 
     async def get_active_events_by_participant(self, participant_oid: UUID, now: datetime) -> list[Event]:
         """Get active events where user is a participant."""
@@ -132,14 +141,7 @@ class EventRepository(IEventRepository):
             )
             .order_by(EventORM.start_at)
         )
-        cursor = await self._session.execute(query)
-        rows = cursor.scalars().all()
-
-        events = []
-        for row in rows:
-            participant_oids = await self._load_participants(row.oid)
-            events.append(self._mapper.to_domain(row, participant_oids))
-        return events
+        return await self._get_many_by(query)
 
     async def get_current_active_event(self) -> Event | None:
         """Get the current active event (if any)."""
@@ -154,14 +156,7 @@ class EventRepository(IEventRepository):
             .order_by(EventORM.start_at)
             .limit(1)
         )
-        cursor = await self._session.execute(query)
-        row = cursor.scalar_one_or_none()
-
-        if not row:
-            return None
-
-        participant_oids = await self._load_participants(row.oid)
-        return self._mapper.to_domain(row, participant_oids)
+        return await self._get_by(query)
 
     async def has_active_event(self) -> bool:
         """Check if there is currently an active event."""
@@ -182,11 +177,54 @@ class EventRepository(IEventRepository):
     async def get_uncompleted_events(self) -> list[Event]:
         """Get all events that are not completed."""
         query = select(EventORM).where(EventORM.completed_at.is_(None)).order_by(EventORM.start_at)
+        return await self._get_many_by(query)
+
+    async def add_push_ups(self, user_oid: UUID, count: int, pushed_at: datetime) -> None:
+        event_oids = (
+            select(EventORM.oid)
+            .where(EventORM.completed_at.is_(None))
+            .where(moscow_date(EventORM.start_at) <= get_moscow_date(pushed_at))
+        )
+        query = (
+            update(EventParticipantORM)
+            .where(EventParticipantORM.user_oid == user_oid)
+            .where(EventParticipantORM.event_oid.in_(event_oids))
+            .values(push_ups_total=EventParticipantORM.push_ups_total + count)
+        )
+        await self._session.execute(query)
+
+    async def get_participant_totals(self, event_oid: UUID) -> dict[UUID, int]:
+        query = select(EventParticipantORM.user_oid, EventParticipantORM.push_ups_total).where(
+            EventParticipantORM.event_oid == event_oid,
+        )
         cursor = await self._session.execute(query)
-        rows = cursor.scalars().all()
+        return {user_oid: total for user_oid, total in cursor.all()}
 
-        events = []
-        for row in rows:
-            participant_oids = await self._load_participants(row.oid)
-            events.append(self._mapper.to_domain(row, participant_oids))
-        return events
+    async def get_participant_total(self, event_oid: UUID, user_oid: UUID) -> int:
+        query = select(EventParticipantORM.push_ups_total).where(
+            EventParticipantORM.event_oid == event_oid,
+            EventParticipantORM.user_oid == user_oid,
+        )
+        cursor = await self._session.execute(query)
+        return cursor.scalar_one_or_none() or 0
+
+    async def rebuild_participant_totals(self) -> None:
+        await self._recount_participant_totals()
+
+    async def _recount_participant_totals(self, *where: ColumnElement[bool]) -> None:
+        """Recompute push_ups_total from daily_push_up_totals for matching participants."""
+        total = (
+            select(func.coalesce(func.sum(DailyPushUpTotalORM.total), 0))
+            .where(EventORM.oid == EventParticipantORM.event_oid)
+            .where(DailyPushUpTotalORM.user_oid == EventParticipantORM.user_oid)
+            .where(DailyPushUpTotalORM.moscow_date >= moscow_date(EventORM.start_at))
+            .where(
+                or_(
+                    EventORM.completed_at.is_(None),
+                    DailyPushUpTotalORM.moscow_date <= moscow_date(EventORM.completed_at),
+                ),
+            )
+            .scalar_subquery()
+        )
+        query = update(EventParticipantORM).where(*where).values(push_ups_total=total)
+        await self._session.execute(query)
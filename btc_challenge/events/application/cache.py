@@ -0,0 +1,54 @@
+from functools import lru_cache
+from uuid import UUID
+
+from btc_challenge.config import AppConfig
+from btc_challenge.events.domain.entity import Event
+from btc_challenge.events.domain.repository import IEventRepository
+from btc_challenge.shared.cache import SnapshotCache
+from btc_challenge.shared.providers import DatetimeProvider
+
+# Только для вебхука с несколькими процессами: изменения из других процессов видны через это время
+ACTIVE_EVENT_CACHE_TTL = 5.0
+
+
+class ActiveEventCache:
+    """Snapshot of the active events and their participants, shared by handlers and background tasks.
+
+    The snapshot is loaded on first use and kept until the event interactors or the start
+    notification invalidate it. With `ttl` it is also reloaded after `ttl` seconds, for
+    processes that don't see invalidations made by other processes. Cached events are shared,
+    callers must not modify them.
+    """
+
+    __slots__ = ('_snapshot',)
+
+    def __init__(self, ttl: float | None = None):
+        self._snapshot: SnapshotCache[list[tuple[Event, frozenset[UUID]]]] = SnapshotCache(ttl)
+
+    async def get_active_events(self, event_repository: IEventRepository) -> list[Event]:
+        snapshot = await self._get_snapshot(event_repository)
+        return [event for event, _ in snapshot]
+
+    async def get_current(self, event_repository: IEventRepository) -> Event | None:
+        """The earliest active event, the same as `IEventRepository.get_current_active_event`."""
+        snapshot = await self._get_snapshot(event_repository)
+        return snapshot[0][0] if snapshot else None
+
+    async def get_by_participant(self, event_repository: IEventRepository, user_oid: UUID) -> list[Event]:
+        snapshot = await self._get_snapshot(event_repository)
+        return [event for event, participant_oids in snapshot if user_oid in participant_oids]
+
+    def invalidate(self) -> None:
+        self._snapshot.invalidate()
+
+    async def _get_snapshot(self, event_repository: IEventRepository) -> list[tuple[Event, frozenset[UUID]]]:
+        async def load() -> list[tuple[Event, frozenset[UUID]]]:
+            events = await event_repository.get_active_events(DatetimeProvider.provide())
+            return [(event, frozenset(event.participant_oids)) for event in events]
+
+        return await self._snapshot.get(load)
+
+
+@lru_cache(1)
+def get_active_event_cache() -> ActiveEventCache:
+    return ActiveEventCache(ttl=ACTIVE_EVENT_CACHE_TTL if AppConfig.webhook.multiprocess else None)
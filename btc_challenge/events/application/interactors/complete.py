@@ -1,5 +1,6 @@
 from uuid import UUID
 
+from btc_challenge.events.application.cache import ActiveEventCache
 from btc_challenge.events.domain.entity import Event
 from btc_challenge.events.domain.repository import IEventRepository
 from btc_challenge.shared.application.commiter import ICommiter
@@ -7,9 +8,15 @@ from btc_challenge.shared.providers import DatetimeProvider
 
 
 class CompleteEventInteractor:
-    def __init__(self, event_repository: IEventRepository, commiter: ICommiter):
+    def __init__(
+        self,
+        event_repository: IEventRepository,
+        commiter: ICommiter,
+        active_event_cache: ActiveEventCache,
+    ):
         self._event_repository = event_repository
         self._commiter = commiter
+        self._active_event_cache = active_event_cache
 
     async def execute(self, event_oid: UUID) -> Event:
         event = await self._event_repository.get_by_oid(event_oid)
@@ -28,4 +35,5 @@ class CompleteEventInteractor:
         event.completed_at = DatetimeProvider.provide()
         await self._event_repository.save(event)
         await self._commiter.commit()
+        self._active_event_cache.invalidate()
         return event
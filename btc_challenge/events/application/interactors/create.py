@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta
 from uuid import UUID
 
+from btc_challenge.events.application.cache import ActiveEventCache
 from btc_challenge.events.domain.entity import Event
 from btc_challenge.events.domain.repository import IEventRepository
 from btc_challenge.shared.application.commiter import ICommiter
@@ -8,9 +9,15 @@ from btc_challenge.shared.providers import DatetimeProvider
 
 
 class CreateEventInteractor:
-    def __init__(self, event_repository: IEventRepository, commiter: ICommiter):
+    def __init__(
+        self,
+        event_repository: IEventRepository,
+        commiter: ICommiter,
+        active_event_cache: ActiveEventCache,
+    ):
         self._event_repository = event_repository
         self._commiter = commiter
+        self._active_event_cache = active_event_cache
 
     async def execute(
         self,
@@ -50,4 +57,6 @@ class CreateEventInteractor:
         )
         await self._event_repository.create(event)
         await self._commiter.commit()
+        # Незавершенные ивенты только что завершены
+        self._active_event_cache.invalidate()
         return event
@@ -1,13 +1,20 @@
 from uuid import UUID
 
+from btc_challenge.events.application.cache import ActiveEventCache
 from btc_challenge.events.domain.repository import IEventRepository
-from btc_challenge.shared.application.commiter import ICommiter
+from btc_challenge.shared.application.write_queue import IResolver, IWriteQueue
 
 
 class JoinEventInteractor:
-    def __init__(self, event_repository: IEventRepository, commiter: ICommiter):
+    def __init__(
+        self,
+        event_repository: IEventRepository,
+        write_queue: IWriteQueue,
+        active_event_cache: ActiveEventCache,
+    ):
         self._event_repository = event_repository
-        self._commiter = commiter
+        self._write_queue = write_queue
+        self._active_event_cache = active_event_cache
 
     async def execute(self, event_oid: UUID, user_oid: UUID) -> None:
         # Check if event exists
@@ -21,5 +28,8 @@ class JoinEventInteractor:
         if user_oid in event.participant_oids:
             raise ValueError("User is already a participant")
 
-        await self._event_repository.add_participant(event_oid, user_oid)
-        await self._commiter.commit()
+        async def write(scope: IResolver) -> None:
+            await scope.resolve(IEventRepository).add_participant(event_oid, user_oid)
+
+        await self._write_queue.submit(write)
+        self._active_event_cache.invalidate()
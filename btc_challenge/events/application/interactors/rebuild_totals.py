@@ -0,0 +1,13 @@
+from btc_challenge.events.domain.repository import IEventRepository
+from btc_challenge.shared.application.commiter import ICommiter
+
+
+class RebuildEventTotalsInteractor:
+    def __init__(self, event_repository: IEventRepository, commiter: ICommiter):
+        self._event_repository = event_repository
+        self._commiter = commiter
+
+    async def execute(self) -> None:
+        # Считается по daily_push_up_totals, поэтому их нужно пересобрать раньше
+        await self._event_repository.rebuild_participant_totals()
+        await self._commiter.commit()
@@ -51,3 +51,19 @@ class IEventRepository(ABC):
     @abstractmethod
     async def get_uncompleted_events(self) -> list[Event]:
         pass
+
+    @abstractmethod
+    async def add_push_ups(self, user_oid: UUID, count: int, pushed_at: datetime) -> None:
+        """Add count to the user's running total in every uncompleted event that started by pushed_at's day."""
+
+    @abstractmethod
+    async def get_participant_totals(self, event_oid: UUID) -> dict[UUID, int]:
+        pass
+
+    @abstractmethod
+    async def get_participant_total(self, event_oid: UUID, user_oid: UUID) -> int:
+        pass
+
+    @abstractmethod
+    async def rebuild_participant_totals(self) -> None:
+        """Recompute running totals of all participants from the daily push-up totals."""
@@ -5,9 +5,10 @@ from uuid import UUID
 from aiogram import Bot, F, Router, filters, types
 from aiogram.fsm.context import FSMContext
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
-from punq import Container
 
+from btc_challenge.container import RequestContainer
 from btc_challenge.events.adapters.sqlite.repository import EventRepository
+from btc_challenge.events.application.cache import ActiveEventCache
 from btc_challenge.events.application.interactors.complete import CompleteEventInteractor
 from btc_challenge.events.application.interactors.create import CreateEventInteractor
 from btc_challenge.events.application.interactors.get_participants import GetEventParticipantsInteractor
@@ -19,7 +20,8 @@ from btc_challenge.shared.date import from_moscow, to_moscow
 from btc_challenge.shared.presentation.checks import require_admin, require_verified
 from btc_challenge.shared.presentation.commands import Commands
 from btc_challenge.shared.providers import DatetimeProvider
-from btc_challenge.shared.tasks.send_to_groups import send_notification_to_groups
+from btc_challenge.shared.tasks.event_notification import schedule_event_jobs
+from btc_challenge.shared.tasks.outbox import enqueue_group_notification, enqueue_notification, wake_outbox_worker
 from btc_challenge.users.adapters.sqlite.repository import UserRepository
 from btc_challenge.users.domain.entity import User
 
@@ -81,7 +83,7 @@ async def wrong_description_type(message: types.Message) -> None:
 async def process_start_at(
     message: types.Message,
     state: FSMContext,
-    container: Container,
+    container: RequestContainer,
     bot: Bot,
     user: User | None,
 ) -> None:
@@ -134,6 +136,7 @@ async def process_start_at(
             start_at=start_at,
         )
         logger.info(f'process_start_at: event created successfully: {event.oid}')
+        await schedule_event_jobs(event)
     except ValueError as e:
         logger.error(f'process_start_at: failed to create event: {e}')
         await message.answer(f'Ошибка создания ивента: {e}')
@@ -161,7 +164,7 @@ async def wrong_start_at_type(message: types.Message) -> None:
 @events_router.callback_query(F.data.startswith('join_event:'))
 async def handle_join_event(
     callback: types.CallbackQuery,
-    container: Container,
+    container: RequestContainer,
     user: User | None,
 ) -> None:
     if not user:
@@ -196,14 +199,13 @@ async def handle_join_event(
 
 
 @events_router.message(filters.Command(Commands.ACTIVE_EVENTS))
-async def cmd_active_events(message: types.Message, container: Container, user: User | None) -> None:
+async def cmd_active_events(message: types.Message, container: RequestContainer, user: User | None) -> None:
     if not await require_verified(message, user):
         return
 
     async with get_async_session() as session:
         event_repository = EventRepository(session)
-        now = DatetimeProvider.provide()
-        active_events = await event_repository.get_active_events(now)
+        active_events = await container.resolve(ActiveEventCache).get_active_events(event_repository)
 
         if not active_events:
             await message.answer('📭 Сейчас нет активных ивентов')
@@ -230,7 +232,7 @@ async def cmd_active_events(message: types.Message, container: Container, user:
 
 
 @events_router.message(filters.Command(Commands.COMPLETE_EVENT))
-async def cmd_complete_event(message: types.Message, container: Container, user: User | None) -> None:
+async def cmd_complete_event(message: types.Message, container: RequestContainer, user: User | None) -> None:
     if not await require_admin(message, user):
         return
 
@@ -267,7 +269,7 @@ async def cmd_complete_event(message: types.Message, container: Container, user:
 @events_router.callback_query(F.data.startswith('complete_event:'))
 async def handle_complete_event(
     callback: types.CallbackQuery,
-    container: Container,
+    container: RequestContainer,
     user: User | None,
 ) -> None:
     if not user:
@@ -300,6 +302,7 @@ async def handle_complete_event(
     interactor: CompleteEventInteractor = container.resolve(CompleteEventInteractor)
     try:
         event = await interactor.execute(event_oid=event_oid)
+        await schedule_event_jobs(event)
 
         # Get participants stats
 
@@ -345,18 +348,17 @@ async def send_event_invitations(bot: Bot, event: 'Event') -> None:
             f'Хочешь принять участие? Нажми кнопку ниже!'
         )
 
-        for user in users:
-            try:
-                await bot.send_message(
-                    chat_id=user.telegram_id,
-                    text=invitation_text,
-                    reply_markup=keyboard,
-                )
-            except Exception:
-                # User might have blocked the bot
-                pass
+        notification_key = f'event:{event.oid}:invitation'
+        await enqueue_notification(
+            session,
+            notification_key,
+            [user.telegram_id for user in users],
+            invitation_text,
+            keyboard,
+        )
 
         # Send to active chats (groups)
-        await send_notification_to_groups(bot, session, invitation_text, keyboard)
+        await enqueue_group_notification(session, notification_key, invitation_text, keyboard)
 
         await session.commit()
+    wake_outbox_worker()
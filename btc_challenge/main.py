@@ -1,19 +1,31 @@
 import asyncio
 import logging
+import multiprocessing
+import signal
 
 from aiogram import Bot, Dispatcher
 from aiogram.fsm.strategy import FSMStrategy
 from aiogram.types import BotCommand
+from aiohttp import web
 
 from btc_challenge.chats.presentation.router import chats_router
 from btc_challenge.config import AppConfig
 from btc_challenge.container import build_container
 from btc_challenge.events.presentation.router import events_router
 from btc_challenge.push_ups.presentation.router import logger, push_ups_router
-from btc_challenge.shared.adapters.sqlite.session import get_async_engine
+from btc_challenge.shared.adapters.sqlite.fsm.storage import SqliteStorage
+from btc_challenge.shared.adapters.sqlite.session import (
+    get_async_engine,
+    get_async_readonly_engine,
+    get_async_readonly_sessionmaker,
+    get_async_writer_engine,
+    get_async_writer_sessionmaker,
+)
+from btc_challenge.shared.application.write_queue import IWriteQueue
 from btc_challenge.shared.presentation.commands import Commands
 from btc_challenge.shared.presentation.middlewares.container import ContainerMiddleware
 from btc_challenge.shared.presentation.middlewares.user import UserMiddleware
+from btc_challenge.shared.presentation.webhook import build_webhook_app
 from btc_challenge.tasks import init_tasks
 from btc_challenge.users.presentation.router import user_router
 from btc_challenge.users.presentation.verification_router import verification_router
@@ -42,9 +54,11 @@ def init_logger() -> None:
     )
 
 
-async def main() -> None:
-    init_logger()
-    bot = Bot(token=AppConfig.telegram.bot_token)
+def init_bot() -> Bot:
+    return Bot(token=AppConfig.telegram.bot_token)
+
+
+async def set_commands(bot: Bot) -> None:
     await bot.set_my_commands(
         commands=[
             BotCommand(command=Commands.START, description="Начать работу с ботом"),
@@ -57,20 +71,128 @@ async def main() -> None:
             BotCommand(command=Commands.CONFIRMATION, description="Верификация пользователя"),
         ],
     )
-    dp = Dispatcher(fsm_strategy=FSMStrategy.USER_IN_CHAT)
-    container = build_container()
-    dp["container"] = container
+
+
+def init_fsm_storage() -> SqliteStorage:
+    # Кэш возможен, только если состояния меняет один процесс
+    return SqliteStorage(
+        session_factory=get_async_writer_sessionmaker(),
+        readonly_session_factory=get_async_readonly_sessionmaker(),
+        shared=AppConfig.webhook.multiprocess,
+        flush_interval=AppConfig.fsm.flush_interval,
+    )
+
+
+def init_dispatcher(with_tasks: bool) -> Dispatcher:
+    """
+    Args:
+        with_tasks: запускать ли фоновые задачи. В режиме вебхука с несколькими процессами
+            их запускает только один процесс, иначе уведомления уйдут несколько раз
+    """
+    dp = Dispatcher(storage=init_fsm_storage(), fsm_strategy=FSMStrategy.USER_IN_CHAT)
+    dp["container"] = build_container()
     init_routers(dp)
-    init_tasks(bot)
-    try:
-        await dp.start_polling(bot)
-    except KeyboardInterrupt:
-        logger.info("Bot stopped by KeyboardInterrupt")
-        await dp.stop_polling()
-        engine = get_async_engine()
-        await engine.dispose()
+
+    tasks: list[asyncio.Task[None]] = []
+
+    async def on_startup(bot: Bot) -> None:
+        if with_tasks:
+            # Ивент могут создать в другом процессе, тогда планировщик узнает о нем только из базы
+            resync_interval = AppConfig.scheduler.resync_interval if AppConfig.webhook.multiprocess else None
+            tasks.extend(init_tasks(bot, resync_interval=resync_interval))
+
+    async def on_shutdown() -> None:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await dp.storage.close()
+        await dp["container"].resolve(IWriteQueue).close()
+        await get_async_engine().dispose()
+        await get_async_readonly_engine().dispose()
+        await get_async_writer_engine().dispose()
         logger.info("Bot stopped")
 
+    dp.startup.register(on_startup)
+    dp.shutdown.register(on_shutdown)
+    return dp
+
+
+async def run_polling() -> None:
+    bot = init_bot()
+    await set_commands(bot)
+    dp = init_dispatcher(with_tasks=True)
+    await dp.start_polling(bot)
+
+
+def run_webhook_worker(worker_id: int) -> None:
+    init_logger()
+    config = AppConfig.webhook
+    bot = init_bot()
+    is_primary = worker_id == 0
+    dp = init_dispatcher(with_tasks=is_primary)
+
+    async def register_webhook() -> None:
+        if not config.base_url:
+            logger.warning("WEBHOOK_BASE_URL is not set, webhook is not registered in Telegram")
+            return
+        await set_commands(bot)
+        # Вебхук при остановке не удаляется: во время перезапуска Telegram копит апдейты
+        # и доставит их, когда сервер снова поднимется
+        await bot.set_webhook(
+            url=config.url,
+            secret_token=config.secret_token,
+            max_connections=config.max_connections,
+            allowed_updates=dp.resolve_used_update_types(),
+        )
+        logger.info("Webhook is set to %s", config.url)
+
+    if is_primary:
+        dp.startup.register(register_webhook)
+
+    app = build_webhook_app(dp, bot, path=config.path, secret_token=config.secret_token)
+    web.run_app(
+        app,
+        host=config.host,
+        port=config.port,
+        reuse_port=config.workers > 1,
+        print=None,
+    )
+
+
+def run_webhook() -> None:
+    config = AppConfig.webhook
+    if not config.secret_token:
+        raise ValueError("WEBHOOK_SECRET_TOKEN is required in webhook mode")
+    if config.workers <= 1:
+        run_webhook_worker(worker_id=0)
+        return
+
+    # Каждый процесс слушает тот же порт через SO_REUSEPORT, ядро распределяет между ними соединения
+    workers = [
+        multiprocessing.Process(target=run_webhook_worker, args=(worker_id,), name=f"webhook-{worker_id}")
+        for worker_id in range(config.workers)
+    ]
+    for worker in workers:
+        worker.start()
+
+    def stop_workers(*_: object) -> None:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()  # SIGTERM - aiohttp завершает работу штатно
+
+    signal.signal(signal.SIGTERM, stop_workers)
+    signal.signal(signal.SIGINT, stop_workers)
+    for worker in workers:
+        worker.join()
+
+
+def main() -> None:
+    init_logger()
+    if AppConfig.webhook.enabled:
+        run_webhook()
+    else:
+        asyncio.run(run_polling())
+
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
@@ -1,7 +1,15 @@
 from btc_challenge.chats.adapters.sqlite.model import ChatORM
 from btc_challenge.events.adapters.sqlite.model import EventORM, EventParticipantORM
-from btc_challenge.push_ups.adapters.sqlite.model import PushUpORM
+from btc_challenge.outbox.adapters.sqlite.model import OutboxMessageORM
+from btc_challenge.push_ups.adapters.sqlite.model import (
+    DailyPushUpTotalORM,
+    PushUpORM,
+    PushUpStreakORM,
+    VideoFingerprintORM,
+)
+from btc_challenge.shared.adapters.sqlite.fsm.model import FsmStateORM
 from btc_challenge.shared.adapters.sqlite.models import BaseORM
+from btc_challenge.shared.adapters.sqlite.scheduler.model import ScheduledJobORM
 from btc_challenge.stored_object.adapters.sqlite.model import StoredObjectORM
 from btc_challenge.users.adapters.sqlite.model import UserORM
 
@@ -10,7 +18,13 @@ __all__ = [
     'UserORM',
     'StoredObjectORM',
     'PushUpORM',
+    'DailyPushUpTotalORM',
+    'PushUpStreakORM',
+    'VideoFingerprintORM',
     'EventORM',
     'EventParticipantORM',
     'ChatORM',
+    'OutboxMessageORM',
+    'FsmStateORM',
+    'ScheduledJobORM',
 ]
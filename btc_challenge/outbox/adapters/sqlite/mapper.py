@@ -0,0 +1,36 @@
+from btc_challenge.outbox.adapters.sqlite.model import OutboxMessageORM
+from btc_challenge.outbox.domain.entity import OutboxMessage, OutboxStatus
+
+
+class SqliteOutboxMessageMapper:
+    @classmethod
+    def to_entity(cls, message_orm: OutboxMessageORM) -> OutboxMessage:
+        return OutboxMessage(
+            oid=message_orm.oid,
+            notification_key=message_orm.notification_key,
+            chat_id=message_orm.chat_id,
+            text=message_orm.text,
+            reply_markup=message_orm.reply_markup,
+            is_group=message_orm.is_group,
+            status=OutboxStatus(message_orm.status),
+            error=message_orm.error,
+            sent_at=message_orm.sent_at,
+            created_at=message_orm.created_at,
+            updated_at=message_orm.updated_at,
+        )
+
+    @classmethod
+    def to_values(cls, message: OutboxMessage) -> dict:
+        return {
+            'oid': message.oid,
+            'notification_key': message.notification_key,
+            'chat_id': message.chat_id,
+            'text': message.text,
+            'reply_markup': message.reply_markup,
+            'is_group': message.is_group,
+            'status': message.status.value,
+            'error': message.error,
+            'sent_at': message.sent_at,
+            'created_at': message.created_at,
+            'updated_at': message.updated_at,
+        }
@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from btc_challenge.shared.adapters.sqlite.mixins import DatetimeMixin, IdentityMixin
+from btc_challenge.shared.adapters.sqlite.models import BaseORM
+
+
+class OutboxMessageORM(BaseORM, IdentityMixin, DatetimeMixin):
+    __tablename__ = 'outbox'
+    __table_args__ = (
+        UniqueConstraint('notification_key', 'chat_id'),
+        Index('ix_outbox_status_created_at', 'status', 'created_at'),
+    )
+
+    notification_key: Mapped[str]
+    chat_id: Mapped[int]
+    text: Mapped[str]
+    reply_markup: Mapped[str | None]
+    is_group: Mapped[bool]
+    status: Mapped[str]
+    error: Mapped[str | None]
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
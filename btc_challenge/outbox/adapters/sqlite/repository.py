@@ -0,0 +1,65 @@
+from datetime import datetime
+from typing import cast
+from uuid import UUID
+
+from sqlalchemy import CursorResult, delete, select, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from btc_challenge.outbox.adapters.sqlite.mapper import SqliteOutboxMessageMapper
+from btc_challenge.outbox.adapters.sqlite.model import OutboxMessageORM
+from btc_challenge.outbox.domain.entity import OutboxMessage, OutboxStatus
+from btc_challenge.outbox.domain.repository import IOutboxRepository
+from btc_challenge.shared.providers import DatetimeProvider
+
+
+class OutboxRepository(IOutboxRepository):
+    def __init__(self, session: AsyncSession):
+        self._session = session
+        self._mapper = SqliteOutboxMessageMapper
+
+    async def add_many(self, messages: list[OutboxMessage]) -> None:
+        if not messages:
+            return
+        query = insert(OutboxMessageORM).on_conflict_do_nothing(
+            index_elements=[OutboxMessageORM.notification_key, OutboxMessageORM.chat_id],
+        )
+        await self._session.execute(query, [self._mapper.to_values(message) for message in messages])
+
+    async def get_pending(self, limit: int) -> list[OutboxMessage]:
+        query = (
+            select(OutboxMessageORM)
+            .where(OutboxMessageORM.status == OutboxStatus.PENDING.value)
+            .order_by(OutboxMessageORM.created_at)
+            .limit(limit)
+        )
+        cursor = await self._session.execute(query)
+        rows = cursor.scalars().all()
+        return [self._mapper.to_entity(row) for row in rows]
+
+    async def mark_sent(self, oids: list[UUID]) -> None:
+        if not oids:
+            return
+        now = DatetimeProvider.provide()
+        query = (
+            update(OutboxMessageORM)
+            .where(OutboxMessageORM.oid.in_(oids))
+            .values(status=OutboxStatus.SENT.value, sent_at=now, updated_at=now)
+        )
+        await self._session.execute(query)
+
+    async def mark_failed(self, oid: UUID, error: str) -> None:
+        query = (
+            update(OutboxMessageORM)
+            .where(OutboxMessageORM.oid == oid)
+            .values(status=OutboxStatus.FAILED.value, error=error, updated_at=DatetimeProvider.provide())
+        )
+        await self._session.execute(query)
+
+    async def delete_processed(self, created_before: datetime) -> int:
+        query = delete(OutboxMessageORM).where(
+            OutboxMessageORM.status.in_([OutboxStatus.SENT.value, OutboxStatus.FAILED.value]),
+            OutboxMessageORM.created_at < created_before,
+        )
+        cursor = cast(CursorResult, await self._session.execute(query))
+        return cursor.rowcount
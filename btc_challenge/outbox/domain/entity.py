@@ -0,0 +1,51 @@
+from dataclasses import dataclass
+from datetime import datetime
+from enum import StrEnum
+from uuid import UUID, uuid4
+
+from btc_challenge.shared.providers import DatetimeProvider
+
+
+class OutboxStatus(StrEnum):
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+
+
+@dataclass
+class OutboxMessage:
+    oid: UUID
+    notification_key: str  # Together with chat_id makes delivery idempotent
+    chat_id: int
+    text: str
+    reply_markup: str | None  # InlineKeyboardMarkup serialized to JSON
+    is_group: bool
+    status: OutboxStatus
+    error: str | None
+    sent_at: datetime | None
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def create(
+        cls,
+        notification_key: str,
+        chat_id: int,
+        text: str,
+        reply_markup: str | None = None,
+        is_group: bool = False,
+    ) -> 'OutboxMessage':
+        now = DatetimeProvider.provide()
+        return cls(
+            oid=uuid4(),
+            notification_key=notification_key,
+            chat_id=chat_id,
+            text=text,
+            reply_markup=reply_markup,
+            is_group=is_group,
+            status=OutboxStatus.PENDING,
+            error=None,
+            sent_at=None,
+            created_at=now,
+            updated_at=now,
+        )
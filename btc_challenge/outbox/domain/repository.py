@@ -0,0 +1,26 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from uuid import UUID
+
+from btc_challenge.outbox.domain.entity import OutboxMessage
+
+
+class IOutboxRepository(ABC):
+    @abstractmethod
+    async def add_many(self, messages: list[OutboxMessage]) -> None:
+        """Adds messages to the outbox, skipping those already enqueued for the same notification and chat"""
+        ...
+
+    @abstractmethod
+    async def get_pending(self, limit: int) -> list[OutboxMessage]: ...
+
+    @abstractmethod
+    async def mark_sent(self, oids: list[UUID]) -> None: ...
+
+    @abstractmethod
+    async def mark_failed(self, oid: UUID, error: str) -> None: ...
+
+    @abstractmethod
+    async def delete_processed(self, created_before: datetime) -> int:
+        """Deletes sent and failed messages created before the given time, returns the number of deleted"""
+        ...
@@ -1,5 +1,5 @@
-from btc_challenge.push_ups.adapters.sqlite.model import PushUpORM
-from btc_challenge.push_ups.domain.entity import PushUp
+from btc_challenge.push_ups.adapters.sqlite.model import PushUpORM, VideoFingerprintORM
+from btc_challenge.push_ups.domain.entity import ArchiveStatus, PushUp, VideoFingerprint
 
 
 class SqlitePushUpMapper:
@@ -11,6 +11,11 @@ class SqlitePushUpMapper:
             telegram_file_id=push_up_orm.telegram_file_id,
             is_video_note=push_up_orm.is_video_note,
             count=push_up_orm.count,
+            archive_status=ArchiveStatus(push_up_orm.archive_status) if push_up_orm.archive_status else None,
+            stored_object_oid=push_up_orm.stored_object_oid,
+            archive_attempts=push_up_orm.archive_attempts,
+            archive_retry_at=push_up_orm.archive_retry_at,
+            is_duplicate=push_up_orm.is_duplicate,
             created_at=push_up_orm.created_at,
             updated_at=push_up_orm.updated_at,
         )
@@ -23,6 +28,50 @@ class SqlitePushUpMapper:
             telegram_file_id=push_up.telegram_file_id,
             is_video_note=push_up.is_video_note,
             count=push_up.count,
+            archive_status=push_up.archive_status.value if push_up.archive_status else None,
+            stored_object_oid=push_up.stored_object_oid,
+            archive_attempts=push_up.archive_attempts,
+            archive_retry_at=push_up.archive_retry_at,
+            is_duplicate=push_up.is_duplicate,
             created_at=push_up.created_at,
             updated_at=push_up.updated_at,
         )
+
+    @classmethod
+    def to_values(cls, push_up: PushUp) -> dict:
+        return {
+            'oid': push_up.oid,
+            'user_oid': push_up.user_oid,
+            'telegram_file_id': push_up.telegram_file_id,
+            'is_video_note': push_up.is_video_note,
+            'count': push_up.count,
+            'archive_status': push_up.archive_status.value if push_up.archive_status else None,
+            'stored_object_oid': push_up.stored_object_oid,
+            'archive_attempts': push_up.archive_attempts,
+            'archive_retry_at': push_up.archive_retry_at,
+            'is_duplicate': push_up.is_duplicate,
+            'created_at': push_up.created_at,
+            'updated_at': push_up.updated_at,
+        }
+
+
+class SqliteVideoFingerprintMapper:
+    @classmethod
+    def to_entity(cls, fingerprint_orm: VideoFingerprintORM) -> VideoFingerprint:
+        return VideoFingerprint(
+            file_unique_id=fingerprint_orm.file_unique_id,
+            push_up_oid=fingerprint_orm.push_up_oid,
+            user_oid=fingerprint_orm.user_oid,
+            content_hash=fingerprint_orm.content_hash,
+            created_at=fingerprint_orm.created_at,
+        )
+
+    @classmethod
+    def to_values(cls, fingerprint: VideoFingerprint) -> dict:
+        return {
+            'file_unique_id': fingerprint.file_unique_id,
+            'push_up_oid': fingerprint.push_up_oid,
+            'user_oid': fingerprint.user_oid,
+            'content_hash': fingerprint.content_hash,
+            'created_at': fingerprint.created_at,
+        }
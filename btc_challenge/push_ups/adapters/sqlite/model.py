@@ -1,6 +1,7 @@
+from datetime import date, datetime
 from uuid import UUID
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from btc_challenge.shared.adapters.sqlite.mixins import DatetimeMixin, IdentityMixin
@@ -9,8 +10,56 @@ from btc_challenge.shared.adapters.sqlite.models import BaseORM
 
 class PushUpORM(BaseORM, IdentityMixin, DatetimeMixin):
     __tablename__ = 'push_up'
+    __table_args__ = (
+        # `count` is included so per-user and per-day aggregates are answered from the index alone
+        Index('ix_push_up_user_oid_created_at', 'user_oid', 'created_at', 'count'),
+        Index('ix_push_up_created_at', 'created_at', 'user_oid', 'count'),
+        # Очередь архивации видео: в индексе только подходы, ожидающие загрузки в хранилище
+        Index('ix_push_up_archive_pending', 'created_at', sqlite_where=text("archive_status = 'pending'")),
+        Index('ix_push_up_stored_object_oid', 'stored_object_oid'),
+    )
 
-    user_oid: Mapped[UUID] = mapped_column(ForeignKey('users.oid', ondelete='CASCADE'), index=True)
+    user_oid: Mapped[UUID] = mapped_column(ForeignKey('users.oid', ondelete='CASCADE'))
     telegram_file_id: Mapped[str]
     is_video_note: Mapped[bool]
     count: Mapped[int]
+    archive_status: Mapped[str | None]
+    stored_object_oid: Mapped[UUID | None] = mapped_column(ForeignKey('stored_object.oid', ondelete='SET NULL'))
+    archive_retry_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    archive_attempts: Mapped[int] = mapped_column(default=0, server_default='0')
+    is_duplicate: Mapped[bool] = mapped_column(default=False, server_default='0')
+
+
+class DailyPushUpTotalORM(BaseORM):
+    """Суммы подходов пользователя за московский день, обновляются вместе с push_up."""
+
+    __tablename__ = 'daily_push_up_totals'
+    __table_args__ = (Index('ix_daily_push_up_totals_moscow_date', 'moscow_date', 'user_oid', 'total', 'sets'),)
+
+    user_oid: Mapped[UUID] = mapped_column(ForeignKey('users.oid', ondelete='CASCADE'), primary_key=True)
+    moscow_date: Mapped[date] = mapped_column(primary_key=True)
+    total: Mapped[int]
+    sets: Mapped[int]
+
+
+class PushUpStreakORM(BaseORM):
+    """Последняя серия дней подряд с подходами: после last_day подходов нет, first_day - 1 пропущен."""
+
+    __tablename__ = 'push_up_streaks'
+
+    user_oid: Mapped[UUID] = mapped_column(ForeignKey('users.oid', ondelete='CASCADE'), primary_key=True)
+    first_day: Mapped[date]
+    last_day: Mapped[date]
+
+
+class VideoFingerprintORM(BaseORM):
+    """Первое появление каждого видео, проверка на дубликат - поиск по первичному ключу."""
+
+    __tablename__ = 'video_fingerprints'
+    __table_args__ = (Index('ix_video_fingerprints_content_hash', 'content_hash', 'created_at'),)
+
+    file_unique_id: Mapped[str] = mapped_column(primary_key=True)
+    push_up_oid: Mapped[UUID] = mapped_column(ForeignKey('push_up.oid', ondelete='CASCADE'))
+    user_oid: Mapped[UUID] = mapped_column(ForeignKey('users.oid', ondelete='CASCADE'))
+    content_hash: Mapped[str | None]
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
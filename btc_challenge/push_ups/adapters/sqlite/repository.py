@@ -1,14 +1,25 @@
-from datetime import UTC, datetime, timedelta
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import cast
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import CursorResult, delete, func, insert, or_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from btc_challenge.push_ups.adapters.sqlite.mapper import SqlitePushUpMapper
-from btc_challenge.push_ups.adapters.sqlite.model import PushUpORM
-from btc_challenge.push_ups.domain.entity import PushUp
-from btc_challenge.push_ups.domain.repository import IPushUpRepository
-from btc_challenge.shared.providers import DatetimeProvider, TimeZone
+from btc_challenge.push_ups.adapters.sqlite.mapper import SqlitePushUpMapper, SqliteVideoFingerprintMapper
+from btc_challenge.push_ups.adapters.sqlite.model import (
+    DailyPushUpTotalORM,
+    PushUpORM,
+    PushUpStreakORM,
+    VideoFingerprintORM,
+)
+from btc_challenge.push_ups.domain.entity import ArchiveStatus, PushUp, UserPushUpTotals, VideoFingerprint
+from btc_challenge.push_ups.domain.repository import IPushUpRepository, IVideoFingerprintRepository
+from btc_challenge.shared.adapters.sqlite.functions import moscow_date
+from btc_challenge.shared.date import get_moscow_date
+from btc_challenge.shared.providers import DatetimeProvider
+from btc_challenge.users.adapters.sqlite.model import UserORM
 
 
 class PushUpRepository(IPushUpRepository):
@@ -17,8 +28,31 @@ class PushUpRepository(IPushUpRepository):
         self._mapper = SqlitePushUpMapper
 
     async def create(self, push_up: PushUp) -> None:
-        orm = self._mapper.to_model(push_up)
-        self._session.add(orm)
+        await self.create_many([push_up])
+
+    async def create_many(self, push_ups: list[PushUp]) -> None:
+        if not push_ups:
+            return
+        await self._session.execute(insert(PushUpORM), [self._mapper.to_values(push_up) for push_up in push_ups])
+
+        # Дневные суммы обновляются в той же транзакции, что и сами подходы
+        query = sqlite_insert(DailyPushUpTotalORM)
+        query = query.on_conflict_do_update(
+            index_elements=[DailyPushUpTotalORM.user_oid, DailyPushUpTotalORM.moscow_date],
+            set_={
+                'total': DailyPushUpTotalORM.total + query.excluded.total,
+                'sets': DailyPushUpTotalORM.sets + query.excluded.sets,
+            },
+        )
+        days_by_user: defaultdict[UUID, set[date]] = defaultdict(set)
+        totals: list[dict] = []
+        for push_up in push_ups:
+            day = get_moscow_date(push_up.created_at)
+            days_by_user[push_up.user_oid].add(day)
+            totals.append({'user_oid': push_up.user_oid, 'moscow_date': day, 'total': push_up.count, 'sets': 1})
+        await self._session.execute(query, totals)
+        for user_oid, days in days_by_user.items():
+            await self._update_streak(user_oid, days)
 
     async def get_by_oid(self, push_up_oid: UUID) -> PushUp | None:
         query = select(PushUpORM).where(PushUpORM.oid == push_up_oid)
@@ -62,10 +96,10 @@ class PushUpRepository(IPushUpRepository):
             .where(PushUpORM.user_oid.in_(user_oids))
             .where(PushUpORM.created_at >= begin_date)
             .where(PushUpORM.created_at <= end_date)
-            .order_by(PushUpORM.created_at.asc())
         )
         cursor = await self._session.execute(query)
-        rows = cursor.scalars().all()
+        # С IN по user_oid SQLite сортировал бы через временное B-дерево, сортируем уже прочитанные строки
+        rows = sorted(cursor.scalars().all(), key=lambda row: row.created_at)
         return [self._mapper.to_entity(row) for row in rows]
 
     async def get_many(
@@ -89,25 +123,281 @@ class PushUpRepository(IPushUpRepository):
         rows = cursor.scalars().all()
         return [self._mapper.to_entity(row) for row in rows]
 
-    async def get_missed_days(self, user_oid: UUID, event_started_at: datetime) -> list[datetime]:
-        now = DatetimeProvider.provide(TimeZone.MOSCOW)
-        start_moscow = event_started_at.replace(hour=0, minute=0, second=0, microsecond=0)
-        today_moscow = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    async def get_users_totals(
+        self,
+        begin_date: date,
+        end_date: date,
+        user_oids: list[UUID] | None = None,
+    ) -> list[UserPushUpTotals]:
+        total_count = func.sum(DailyPushUpTotalORM.total).label('total_count')
+        query = (
+            select(
+                DailyPushUpTotalORM.user_oid,
+                UserORM.username,
+                total_count,
+                func.sum(DailyPushUpTotalORM.sets).label('push_ups_count'),
+            )
+            .join(UserORM, UserORM.oid == DailyPushUpTotalORM.user_oid)
+            .where(UserORM.is_verified.is_(True))
+            .where(DailyPushUpTotalORM.moscow_date >= begin_date)
+            .where(DailyPushUpTotalORM.moscow_date <= end_date)
+            .group_by(DailyPushUpTotalORM.user_oid, UserORM.username)
+            .order_by(total_count.desc(), UserORM.username)
+        )
+        if user_oids is not None:
+            if not user_oids:
+                return []
+            query = query.where(DailyPushUpTotalORM.user_oid.in_(user_oids))
+        cursor = await self._session.execute(query)
+        return [
+            UserPushUpTotals(
+                user_oid=row.user_oid,
+                username=row.username,
+                total_count=row.total_count,
+                push_ups_count=row.push_ups_count,
+            )
+            for row in cursor
+        ]
+
+    async def rebuild_daily_totals(self) -> int:
+        push_up_date = moscow_date(PushUpORM.created_at)
+        rollup = select(
+            PushUpORM.user_oid,
+            push_up_date,
+            func.sum(PushUpORM.count),
+            func.count(),
+        ).group_by(PushUpORM.user_oid, push_up_date)
+
+        await self._session.execute(delete(DailyPushUpTotalORM))
+        await self._session.execute(
+            insert(DailyPushUpTotalORM).from_select(
+                ['user_oid', 'moscow_date', 'total', 'sets'],
+                rollup,
+            ),
+        )
+        await self._rebuild_streaks()
+        cursor = await self._session.execute(select(func.count()).select_from(DailyPushUpTotalORM))
+        return cursor.scalar_one()
 
-        all_dates: list[datetime] = []
-        current = start_moscow
-        while current < today_moscow:
-            all_dates.append(current)
-            current += timedelta(days=1)
+    async def _rebuild_streaks(self) -> None:
+        """Recompute the streak markers from the daily totals."""
+        user_oid = DailyPushUpTotalORM.user_oid
+        day = DailyPushUpTotalORM.moscow_date
+        # У дней одной серии разность номера дня и его порядкового номера одинакова
+        days = select(
+            user_oid,
+            day,
+            (func.julianday(day) - func.row_number().over(partition_by=user_oid, order_by=day)).label('run'),
+            (
+                func.julianday(func.max(day).over(partition_by=user_oid)) - func.count().over(partition_by=user_oid)
+            ).label('last_run'),
+        ).subquery()
+        streaks = (
+            select(days.c.user_oid, func.min(days.c.moscow_date), func.max(days.c.moscow_date))
+            .where(days.c.run == days.c.last_run)
+            .group_by(days.c.user_oid)
+        )
+        await self._session.execute(delete(PushUpStreakORM))
+        await self._session.execute(
+            insert(PushUpStreakORM).from_select(['user_oid', 'first_day', 'last_day'], streaks),
+        )
+
+    async def get_videos_by_user(
+        self,
+        begin_date: datetime,
+        end_date: datetime,
+    ) -> dict[UUID, list[tuple[int, str, bool]]]:
+        query = (
+            select(
+                PushUpORM.user_oid,
+                PushUpORM.count.label('push_up_count'),  # row.count - метод tuple
+                PushUpORM.telegram_file_id,
+                PushUpORM.is_video_note,
+            )
+            .where(PushUpORM.created_at >= begin_date)
+            .where(PushUpORM.created_at <= end_date)
+            .order_by(PushUpORM.created_at.asc())
+        )
+        cursor = await self._session.execute(query)
+        videos: dict[UUID, list[tuple[int, str, bool]]] = defaultdict(list)
+        for row in cursor:
+            videos[row.user_oid].append((row.push_up_count, row.telegram_file_id, row.is_video_note))
+        return videos
 
-        if not all_dates:
+    async def get_missed_days(self, user_oid: UUID, event_started_at: datetime) -> list[date]:
+        first_day = event_started_at.date()
+        today = get_moscow_date()
+        if first_day >= today:
             return []
 
-        push_ups = await self.get_by_user_oid_and_date(
-            user_oid=user_oid,
-            begin_date=event_started_at.astimezone(UTC),
-            end_date=today_moscow.astimezone(UTC),
+        cursor = await self._session.execute(
+            select(PushUpStreakORM.first_day, PushUpStreakORM.last_day).where(PushUpStreakORM.user_oid == user_oid),
+        )
+        streak = cursor.one_or_none()
+        if streak is None:
+            return _days_between(first_day, today)
+
+        # После серии подходов нет, внутри серии пропусков нет - в базу нужно смотреть только до ее начала
+        missed_after = _days_between(max(streak.last_day + timedelta(days=1), first_day), today)
+        if streak.first_day <= first_day:
+            return missed_after
+
+        lookup_end = min(streak.first_day, today)
+        cursor = await self._session.execute(
+            select(DailyPushUpTotalORM.moscow_date).where(
+                DailyPushUpTotalORM.user_oid == user_oid,
+                DailyPushUpTotalORM.moscow_date >= first_day,
+                DailyPushUpTotalORM.moscow_date < lookup_end,
+            ),
         )
+        days_with_push_ups = set(cursor.scalars().all())
+        missed_before = [day for day in _days_between(first_day, lookup_end) if day not in days_with_push_ups]
+        return missed_before + missed_after
+
+    async def _update_streak(self, user_oid: UUID, days: set[date]) -> None:
+        """Move the streak marker after push-ups for `days` were added."""
+        cursor = await self._session.execute(
+            select(PushUpStreakORM.first_day, PushUpStreakORM.last_day).where(PushUpStreakORM.user_oid == user_oid),
+        )
+        streak = cursor.one_or_none()
+        first_day: date | None = streak.first_day if streak else None
+        last_day: date | None = streak.last_day if streak else None
+        one_day = timedelta(days=1)
+        changed = False
+        for day in sorted(days):
+            if first_day is None or last_day is None:
+                # Первый подход пользователя - серия начинается с него
+                first_day, last_day = day, day
+            elif day > last_day + one_day:
+                first_day, last_day = day, day
+            elif day == last_day + one_day:
+                last_day = day
+            elif day == first_day - one_day:
+                # Штраф закрыл пропуск перед серией - она соединяется с днями до него
+                first_day = await self._get_run_start(user_oid, day)
+            else:
+                continue
+            changed = True
+        if not changed:
+            return
+
+        query = sqlite_insert(PushUpStreakORM).values(user_oid=user_oid, first_day=first_day, last_day=last_day)
+        query = query.on_conflict_do_update(
+            index_elements=[PushUpStreakORM.user_oid],
+            set_={'first_day': query.excluded.first_day, 'last_day': query.excluded.last_day},
+        )
+        await self._session.execute(query)
+
+    async def _get_run_start(self, user_oid: UUID, day: date) -> date:
+        """The first of the consecutive days with push-ups that end with `day`."""
+        query = (
+            select(DailyPushUpTotalORM.moscow_date)
+            .where(DailyPushUpTotalORM.user_oid == user_oid, DailyPushUpTotalORM.moscow_date < day)
+            .order_by(DailyPushUpTotalORM.moscow_date.desc())
+        )
+        cursor = await self._session.stream_scalars(query)
+        async for previous_day in cursor:
+            if previous_day != day - timedelta(days=1):
+                break
+            day = previous_day
+        await cursor.close()
+        return day
+
+    async def get_pending_archive(self, limit: int) -> list[PushUp]:
+        query = (
+            select(PushUpORM)
+            .where(
+                PushUpORM.archive_status == ArchiveStatus.PENDING.value,
+                or_(PushUpORM.archive_retry_at.is_(None), PushUpORM.archive_retry_at <= DatetimeProvider.provide()),
+            )
+            .order_by(PushUpORM.created_at)
+            .limit(limit)
+        )
+        cursor = await self._session.execute(query)
+        rows = cursor.scalars().all()
+        return [self._mapper.to_entity(row) for row in rows]
+
+    async def set_archive_status(
+        self,
+        telegram_file_id: str,
+        status: ArchiveStatus,
+        stored_object_oid: UUID | None = None,
+    ) -> int:
+        query = (
+            update(PushUpORM)
+            .where(
+                PushUpORM.telegram_file_id == telegram_file_id,
+                PushUpORM.archive_status == ArchiveStatus.PENDING.value,
+            )
+            .values(
+                archive_status=status.value,
+                stored_object_oid=stored_object_oid,
+                updated_at=DatetimeProvider.provide(),
+            )
+        )
+        cursor = cast(CursorResult, await self._session.execute(query))
+        return cursor.rowcount
+
+    async def postpone_archive(self, telegram_file_id: str, retry_at: datetime) -> None:
+        query = (
+            update(PushUpORM)
+            .where(
+                PushUpORM.telegram_file_id == telegram_file_id,
+                PushUpORM.archive_status == ArchiveStatus.PENDING.value,
+            )
+            .values(
+                archive_attempts=PushUpORM.archive_attempts + 1,
+                archive_retry_at=retry_at,
+                updated_at=DatetimeProvider.provide(),
+            )
+        )
+        await self._session.execute(query)
+
+    async def mark_duplicates(self, telegram_file_id: str) -> None:
+        query = (
+            update(PushUpORM)
+            .where(PushUpORM.telegram_file_id == telegram_file_id)
+            .values(is_duplicate=True, updated_at=DatetimeProvider.provide())
+        )
+        await self._session.execute(query)
+
+
+class VideoFingerprintRepository(IVideoFingerprintRepository):
+    def __init__(self, session: AsyncSession):
+        self._session = session
+        self._mapper = SqliteVideoFingerprintMapper
+
+    async def get(self, file_unique_id: str) -> VideoFingerprint | None:
+        query = select(VideoFingerprintORM).where(VideoFingerprintORM.file_unique_id == file_unique_id)
+        cursor = await self._session.execute(query)
+        row = cursor.scalar_one_or_none()
+        return self._mapper.to_entity(row) if row else None
+
+    async def add(self, fingerprint: VideoFingerprint) -> None:
+        query = sqlite_insert(VideoFingerprintORM).on_conflict_do_nothing(
+            index_elements=[VideoFingerprintORM.file_unique_id],
+        )
+        await self._session.execute(query, self._mapper.to_values(fingerprint))
+
+    async def set_content_hash(self, file_unique_id: str, content_hash: str) -> None:
+        query = (
+            update(VideoFingerprintORM)
+            .where(VideoFingerprintORM.file_unique_id == file_unique_id)
+            .values(content_hash=content_hash)
+        )
+        await self._session.execute(query)
+
+    async def get_by_content_hash(self, content_hash: str) -> list[VideoFingerprint]:
+        query = (
+            select(VideoFingerprintORM)
+            .where(VideoFingerprintORM.content_hash == content_hash)
+            .order_by(VideoFingerprintORM.created_at)
+        )
+        cursor = await self._session.execute(query)
+        rows = cursor.scalars().all()
+        return [self._mapper.to_entity(row) for row in rows]
+
 
-        days_with_push_ups = {p.created_at.astimezone(TimeZone.MOSCOW).date() for p in push_ups}
-        return [d for d in all_dates if d.date() not in days_with_push_ups]
+def _days_between(begin: date, end: date) -> list[date]:
+    """Days from `begin` up to, but not including, `end`."""
+    return [begin + timedelta(days=offset) for offset in range((end - begin).days)]
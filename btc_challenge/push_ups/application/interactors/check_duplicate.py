@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+
+from btc_challenge.push_ups.domain.repository import IVideoFingerprintRepository
+
+
+@dataclass
+class CheckDuplicateVideoInteractor:
+    fingerprint_repository: IVideoFingerprintRepository
+
+    async def execute(self, telegram_file_unique_id: str) -> bool:
+        """Присылали ли это видео раньше - один поиск по первичному ключу, без просмотра истории."""
+        fingerprint = await self.fingerprint_repository.get(telegram_file_unique_id)
+        return fingerprint is not None
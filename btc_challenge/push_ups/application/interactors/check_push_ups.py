@@ -1,12 +1,13 @@
 from dataclasses import dataclass
-from datetime import date
+from datetime import date, datetime, time
 
+from btc_challenge.events.application.cache import ActiveEventCache
 from btc_challenge.events.domain.entity import Event
 from btc_challenge.events.domain.repository import IEventRepository
 from btc_challenge.push_ups.domain.repository import IPushUpRepository
 from btc_challenge.shared.date import get_moscow_day_range
 from btc_challenge.shared.presentation.commands import Commands
-from btc_challenge.shared.providers import DatetimeProvider, TimeZone
+from btc_challenge.shared.providers import TimeZone
 from btc_challenge.users.domain.entity import User
 
 
@@ -23,10 +24,10 @@ class CheckDailyPushUpsResult:
 class CheckDailyPushUpsInteractor:
     event_repository: IEventRepository
     push_up_repository: IPushUpRepository
+    active_event_cache: ActiveEventCache
 
     async def execute(self, current_user: User) -> CheckDailyPushUpsResult:
-        now = DatetimeProvider.provide()
-        active_events = await self.event_repository.get_active_events_by_participant(current_user.oid, now)
+        active_events = await self.active_event_cache.get_by_participant(self.event_repository, current_user.oid)
         if not active_events:
             msg = str(
                 f'❌ Ты не участвуешь ни в одном активном ивенте!\n\n'
@@ -44,7 +45,9 @@ class CheckDailyPushUpsInteractor:
         )
         missed_days_to_day_number: list[tuple[date, int]] = []
         for missed_day in missed_days:
-            penalty = _calculate_penalty(event.get_day_number_by_date(missed_day))
+            penalty = _calculate_penalty(
+                event.get_day_number_by_date(datetime.combine(missed_day, time(), tzinfo=TimeZone.MOSCOW)),
+            )
             dto = (missed_day, penalty)
             missed_days_to_day_number.append(dto)
 
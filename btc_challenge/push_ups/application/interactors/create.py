@@ -1,24 +1,26 @@
 from dataclasses import dataclass
 
-from btc_challenge.push_ups.domain.entity import PushUp
-from btc_challenge.push_ups.domain.repository import IPushUpRepository
-from btc_challenge.shared.application.commiter import ICommiter
+from btc_challenge.events.domain.repository import IEventRepository
+from btc_challenge.push_ups.domain.entity import PushUp, VideoFingerprint
+from btc_challenge.push_ups.domain.repository import IPushUpRepository, IVideoFingerprintRepository
+from btc_challenge.shared.application.write_queue import IResolver, IWriteQueue
 from btc_challenge.shared.errors import ObjectNotFoundError
 from btc_challenge.users.domain.repository import IUserRepository
 
 
 @dataclass
 class CreatePushUpInteractor:
-    push_up_repository: IPushUpRepository
     user_repository: IUserRepository
-    commiter: ICommiter
+    write_queue: IWriteQueue
 
     async def execute(
         self,
         telegram_id: int,
         telegram_file_id: str,
+        telegram_file_unique_id: str,
         is_video_note: bool,
         count: int = 0,
+        is_duplicate: bool = False,
     ) -> PushUp:
         if count <= 0:
             msg = 'Count must be greater than 0'
@@ -39,8 +41,13 @@ class CreatePushUpInteractor:
             telegram_file_id=telegram_file_id,
             is_video_note=is_video_note,
             count=count,
+            is_duplicate=is_duplicate,
         )
-        await self.push_up_repository.create(push_up)
 
-        await self.commiter.commit()
+        async def write(scope: IResolver) -> None:
+            await scope.resolve(IPushUpRepository).create(push_up)
+            await scope.resolve(IVideoFingerprintRepository).add(VideoFingerprint.create(telegram_file_unique_id, push_up))
+            await scope.resolve(IEventRepository).add_push_ups(push_up.user_oid, push_up.count, push_up.created_at)
+
+        await self.write_queue.submit(write)
         return push_up
@@ -1,28 +1,32 @@
 from dataclasses import dataclass
 from datetime import datetime
 
-from btc_challenge.push_ups.domain.entity import PushUp
-from btc_challenge.push_ups.domain.repository import IPushUpRepository
-from btc_challenge.shared.application.commiter import ICommiter
+from btc_challenge.events.domain.repository import IEventRepository
+from btc_challenge.push_ups.domain.entity import PushUp, VideoFingerprint
+from btc_challenge.push_ups.domain.repository import IPushUpRepository, IVideoFingerprintRepository
+from btc_challenge.shared.application.write_queue import IResolver, IWriteQueue
 from btc_challenge.shared.errors import ObjectNotFoundError
 from btc_challenge.users.domain.repository import IUserRepository
 
 
 @dataclass
 class CreatePushUpPenaltyInteractor:
-    push_up_repository: IPushUpRepository
     user_repository: IUserRepository
-    commiter: ICommiter
+    write_queue: IWriteQueue
 
     async def execute(
         self,
         telegram_id: int,
         telegram_file_id: str,
+        telegram_file_unique_id: str,
         is_video_note: bool,
-        created_at: datetime,
-        count: int = 0,
-    ) -> PushUp:
-        if count <= 0:
+        penalties: list[tuple[datetime, int]],
+        is_duplicate: bool = False,
+    ) -> list[PushUp]:
+        if not penalties:
+            return []
+
+        if any(count <= 0 for _, count in penalties):
             msg = 'Count must be greater than 0'
             raise ValueError(msg)
 
@@ -35,16 +39,29 @@ class CreatePushUpPenaltyInteractor:
             msg = f'User with telegram_id {telegram_id} not found'
             raise ObjectNotFoundError(msg)
 
-        # Создаем запись о подходе
-        push_up = PushUp.create(
-            user_oid=user.oid,
-            telegram_file_id=telegram_file_id,
-            is_video_note=is_video_note,
-            count=count,
-        )
-        push_up.created_at = created_at
-        push_up.updated_at = created_at
-        await self.push_up_repository.create(push_up)
-
-        await self.commiter.commit()
-        return push_up
+        # Создаем записи о подходах, все дни делят одно видео
+        push_ups: list[PushUp] = []
+        for created_at, count in penalties:
+            push_up = PushUp.create(
+                user_oid=user.oid,
+                telegram_file_id=telegram_file_id,
+                is_video_note=is_video_note,
+                count=count,
+                is_duplicate=is_duplicate,
+            )
+            push_up.created_at = created_at
+            push_up.updated_at = created_at
+            push_ups.append(push_up)
+
+        async def write(scope: IResolver) -> None:
+            await scope.resolve(IPushUpRepository).create_many(push_ups)
+            # Отпечаток хранит первое появление видео - достаточно первого из подходов
+            await scope.resolve(IVideoFingerprintRepository).add(
+                VideoFingerprint.create(telegram_file_unique_id, push_ups[0]),
+            )
+            event_repository = scope.resolve(IEventRepository)
+            for push_up in push_ups:
+                await event_repository.add_push_ups(push_up.user_oid, push_up.count, push_up.created_at)
+
+        await self.write_queue.submit(write)
+        return push_ups
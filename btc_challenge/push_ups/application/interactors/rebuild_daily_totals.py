@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+
+from btc_challenge.push_ups.domain.repository import IPushUpRepository
+from btc_challenge.shared.application.commiter import ICommiter
+
+
+@dataclass
+class RebuildDailyTotalsInteractor:
+    push_up_repository: IPushUpRepository
+    commiter: ICommiter
+
+    async def execute(self) -> int:
+        rows_count = await self.push_up_repository.rebuild_daily_totals()
+        await self.commiter.commit()
+        return rows_count
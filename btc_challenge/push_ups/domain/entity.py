@@ -1,10 +1,17 @@
 from dataclasses import dataclass
 from datetime import datetime
+from enum import StrEnum
 from uuid import UUID, uuid4
 
 from btc_challenge.shared.providers import DatetimeProvider
 
 
+class ArchiveStatus(StrEnum):
+    PENDING = 'pending'
+    ARCHIVED = 'archived'
+    FAILED = 'failed'
+
+
 @dataclass
 class PushUp:
     oid: UUID
@@ -12,11 +19,23 @@ class PushUp:
     telegram_file_id: str
     is_video_note: bool
     count: int
+    archive_status: ArchiveStatus | None  # None - подход создан до архивации видео
+    stored_object_oid: UUID | None  # Копия видео в s3 хранилище
+    archive_attempts: int  # Неудачные попытки архивации
+    archive_retry_at: datetime | None  # Раньше этого времени архивация не повторяется
+    is_duplicate: bool  # Видео уже присылали раньше
     created_at: datetime
     updated_at: datetime
 
     @classmethod
-    def create(cls, user_oid: UUID, telegram_file_id: str, is_video_note: bool, count: int = 0) -> 'PushUp':
+    def create(
+        cls,
+        user_oid: UUID,
+        telegram_file_id: str,
+        is_video_note: bool,
+        count: int = 0,
+        is_duplicate: bool = False,
+    ) -> 'PushUp':
         now = DatetimeProvider.provide()
         return cls(
             oid=uuid4(),
@@ -24,6 +43,40 @@ class PushUp:
             telegram_file_id=telegram_file_id,
             is_video_note=is_video_note,
             count=count,
+            archive_status=ArchiveStatus.PENDING,
+            stored_object_oid=None,
+            archive_attempts=0,
+            archive_retry_at=None,
+            is_duplicate=is_duplicate,
             created_at=now,
             updated_at=now,
         )
+
+
+@dataclass
+class VideoFingerprint:
+    """Первое появление видео, по нему находятся повторно присланные доказательства."""
+
+    file_unique_id: str  # Одинаковый для одного файла в любых сообщениях и у любых ботов
+    push_up_oid: UUID
+    user_oid: UUID
+    content_hash: str | None  # sha256 содержимого, считается при архивации
+    created_at: datetime
+
+    @classmethod
+    def create(cls, file_unique_id: str, push_up: PushUp) -> 'VideoFingerprint':
+        return cls(
+            file_unique_id=file_unique_id,
+            push_up_oid=push_up.oid,
+            user_oid=push_up.user_oid,
+            content_hash=None,
+            created_at=DatetimeProvider.provide(),
+        )
+
+
+@dataclass
+class UserPushUpTotals:
+    user_oid: UUID
+    username: str
+    total_count: int
+    push_ups_count: int
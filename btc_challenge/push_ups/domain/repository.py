@@ -1,14 +1,17 @@
 from abc import ABC, abstractmethod
-from datetime import datetime
+from datetime import date, datetime
 from uuid import UUID
 
-from btc_challenge.push_ups.domain.entity import PushUp
+from btc_challenge.push_ups.domain.entity import ArchiveStatus, PushUp, UserPushUpTotals, VideoFingerprint
 
 
 class IPushUpRepository(ABC):
     @abstractmethod
     async def create(self, push_up: PushUp) -> None: ...
 
+    @abstractmethod
+    async def create_many(self, push_ups: list[PushUp]) -> None: ...
+
     @abstractmethod
     async def get_by_oid(self, push_up_id: UUID) -> PushUp | None: ...
 
@@ -32,4 +35,63 @@ class IPushUpRepository(ABC):
     ) -> list[PushUp]: ...
 
     @abstractmethod
-    async def get_missed_days(self, user_oid: UUID, event_started_at: datetime) -> list[datetime]: ...
+    async def get_users_totals(
+        self,
+        begin_date: date,
+        end_date: date,
+        user_oids: list[UUID] | None = None,
+    ) -> list[UserPushUpTotals]:
+        """Aggregated push-ups of verified users for Moscow days in [begin_date, end_date], ordered by total."""
+
+    @abstractmethod
+    async def rebuild_daily_totals(self) -> int:
+        """Recompute the daily totals from push-up rows, returns the number of (user, day) rows."""
+
+    @abstractmethod
+    async def get_videos_by_user(
+        self,
+        begin_date: datetime,
+        end_date: datetime,
+    ) -> dict[UUID, list[tuple[int, str, bool]]]:
+        """(count, file_id, is_video_note) of every push-up in the window, grouped by user."""
+
+    @abstractmethod
+    async def get_missed_days(self, user_oid: UUID, event_started_at: datetime) -> list[date]:
+        """Moscow dates from the event start until yesterday without push-ups."""
+
+    @abstractmethod
+    async def get_pending_archive(self, limit: int) -> list[PushUp]:
+        """Push-ups whose video is not archived yet and is not waiting for a retry, oldest first."""
+
+    @abstractmethod
+    async def set_archive_status(
+        self,
+        telegram_file_id: str,
+        status: ArchiveStatus,
+        stored_object_oid: UUID | None = None,
+    ) -> int:
+        """Set the archive result for every pending push-up with this video, returns the number of push-ups."""
+
+    @abstractmethod
+    async def postpone_archive(self, telegram_file_id: str, retry_at: datetime) -> None:
+        """Count a failed archive attempt for every pending push-up with this video and retry after `retry_at`."""
+
+    @abstractmethod
+    async def mark_duplicates(self, telegram_file_id: str) -> None:
+        """Flag every push-up with this video as a duplicate proof."""
+
+
+class IVideoFingerprintRepository(ABC):
+    @abstractmethod
+    async def get(self, file_unique_id: str) -> VideoFingerprint | None: ...
+
+    @abstractmethod
+    async def add(self, fingerprint: VideoFingerprint) -> None:
+        """Register the first appearance of a video, a video that is already known is left as is."""
+
+    @abstractmethod
+    async def set_content_hash(self, file_unique_id: str, content_hash: str) -> None: ...
+
+    @abstractmethod
+    async def get_by_content_hash(self, content_hash: str) -> list[VideoFingerprint]:
+        """Videos with this content whatever their `file_unique_id`, the earliest first."""
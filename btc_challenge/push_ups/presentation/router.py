@@ -4,11 +4,14 @@ from datetime import date, datetime, timedelta
 from aiogram import Bot, F, Router, filters, types
 from aiogram.fsm.context import FSMContext
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
-from punq import Container
 
 from btc_challenge.chats.adapters.sqlite.repository import ChatRepository
+from btc_challenge.chats.application.cache import get_active_chat_cache
+from btc_challenge.container import RequestContainer
 from btc_challenge.events.adapters.sqlite.repository import EventRepository
+from btc_challenge.events.application.cache import ActiveEventCache, get_active_event_cache
 from btc_challenge.push_ups.adapters.sqlite.repository import PushUpRepository
+from btc_challenge.push_ups.application.interactors.check_duplicate import CheckDuplicateVideoInteractor
 from btc_challenge.push_ups.application.interactors.check_push_ups import CheckDailyPushUpsInteractor
 from btc_challenge.push_ups.application.interactors.create import CreatePushUpInteractor
 from btc_challenge.push_ups.application.interactors.create_penalty import CreatePushUpPenaltyInteractor
@@ -18,14 +21,15 @@ from btc_challenge.push_ups.application.interactors.get_all_users_stats_by_date
 )
 from btc_challenge.push_ups.application.interactors.get_daily_stats import GetDailyStatsInteractor
 from btc_challenge.push_ups.presentation.states import PushUpStates
-from btc_challenge.shared.adapters.sqlite.session import get_async_session
-from btc_challenge.shared.date import get_moscow_day_range
+from btc_challenge.shared.adapters.sqlite.session import get_async_readonly_session, get_async_session
+from btc_challenge.shared.adapters.telegram.broadcast import get_broadcaster
+from btc_challenge.shared.date import get_moscow_date
 from btc_challenge.shared.errors import ObjectNotFoundError
 from btc_challenge.shared.presentation.checks import require_verified
 from btc_challenge.shared.presentation.commands import Commands
 from btc_challenge.shared.providers import DatetimeProvider
+from btc_challenge.shared.tasks.video_archive import wake_video_archive
 from btc_challenge.shared.utils import pluralize_pushups
-from btc_challenge.users.adapters.sqlite.repository import UserRepository
 from btc_challenge.users.domain.entity import User
 
 push_ups_router = Router()
@@ -58,13 +62,16 @@ async def cmd_add_push_up(message: types.Message, state: FSMContext, user: User)
         interactor = CheckDailyPushUpsInteractor(
             event_repository=EventRepository(session),
             push_up_repository=PushUpRepository(session),
+            active_event_cache=get_active_event_cache(),
         )
         result = await interactor.execute(user)
         if result.count is None:
             await message.answer(result.msg)
             return
 
-    await state.update_data(count=result.count, today_count=result.today_count, penalty_days=result.penalty_days)
+    # Данные FSM хранятся в JSON, даты передаем строками
+    penalty_days = [(day.isoformat(), count) for day, count in result.penalty_days]
+    await state.update_data(count=result.count, today_count=result.today_count, penalty_days=penalty_days)
     await state.set_state(PushUpStates.waiting_for_video)
     await message.answer(result.msg)
 
@@ -74,7 +81,7 @@ async def process_video(
     message: types.Message,
     state: FSMContext,
     bot: Bot,
-    container: Container,
+    container: RequestContainer,
     user: User | None,
 ) -> None:
     if not await require_verified(message, user):
@@ -88,7 +95,9 @@ async def process_video(
     data = await state.get_data()
     count = data.get('count', 0)
     today_count = data.get('today_count', count)
-    penalty_days: list[tuple[date, int]] = data.get('penalty_days', [])
+    penalty_days: list[tuple[date, int]] = [
+        (date.fromisoformat(day), penalty_count) for day, penalty_count in data.get('penalty_days', [])
+    ]
 
     if count <= 0:
         await message.answer('Ошибка: некорректное количество отжиманий')
@@ -107,30 +116,43 @@ async def process_video(
     else:
         return
 
+    # Видео проверяется один раз на всю отправку: штрафные дни делят одно видео
+    check_duplicate: CheckDuplicateVideoInteractor = container.resolve(CheckDuplicateVideoInteractor)
+    is_duplicate = await check_duplicate.execute(file.file_unique_id)
+
     # Сохраняем запись за сегодня
     if today_count > 0:
         interactor: CreatePushUpInteractor = container.resolve(CreatePushUpInteractor)
         await interactor.execute(
             telegram_id=user_id,
             telegram_file_id=file.file_id,
+            telegram_file_unique_id=file.file_unique_id,
             is_video_note=is_video_note,
             count=today_count,
+            is_duplicate=is_duplicate,
         )
 
     else:
-        # Сохраняем записи за каждый пропущенный день
-        for created_at, penalty_count in penalty_days:
-            interactor: CreatePushUpPenaltyInteractor = container.resolve(CreatePushUpPenaltyInteractor)
-            await interactor.execute(
-                telegram_id=user_id,
-                telegram_file_id=file.file_id,
-                is_video_note=is_video_note,
-                count=penalty_count,
-                created_at=datetime.combine(created_at, datetime.max.time()) - timedelta(hours=3),
-            )
+        # Сохраняем записи за все пропущенные дни одной транзакцией
+        penalty_interactor: CreatePushUpPenaltyInteractor = container.resolve(CreatePushUpPenaltyInteractor)
+        await penalty_interactor.execute(
+            telegram_id=user_id,
+            telegram_file_id=file.file_id,
+            telegram_file_unique_id=file.file_unique_id,
+            is_video_note=is_video_note,
+            penalties=[
+                (datetime.combine(day, datetime.max.time()) - timedelta(hours=3), penalty_count)
+                for day, penalty_count in penalty_days
+            ],
+            is_duplicate=is_duplicate,
+        )
 
     await state.clear()
+    wake_video_archive()
     await message.answer(f'Подход сохранен! {count} {pluralize_pushups(count)} 💪')
+    if is_duplicate:
+        logger.warning('User %s sent a video that was already submitted: %s', user_id, file.file_unique_id)
+        await message.answer('⚠️ Это видео уже присылали раньше, подход отмечен как повторный')
 
     # Отправляем уведомления участникам событий
     await _notify_event_participants(
@@ -148,7 +170,7 @@ async def wrong_video_type(message: types.Message) -> None:
 
 
 @push_ups_router.message(filters.Command(Commands.INFO))
-async def cmd_info(message: types.Message, container: Container, user: User | None) -> None:
+async def cmd_info(message: types.Message, container: RequestContainer, user: User | None) -> None:
     if not await require_verified(message, user):
         return
 
@@ -170,22 +192,12 @@ async def cmd_info(message: types.Message, container: Container, user: User | No
 
     # Получаем статистику за ивент
     event_total = 0
-    async with get_async_session() as session:
+    async with get_async_readonly_session() as session:
         event_repository = EventRepository(session)
-        active_event = await event_repository.get_current_active_event()
+        active_event = await container.resolve(ActiveEventCache).get_current(event_repository)
 
         if active_event:
-            push_up_repository = PushUpRepository(session)
-            now = DatetimeProvider.provide()
-            event_begin = active_event.start_at.replace(hour=0, minute=0, second=0, microsecond=0)
-            event_end = now.replace(hour=23, minute=59, second=59, microsecond=999999)
-
-            event_pushups = await push_up_repository.get_by_user_oid_and_date(
-                user_oid=user.oid,
-                begin_date=event_begin,
-                end_date=event_end,
-            )
-            event_total = sum(p.count for p in event_pushups)
+            event_total = await event_repository.get_participant_total(active_event.oid, user.oid)
 
     # Отправляем статистику
     stats_text = f'📊 Статистика за сегодня:\n\nВсего отжиманий: {stats.total_count}\nПодходов: {stats.push_ups_count}'
@@ -206,11 +218,10 @@ async def cmd_info(message: types.Message, container: Container, user: User | No
 
 
 @push_ups_router.message(filters.Command(Commands.STATS, Commands.LEADERBOARD))
-async def cmd_stats(message: types.Message, container: Container) -> None:
-    # Получаем начало и конец сегодняшнего дня по Москве
-    begin_date, end_date = get_moscow_day_range()
+async def cmd_stats(message: types.Message, container: RequestContainer) -> None:
+    today = get_moscow_date()
     interactor: GetAllUsersStatsInteractor = container.resolve(GetAllUsersStatsInteractor)
-    stats_list = await interactor.execute(begin_date, end_date)
+    stats_list = await interactor.execute(today, today)
 
     if not stats_list:
         await message.answer('Сегодня еще никто не отжимался')
@@ -219,35 +230,13 @@ async def cmd_stats(message: types.Message, container: Container) -> None:
     # Получаем статистику за ивент
     event_stats = {}
     total_event_pushups = 0
-    async with get_async_session() as session:
+    async with get_async_readonly_session() as session:
         event_repository = EventRepository(session)
-        active_event = await event_repository.get_current_active_event()
+        active_event = await container.resolve(ActiveEventCache).get_current(event_repository)
 
         if active_event:
-            push_up_repository = PushUpRepository(session)
-            now = DatetimeProvider.provide()
-            event_begin = active_event.start_at.replace(hour=0, minute=0, second=0, microsecond=0)
-            event_end = now.replace(hour=23, minute=59, second=59, microsecond=999999)
-
-            user_repository = UserRepository(session)
-            all_users = await user_repository.get_many(is_verified=True)
-            user_oids = [user.oid for user in all_users]
-
-            all_event_pushups = await push_up_repository.get_by_user_oids_and_date(
-                user_oids=user_oids,
-                begin_date=event_begin,
-                end_date=event_end,
-            )
-
-            # Группируем по пользователям
-            user_map = {user.oid: user for user in all_users}
-            for push_up in all_event_pushups:
-                user = user_map.get(push_up.user_oid)
-                if user:
-                    if user.username not in event_stats:
-                        event_stats[user.username] = 0
-                    event_stats[user.username] += push_up.count
-                    total_event_pushups += push_up.count
+            event_stats = await event_repository.get_participant_totals(active_event.oid)
+            total_event_pushups = sum(event_stats.values())
 
     # Формируем текст с рейтингом
     medals = {1: '🥇', 2: '🥈', 3: '🥉'}
@@ -260,8 +249,8 @@ async def cmd_stats(message: types.Message, container: Container) -> None:
     for idx, stats in enumerate(stats_list, start=1):
         medal = medals.get(idx, f'{idx}.')
         event_info = ''
-        if active_event and stats.username in event_stats:
-            event_info = f' (за ивент: {event_stats[stats.username]})'
+        if active_event and stats.user_oid in event_stats:
+            event_info = f' (за ивент: {event_stats[stats.user_oid]})'
         stats_text += f'{medal} @{stats.username}\nОтжиманий: {stats.total_count} ({stats.push_ups_count} подходов){event_info}\n\n'
 
     await message.answer(stats_text)
@@ -290,7 +279,7 @@ async def cmd_history(message: types.Message, user: User | None) -> None:
 async def process_history_callback(
     callback: types.CallbackQuery,
     state: FSMContext,
-    container: Container,
+    container: RequestContainer,
     user: User | None,
 ) -> None:
     if not callback.data or not callback.message:
@@ -324,7 +313,7 @@ async def process_history_callback(
 async def process_custom_date(
     message: types.Message,
     state: FSMContext,
-    container: Container,
+    container: RequestContainer,
     user: User | None,
 ) -> None:
     if not await require_verified(message, user):
@@ -354,7 +343,7 @@ async def wrong_date_type(message: types.Message) -> None:
 
 async def _show_stats_for_date(
     message: types.Message,
-    container: Container,
+    container: RequestContainer,
     target_date: datetime,
 ) -> None:
     """Show statistics for all users for a specific date."""
@@ -402,17 +391,15 @@ async def _notify_event_participants(
     try:
         async with get_async_session() as session:
             event_repository = EventRepository(session)
-            chat_repository = ChatRepository(session)
 
-            now = DatetimeProvider.provide()
             # Get active events where user is a participant
-            active_events = await event_repository.get_active_events_by_participant(user.oid, now)
+            active_events = await get_active_event_cache().get_by_participant(event_repository, user.oid)
 
             if not active_events:
                 return
 
             # Get active group chats
-            active_chats = await chat_repository.get_many(is_active=True)
+            active_chats = await get_active_chat_cache().get_active_chats(ChatRepository(session))
             if not active_chats:
                 return
 
@@ -423,28 +410,23 @@ async def _notify_event_participants(
                     f'💪 {count} {pluralize_pushups(count)}'
                 )
 
+                async def send(chat_id: int) -> None:
+                    if is_video_note:
+                        await bot.send_video_note(chat_id=chat_id, video_note=file_id)
+                        await bot.send_message(chat_id=chat_id, text=notification_text)
+                    else:
+                        await bot.send_video(chat_id=chat_id, video=file_id, caption=notification_text)
+
                 # Send to all active group chats
-                for chat in active_chats:
-                    logger.info(f'Sending notification to chat {chat.title} with id {chat.telegram_chat_id}')
-                    try:
-                        if is_video_note:
-                            await bot.send_video_note(
-                                chat_id=chat.telegram_chat_id,
-                                video_note=file_id,
-                            )
-                            await bot.send_message(
-                                chat_id=chat.telegram_chat_id,
-                                text=notification_text,
-                            )
-                        else:
-                            await bot.send_video(
-                                chat_id=chat.telegram_chat_id,
-                                video=file_id,
-                                caption=notification_text,
-                            )
-                    except Exception as e:
+                results = await get_broadcaster(bot).send(
+                    [chat.telegram_chat_id for chat in active_chats],
+                    send,
+                    messages=2 if is_video_note else 1,
+                )
+                for chat, result in zip(active_chats, results):
+                    if not result.ok:
                         # Group might have removed the bot or bot doesn't have permissions
-                        logger.warning(f'Failed to send notification to chat {chat.telegram_chat_id}: {e}')
+                        logger.warning(f'Failed to send notification to chat {chat.telegram_chat_id}: {result.error}')
 
     except Exception as e:
         # Don't fail the main flow if notifications fail
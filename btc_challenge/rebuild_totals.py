@@ -0,0 +1,34 @@
+"""Пересчитывает daily_push_up_totals и суммы участников ивентов по таблице push_up.
+
+Запуск: PYTHONPATH=. python btc_challenge/rebuild_totals.py
+"""
+
+import asyncio
+import logging
+
+from btc_challenge.container import build_container
+from btc_challenge.events.application.interactors.rebuild_totals import RebuildEventTotalsInteractor
+from btc_challenge.push_ups.application.interactors.rebuild_daily_totals import RebuildDailyTotalsInteractor
+from btc_challenge.shared.adapters.sqlite.session import get_async_engine
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    container = build_container().scope()
+    try:
+        daily_interactor: RebuildDailyTotalsInteractor = container.resolve(RebuildDailyTotalsInteractor)
+        rows_count = await daily_interactor.execute()
+        logger.info('Rebuilt daily push-up totals: %s rows', rows_count)
+
+        event_interactor: RebuildEventTotalsInteractor = container.resolve(RebuildEventTotalsInteractor)
+        await event_interactor.execute()
+        logger.info('Rebuilt event participant totals')
+    finally:
+        await container.close()
+        await get_async_engine().dispose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -1,6 +1,10 @@
-from dataclasses import dataclass
-from functools import lru_cache
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
 from io import BytesIO
+from typing import Any, TypeVar
 
 from minio import Minio, S3Error
 from minio.commonconfig import ENABLED, Filter
@@ -9,7 +13,9 @@ from urllib3 import BaseHTTPResponse
 
 from btc_challenge.config import AppConfig
 from btc_challenge.shared.enums import MinioPrefixes
-from btc_challenge.shared.storage import PART_SIZE, IS3Storage
+from btc_challenge.shared.storage import CHUNK_SIZE, PART_SIZE, IS3Storage
+
+T = TypeVar("T")
 
 
 @lru_cache(1)
@@ -39,25 +45,99 @@ def init_minio(config: type[AppConfig] = AppConfig) -> Minio:
     return minio_client
 
 
+@lru_cache(1)
+def get_minio_executor(config: type[AppConfig] = AppConfig) -> ThreadPoolExecutor:
+    # Клиент minio синхронный: запросы выполняются в пуле потоков ограниченного размера
+    return ThreadPoolExecutor(max_workers=config.minio.max_workers, thread_name_prefix="minio")
+
+
+class _ChunksReader:
+    """Синхронный file-like объект поверх асинхронного итератора, читается minio из потока пула.
+
+    Следующая часть запрашивается у event loop только когда minio ее читает, поэтому в памяти
+    остается не больше одной части multipart загрузки.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes], loop: asyncio.AbstractEventLoop):
+        self._chunks = aiter(chunks)
+        self._loop = loop
+        self._buffer = bytearray()
+        self._exhausted = False
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._exhausted and (size < 0 or len(self._buffer) < size):
+            chunk = asyncio.run_coroutine_threadsafe(self._next_chunk(), self._loop).result()
+            if chunk is None:
+                self._exhausted = True
+            else:
+                self._buffer += chunk
+        if size < 0:
+            size = len(self._buffer)
+        with memoryview(self._buffer) as view:
+            data = bytes(view[:size])
+        del self._buffer[:size]
+        return data
+
+    async def _next_chunk(self) -> bytes | None:
+        try:
+            return await anext(self._chunks)
+        except StopAsyncIteration:
+            return None
+
+
 @dataclass(kw_only=True, slots=True, eq=False)
 class MinioStorage(IS3Storage):
     s3_client: Minio
     bucket_name: str = AppConfig.minio.bucket_name
     part_size: int = PART_SIZE
+    executor: Executor = field(default_factory=get_minio_executor)
 
     async def put_bytes(self, filename: str, data: bytes, is_temporary: bool = False) -> str:
-        obj_stream = BytesIO(data)
-        filename = f"{MinioPrefixes.TMP.value if is_temporary else ''}{filename}"
-        self.s3_client.put_object(
+        filename = self._object_name(filename, is_temporary)
+        await self._run(
+            self.s3_client.put_object,
             bucket_name=self.bucket_name,
             object_name=filename,
-            data=obj_stream,
+            data=BytesIO(data),
             length=-1,
             part_size=self.part_size,
         )
         return filename
 
     async def get_bytes(self, filename: str) -> bytes | None:
+        return await self._run(self._read_object, filename)
+
+    async def put_stream(self, filename: str, chunks: AsyncIterator[bytes], is_temporary: bool = False) -> str:
+        filename = self._object_name(filename, is_temporary)
+        await self._run(
+            self.s3_client.put_object,
+            bucket_name=self.bucket_name,
+            object_name=filename,
+            data=_ChunksReader(chunks, asyncio.get_running_loop()),
+            length=-1,
+            part_size=self.part_size,
+            num_parallel_uploads=1,  # части грузятся по одной, в памяти не больше одной части
+        )
+        return filename
+
+    async def get_stream(self, filename: str, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes] | None:
+        try:
+            response = await self._run(self.s3_client.get_object, bucket_name=self.bucket_name, object_name=filename)
+        except S3Error:
+            return None
+        return self._iter_response(response, chunk_size)
+
+    async def delete(self, filename: str) -> None:
+        await self._run(self.s3_client.remove_object, bucket_name=self.bucket_name, object_name=filename)
+
+    async def _iter_response(self, response: BaseHTTPResponse, chunk_size: int) -> AsyncIterator[bytes]:
+        try:
+            while chunk := await self._run(response.read, chunk_size):
+                yield chunk
+        finally:
+            await self._run(self._release, response)
+
+    def _read_object(self, filename: str) -> bytes | None:
         response: BaseHTTPResponse | None = None
         try:
             response = self.s3_client.get_object(bucket_name=self.bucket_name, object_name=filename)
@@ -66,8 +146,19 @@ class MinioStorage(IS3Storage):
             return None
         finally:
             if response:
-                response.close()
-                response.release_conn()
+                self._release(response)
+
+    @staticmethod
+    def _release(response: BaseHTTPResponse) -> None:
+        response.close()
+        response.release_conn()
+
+    @staticmethod
+    def _object_name(filename: str, is_temporary: bool) -> str:
+        return f"{MinioPrefixes.TMP.value if is_temporary else ''}{filename}"
+
+    async def _run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, partial(func, *args, **kwargs))
 
 
 @lru_cache(1)
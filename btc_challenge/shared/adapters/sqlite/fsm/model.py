@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from btc_challenge.shared.adapters.sqlite.models import BaseORM
+
+
+class FsmStateORM(BaseORM):
+    __tablename__ = 'fsm_states'
+
+    key: Mapped[str] = mapped_column(primary_key=True)
+    'Ключ FSM: бот, чат, пользователь и destiny'
+    state: Mapped[str | None]
+    data: Mapped[str]
+    'Данные FSM в JSON'
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
@@ -0,0 +1,222 @@
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, KeyBuilder, StateType, StorageKey
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from btc_challenge.shared.adapters.sqlite.fsm.model import FsmStateORM
+from btc_challenge.shared.adapters.sqlite.session import ReadOnlySession
+
+logger = logging.getLogger(__name__)
+
+FSM_FLUSH_INTERVAL = 0.5
+FSM_CACHE_SIZE = 10_000
+
+
+@dataclass(slots=True)
+class _Record:
+    state: str | None = None
+    data: dict[str, Any] = field(default_factory=dict)
+
+
+class SqliteStorage(BaseStorage):
+    """FSM storage in SQLite with an in-memory write-back cache.
+
+    Writes go to the cache and are flushed to the database in one transaction every
+    `flush_interval` seconds, reads are served from the cache. The cache is only correct while
+    a single process works with the storage. With `shared=True` (several processes) there is no
+    cache: every read goes to the database and every write updates only the changed column
+    right away, so workers don't overwrite each other's state or data.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        readonly_session_factory: async_sessionmaker[ReadOnlySession],
+        shared: bool = False,
+        flush_interval: float = FSM_FLUSH_INTERVAL,
+        cache_size: int = FSM_CACHE_SIZE,
+        key_builder: KeyBuilder | None = None,
+    ):
+        self._session_factory = session_factory
+        self._readonly_session_factory = readonly_session_factory
+        self._shared = shared
+        self._flush_interval = flush_interval
+        self._cache_size = cache_size
+        self._key_builder = key_builder or DefaultKeyBuilder(with_bot_id=True, with_destiny=True)
+        self._cache: OrderedDict[str, _Record] = OrderedDict()
+        self._dirty: set[str] = set()
+        self._has_dirty = asyncio.Event()
+        self._flusher: asyncio.Task[None] | None = None
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        value = state.state if isinstance(state, State) else state
+        if self._shared:
+            await self._write_through(self._key_builder.build(key), state=value)
+            return
+        record = await self._get_record(key)
+        record.state = value
+        self._mark_dirty(key)
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        record = await self._get_record(key)
+        return record.state
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        if self._shared:
+            await self._write_through(self._key_builder.build(key), data=json.dumps(dict(data), ensure_ascii=False))
+            return
+        record = await self._get_record(key)
+        record.data = dict(data)
+        self._mark_dirty(key)
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        record = await self._get_record(key)
+        return record.data.copy()
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write all changed records to the database in one transaction."""
+        if not self._dirty:
+            return
+        keys, self._dirty = self._dirty, set()
+        now = datetime.now(UTC)
+        rows: list[dict[str, Any]] = []
+        empty_keys: list[str] = []
+        for storage_key in keys:
+            record = self._cache[storage_key]
+            if record.state is None and not record.data:
+                empty_keys.append(storage_key)  # state.clear() - строку храним только для активных диалогов
+            else:
+                rows.append(
+                    {
+                        'key': storage_key,
+                        'state': record.state,
+                        'data': json.dumps(record.data, ensure_ascii=False),
+                        'updated_at': now,
+                    },
+                )
+
+        try:
+            async with self._session_factory() as session:
+                if rows:
+                    stmt = insert(FsmStateORM)
+                    await session.execute(
+                        stmt.on_conflict_do_update(
+                            index_elements=[FsmStateORM.key],
+                            set_={
+                                'state': stmt.excluded.state,
+                                'data': stmt.excluded.data,
+                                'updated_at': stmt.excluded.updated_at,
+                            },
+                        ),
+                        rows,
+                    )
+                if empty_keys:
+                    await session.execute(delete(FsmStateORM).where(FsmStateORM.key.in_(empty_keys)))
+                await session.commit()
+        except BaseException:
+            # Изменения остаются в кэше и будут записаны при следующем сбросе
+            self._dirty |= keys
+            raise
+        self._evict()
+
+    async def _write_through(self, storage_key: str, **values: Any) -> None:
+        """Write one column of the record, the other column keeps what another process wrote there."""
+        async with self._session_factory() as session:
+            row = {'key': storage_key, 'state': None, 'data': '{}', 'updated_at': datetime.now(UTC)}
+            stmt = insert(FsmStateORM).values(row | values)
+            await session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[FsmStateORM.key],
+                    set_={name: stmt.excluded[name] for name in [*values, 'updated_at']},
+                ),
+            )
+            # state.clear() - строку храним только для активных диалогов
+            await session.execute(
+                delete(FsmStateORM).where(
+                    FsmStateORM.key == storage_key,
+                    FsmStateORM.state.is_(None),
+                    FsmStateORM.data == '{}',
+                ),
+            )
+            await session.commit()
+
+    async def _get_record(self, key: StorageKey) -> _Record:
+        storage_key = self._key_builder.build(key)
+        if self._shared:
+            return await self._load(storage_key)
+        record = self._get_cached(storage_key)
+        if record is not None:
+            return record
+
+        loaded = await self._load(storage_key)
+        # Пока шло чтение, запись могли изменить в этом же процессе - она новее прочитанной
+        record = self._get_cached(storage_key)
+        if record is not None:
+            return record
+        self._cache[storage_key] = loaded
+        return loaded
+
+    def _get_cached(self, storage_key: str) -> _Record | None:
+        record = self._cache.get(storage_key)
+        if record is not None:
+            self._cache.move_to_end(storage_key)
+        return record
+
+    async def _load(self, storage_key: str) -> _Record:
+        async with self._readonly_session_factory() as session:
+            result = await session.execute(
+                select(FsmStateORM.state, FsmStateORM.data).where(FsmStateORM.key == storage_key),
+            )
+            row = result.one_or_none()
+        record = _Record()
+        if row is not None:
+            record.state = row.state
+            record.data = json.loads(row.data)
+        return record
+
+    def _mark_dirty(self, key: StorageKey) -> None:
+        self._dirty.add(self._key_builder.build(key))
+        self._has_dirty.set()
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._run_flusher())
+
+    async def _run_flusher(self) -> None:
+        while True:
+            await self._has_dirty.wait()
+            # Копим изменения за интервал и пишем их одной транзакцией
+            await asyncio.sleep(self._flush_interval)
+            self._has_dirty.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception('Failed to flush FSM states')
+                self._has_dirty.set()
+
+    def _evict(self) -> None:
+        """Drop the least recently used records that are already written to the database."""
+        excess = len(self._cache) - self._cache_size
+        if excess <= 0:
+            return
+        for storage_key in list(self._cache):
+            if excess <= 0:
+                break
+            if storage_key not in self._dirty:
+                del self._cache[storage_key]
+                excess -= 1
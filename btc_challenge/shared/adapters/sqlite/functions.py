@@ -0,0 +1,19 @@
+from datetime import date
+from typing import Any
+
+from sqlalchemy import Date, func
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql.elements import ColumnElement
+
+from btc_challenge.shared.providers import DatetimeProvider, TimeZone
+
+
+def moscow_date(column: ColumnElement[Any] | InstrumentedAttribute[Any]) -> ColumnElement[date]:
+    """Московская дата для колонки с datetime в UTC.
+
+    SQLite хранит datetime без смещения, поэтому сдвигаем на текущий UTC offset Москвы
+    (перехода на летнее время нет с 2014 года).
+    """
+    utc_offset = DatetimeProvider.provide(TimeZone.MOSCOW).utcoffset()
+    seconds = int(utc_offset.total_seconds()) if utc_offset else 0
+    return func.date(column, f'{seconds:+d} seconds', type_=Date)
@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from btc_challenge.shared.adapters.sqlite.models import BaseORM
+
+
+class ScheduledJobORM(BaseORM):
+    __tablename__ = 'scheduled_jobs'
+    __table_args__ = (Index('ix_scheduled_jobs_due_at', 'due_at'),)
+
+    key: Mapped[str] = mapped_column(primary_key=True)
+    'Имя задачи и аргумент через двоеточие, например `event_start:<oid>`'
+    due_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    'Время запуска в UTC'
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
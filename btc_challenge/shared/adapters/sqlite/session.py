@@ -1,15 +1,65 @@
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Callable
 from contextlib import asynccontextmanager
 from functools import lru_cache
+from typing import Any
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
 from btc_challenge.config import AppConfig
 
 
+class ReadOnlySession(AsyncSession):
+    """Session bound to the read-only engine, for reports that must not wait for writers."""
+
+
+def _pragmas_listener(pragmas: dict[str, str | int]) -> Callable[[Any, Any], None]:
+    def set_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+    return set_pragmas
+
+
 @lru_cache(1)
 def get_async_engine(echo: bool = False) -> AsyncEngine:
-    return create_async_engine(url=AppConfig.sqlite.async_url, echo=echo)
+    engine = create_async_engine(url=AppConfig.sqlite.async_url, echo=echo)
+    event.listen(engine.sync_engine, "connect", _pragmas_listener(AppConfig.sqlite.pragmas))
+    return engine
+
+
+@lru_cache(1)
+def get_async_readonly_engine(echo: bool = False) -> AsyncEngine:
+    engine = create_async_engine(
+        url=AppConfig.sqlite.readonly_async_url,
+        echo=echo,
+        pool_size=AppConfig.sqlite.read_pool_size,
+        max_overflow=0,
+    )
+    event.listen(engine.sync_engine, "connect", _pragmas_listener(AppConfig.sqlite.readonly_pragmas))
+    return engine
+
+
+@lru_cache(1)
+def get_async_writer_engine(echo: bool = False) -> AsyncEngine:
+    """Single connection for the write queue, transactions start with BEGIN IMMEDIATE."""
+    engine = create_async_engine(url=AppConfig.sqlite.async_url, echo=echo, pool_size=1, max_overflow=0)
+    event.listen(engine.sync_engine, "connect", _pragmas_listener(AppConfig.sqlite.pragmas))
+
+    # pysqlite сам откладывает BEGIN, из-за чего не работают SAVEPOINT - управляем транзакцией вручную
+    @event.listens_for(engine.sync_engine, "connect")
+    def disable_driver_transactions(dbapi_connection: Any, connection_record: Any) -> None:
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def begin_immediate(connection: Any) -> None:
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+    return engine
 
 
 @lru_cache(1)
@@ -19,6 +69,20 @@ def get_async_sessionmaker(
     return async_sessionmaker(bind=engine, expire_on_commit=False)
 
 
+@lru_cache(1)
+def get_async_readonly_sessionmaker(
+    engine: AsyncEngine = get_async_readonly_engine(),
+) -> async_sessionmaker[ReadOnlySession]:
+    return async_sessionmaker(bind=engine, class_=ReadOnlySession, expire_on_commit=False)
+
+
+@lru_cache(1)
+def get_async_writer_sessionmaker(
+    engine: AsyncEngine = get_async_writer_engine(),
+) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(bind=engine, expire_on_commit=False)
+
+
 @asynccontextmanager
 async def get_async_session(
     session_factory: async_sessionmaker[AsyncSession] = get_async_sessionmaker(),
@@ -28,3 +92,14 @@ async def get_async_session(
             yield session
         finally:
             await session.close()
+
+
+@asynccontextmanager
+async def get_async_readonly_session(
+    session_factory: async_sessionmaker[ReadOnlySession] = get_async_readonly_sessionmaker(),
+) -> AsyncGenerator[ReadOnlySession]:
+    async with session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from btc_challenge.shared.application.write_queue import IResolver, IWriteQueue, WriteJob
+from btc_challenge.shared.errors import ObjectAlreadyExistsError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+WRITE_BATCH_SIZE = 50
+
+
+@dataclass(slots=True)
+class _PendingWrite:
+    job: WriteJob[Any]
+    future: asyncio.Future[Any]
+
+
+class SqliteWriteQueue(IWriteQueue):
+    """Serializes writes through one connection and commits queued jobs together.
+
+    Jobs that arrive while a transaction is being written are taken as the next batch and
+    committed together. If the batch fails, it is replayed with a SAVEPOINT per job, so only
+    the failing job gets the error.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        scope_factory: Callable[[AsyncSession], IResolver],
+        batch_size: int = WRITE_BATCH_SIZE,
+    ):
+        self._session_factory = session_factory
+        self._scope_factory = scope_factory
+        self._batch_size = batch_size
+        self._queue: asyncio.Queue[_PendingWrite] = asyncio.Queue()
+        self._worker: asyncio.Task[None] | None = None
+        self._closed = False
+
+    async def submit(self, job: WriteJob[T]) -> T:
+        if self._closed:
+            msg = 'Write queue is closed'
+            raise RuntimeError(msg)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(_PendingWrite(job, future))
+        return await future
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._worker is not None and not self._worker.done():
+            await self._queue.join()
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+        self._worker = None
+        # Воркер не запущен или упал - записать задания уже некому
+        while not self._queue.empty():
+            pending = self._queue.get_nowait()
+            self._queue.task_done()
+            if not pending.future.done():
+                pending.future.set_exception(RuntimeError('Write queue is closed'))
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self._batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._write_batch(batch)
+            except Exception as e:
+                logger.exception('Write batch of %s jobs failed', len(batch))
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write_batch(self, batch: list[_PendingWrite]) -> None:
+        batch = [pending for pending in batch if not pending.future.done()]  # callers cancelled while queued
+        if not batch:
+            return
+        if len(batch) > 1 and await self._try_write_together(batch):
+            return
+        await self._write_isolated(batch)
+
+    async def _try_write_together(self, batch: list[_PendingWrite]) -> bool:
+        """Fast path: the whole batch in one transaction without savepoints."""
+        async with self._session_factory() as session:
+            scope = self._scope_factory(session)
+            try:
+                results = [await pending.job(scope) for pending in batch]
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                return False
+
+        for pending, result in zip(batch, results, strict=True):
+            if not pending.future.done():
+                pending.future.set_result(result)
+        return True
+
+    async def _write_isolated(self, batch: list[_PendingWrite]) -> None:
+        """Every job in its own SAVEPOINT, so a failing job doesn't roll back its neighbours."""
+        written: list[tuple[_PendingWrite, Any]] = []
+        async with self._session_factory() as session:
+            scope = self._scope_factory(session)
+            for pending in batch:
+                try:
+                    async with session.begin_nested():
+                        result = await pending.job(scope)
+                except IntegrityError:
+                    if not pending.future.done():
+                        pending.future.set_exception(ObjectAlreadyExistsError())
+                except Exception as e:
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+                else:
+                    written.append((pending, result))
+
+            if not written:
+                await session.rollback()
+                return
+            await session.commit()
+
+        for pending, result in written:
+            if not pending.future.done():
+                pending.future.set_result(result)
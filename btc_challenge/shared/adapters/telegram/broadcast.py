@@ -0,0 +1,154 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+from time import monotonic
+from typing import Any
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramNetworkError, TelegramRetryAfter, TelegramServerError
+from aiogram.types import InlineKeyboardMarkup
+
+logger = logging.getLogger(__name__)
+
+# https://core.telegram.org/bots/faq#my-bot-is-hitting-limits-how-do-i-avoid-this
+GLOBAL_RATE = 25.0
+PER_CHAT_INTERVAL = 1.0
+PER_GROUP_INTERVAL = 3.0  # Не больше 20 сообщений в минуту в одну группу
+CONCURRENCY = 10
+MAX_RETRIES = 3
+RETRY_BACKOFF = 1.0
+
+
+@dataclass(slots=True)
+class BroadcastResult:
+    chat_id: int
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, with bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self._rate = rate
+        self._capacity = capacity if capacity is not None else rate
+        self._tokens = self._capacity
+        self._updated_at = monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1) -> None:
+        async with self._lock:
+            while True:
+                now = monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+                self._updated_at = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self._rate)
+
+    def drain(self, seconds: float) -> None:
+        """Stops handing out tokens for `seconds`, used when Telegram asks us to back off."""
+        self._tokens = min(self._tokens, 0) - seconds * self._rate
+
+
+class Broadcaster:
+    """Sends messages to many chats concurrently while staying under Telegram's flood limits.
+
+    A global token bucket caps the overall send rate, each private chat is throttled to one message
+    per `per_chat_interval` and each group (negative chat id) to one per `per_group_interval`.
+    `TelegramRetryAfter` / transient network errors are retried.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        concurrency: int = CONCURRENCY,
+        global_rate: float = GLOBAL_RATE,
+        per_chat_interval: float = PER_CHAT_INTERVAL,
+        per_group_interval: float = PER_GROUP_INTERVAL,
+        max_retries: int = MAX_RETRIES,
+    ):
+        self.bot = bot
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._global_bucket = TokenBucket(global_rate)
+        self._per_chat_interval = per_chat_interval
+        self._per_group_interval = per_group_interval
+        self._chat_next_send_at: dict[int, float] = {}
+        self._max_retries = max_retries
+
+    async def _wait_for_chat(self, chat_id: int, messages: int) -> None:
+        now = monotonic()
+        if len(self._chat_next_send_at) > 10_000:
+            self._chat_next_send_at = {k: v for k, v in self._chat_next_send_at.items() if v > now}
+        send_at = max(now, self._chat_next_send_at.get(chat_id, now))
+        interval = self._per_group_interval if chat_id < 0 else self._per_chat_interval
+        self._chat_next_send_at[chat_id] = send_at + interval * messages
+        if send_at > now:
+            await asyncio.sleep(send_at - now)
+
+    async def _send_one(
+        self,
+        chat_id: int,
+        send: Callable[[int], Awaitable[Any]],
+        messages: int,
+    ) -> BroadcastResult:
+        async with self._semaphore:
+            await self._wait_for_chat(chat_id, messages)
+            attempt = 0
+            while True:
+                await self._global_bucket.acquire(messages)
+                try:
+                    await send(chat_id)
+                    return BroadcastResult(chat_id)
+                except TelegramRetryAfter as e:
+                    error: Exception = e
+                    delay: float = e.retry_after
+                    self._global_bucket.drain(delay)
+                except (TelegramNetworkError, TelegramServerError) as e:
+                    error = e
+                    delay = RETRY_BACKOFF * 2**attempt
+                except Exception as e:
+                    return BroadcastResult(chat_id, e)
+
+                attempt += 1
+                if attempt > self._max_retries:
+                    return BroadcastResult(chat_id, error)
+                logger.warning('Retrying send to chat %s in %ss: %s', chat_id, delay, error)
+                await asyncio.sleep(delay)
+
+    async def send(
+        self,
+        chat_ids: Iterable[int],
+        send: Callable[[int], Awaitable[Any]],
+        messages: int = 1,
+    ) -> list[BroadcastResult]:
+        """Calls `send(chat_id)` for every chat and returns results in the same order.
+
+        Args:
+            chat_ids: recipients
+            send: coroutine function delivering the payload to a single chat
+            messages: how many Telegram messages a single `send` call produces
+        """
+        return await asyncio.gather(*(self._send_one(chat_id, send, messages) for chat_id in chat_ids))
+
+    async def send_message(
+        self,
+        chat_ids: Iterable[int],
+        text: str,
+        reply_markup: InlineKeyboardMarkup | None = None,
+    ) -> list[BroadcastResult]:
+        async def send(chat_id: int) -> None:
+            await self.bot.send_message(chat_id=chat_id, text=text, reply_markup=reply_markup)
+
+        return await self.send(chat_ids, send)
+
+
+@lru_cache(1)
+def get_broadcaster(bot: Bot) -> Broadcaster:
+    return Broadcaster(bot)
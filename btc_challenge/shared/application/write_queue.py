@@ -0,0 +1,28 @@
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from typing import Protocol, TypeVar
+
+T = TypeVar('T')
+
+
+class IResolver(Protocol):
+    # Callable, а не type[T]: mypy не принимает абстрактные интерфейсы там, где ожидается type[T]
+    def resolve(self, service: Callable[..., T]) -> T: ...
+
+
+WriteJob = Callable[[IResolver], Awaitable[T]]
+
+
+class IWriteQueue(ABC):
+    @abstractmethod
+    async def submit(self, job: WriteJob[T]) -> T:
+        """Run the job in the shared writer transaction and wait until it is committed.
+
+        The job resolves repositories from the given resolver and must not commit itself.
+        It may be run a second time if its batch is replayed, so it should only touch the database.
+        If the job raises, only its own writes are rolled back.
+        """
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Stop accepting jobs and wait until the queued ones are written."""
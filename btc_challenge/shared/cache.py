@@ -0,0 +1,96 @@
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from time import monotonic
+from typing import Generic, TypeVar
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded LRU cache whose entries expire `ttl` seconds after being set."""
+
+    __slots__ = ('_data', '_maxsize', '_ttl', 'hits', 'misses')
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K) -> V | None:
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = item
+        if expires_at <= monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        self._data[key] = (monotonic() + self._ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class SnapshotCache(Generic[V]):
+    """A single value loaded on first use and kept until it is invalidated or, with `ttl`, expires.
+
+    A load that overlaps with `set` or `invalidate` is returned to its caller but not stored,
+    so the cache never keeps data read before a change it was told about.
+    """
+
+    __slots__ = ('_value', '_loaded_at', '_ttl', '_version')
+
+    def __init__(self, ttl: float | None = None):
+        self._value: V | None = None
+        self._loaded_at = 0.0
+        self._ttl = ttl
+        self._version = 0
+
+    async def get(self, load: Callable[[], Awaitable[V]]) -> V:
+        value = self.peek()
+        if value is not None:
+            return value
+
+        version = self._version
+        value = await load()
+        if version == self._version:
+            self._value = value
+            self._loaded_at = monotonic()
+        return value
+
+    def peek(self) -> V | None:
+        """The cached value without loading it, None if it isn't loaded or has expired."""
+        if self._value is None or (self._ttl is not None and monotonic() - self._loaded_at >= self._ttl):
+            return None
+        return self._value
+
+    def set(self, value: V) -> None:
+        """Replace the value. `ttl` keeps counting from the last load, local edits don't extend it."""
+        if self._value is None:
+            self._loaded_at = monotonic()
+        self._value = value
+        self._version += 1
+
+    def invalidate(self) -> None:
+        self._value = None
+        self._version += 1
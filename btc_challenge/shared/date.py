@@ -1,4 +1,4 @@
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime
 from zoneinfo import ZoneInfo
 
 from btc_challenge.shared.providers import DatetimeProvider
@@ -14,6 +14,13 @@ def from_moscow(dt: datetime) -> datetime:
     return dt.replace(tzinfo=MOSCOW_TZ).astimezone(UTC).replace(tzinfo=None)
 
 
+def as_utc(dt: datetime) -> datetime:
+    """Приводит время к aware UTC, naive datetime (так их возвращает SQLite) считается UTC."""
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=UTC)
+    return dt.astimezone(UTC)
+
+
 def get_moscow_day_range(dt: datetime | None = None) -> tuple[datetime, datetime]:
     """Возвращает начало и конец дня по московскому времени в UTC."""
     if dt is None:
@@ -22,3 +29,12 @@ def get_moscow_day_range(dt: datetime | None = None) -> tuple[datetime, datetime
     begin_moscow = now_moscow.replace(hour=0, minute=0, second=0, microsecond=0)
     end_moscow = now_moscow.replace(hour=23, minute=59, second=59, microsecond=999999)
     return begin_moscow.astimezone(UTC), end_moscow.astimezone(UTC)
+
+
+def get_moscow_date(dt: datetime | None = None) -> date:
+    """Возвращает дату по московскому времени, naive datetime считается UTC."""
+    if dt is None:
+        dt = DatetimeProvider.provide()
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    return dt.astimezone(MOSCOW_TZ).date()
@@ -5,11 +5,13 @@ from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject
 
 from btc_challenge.container import build_request_container
-from btc_challenge.shared.adapters.sqlite.session import get_async_session
 
 
 class ContainerMiddleware(BaseMiddleware):
-    """Middleware for injecting DI container into handlers."""
+    """Middleware for injecting DI container into handlers.
+
+    The database session is opened lazily by the container, on the first resolve that needs it.
+    """
 
     async def __call__(
         self,
@@ -17,6 +19,9 @@ class ContainerMiddleware(BaseMiddleware):
         event: TelegramObject,
         data: dict[str, Any],
     ) -> Any:
-        async with get_async_session() as session:
-            build_request_container(data["container"], session)
+        container = build_request_container(data["container"])
+        data["container"] = container
+        try:
             return await handler(event, data)
+        finally:
+            await container.close()
@@ -4,15 +4,19 @@ from typing import Any
 from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject
 from aiogram.types import User as TelegramUser
-from punq import Container
 
-from btc_challenge.shared.errors import ObjectAlreadyExistsError, ObjectNotFoundError
-from btc_challenge.users.application.interactors.create import CreateUserInteractor
-from btc_challenge.users.application.interactors.get_one import GetUserByTelegramIdInteractor
+from btc_challenge.container import RequestContainer
+from btc_challenge.shared.errors import ObjectAlreadyExistsError
+from btc_challenge.users.application.cache import UserCache
+from btc_challenge.users.application.interactors.get_or_create import GetOrCreateUserInteractor
 
 
 class UserMiddleware(BaseMiddleware):
-    """Middleware that ensures user exists and loads user entity into handler data."""
+    """Middleware that ensures user exists and loads user entity into handler data.
+
+    Loaded users are kept in `UserCache` by telegram id, so known users cost no queries until their
+    entry expires or is invalidated. The stored username is not updated on rename, so it is not compared.
+    """
 
     async def __call__(
         self,
@@ -28,24 +32,22 @@ class UserMiddleware(BaseMiddleware):
             msg = "Telegram username not specified"
             raise Exception(msg)
 
-        container: Container = data["container"]
+        container: RequestContainer = data["container"]
+        user_cache: UserCache = container.resolve(UserCache)
 
-        # Ensure user exists in database
-        create_interactor: CreateUserInteractor = container.resolve(CreateUserInteractor)
-        try:
-            await create_interactor.execute(tg_user.id, tg_user.username)
-        except ObjectAlreadyExistsError:
-            pass
+        cached_user = user_cache.get(tg_user.id)
+        if cached_user:
+            data["user"] = cached_user
+            return await handler(event, data)
 
-        # Load user entity and add to data
-        get_user_interactor: GetUserByTelegramIdInteractor = container.resolve(
-            GetUserByTelegramIdInteractor,
-        )
+        # Register the user if needed and load the entity in one go
+        interactor: GetOrCreateUserInteractor = container.resolve(GetOrCreateUserInteractor)
         try:
-            user = await get_user_interactor.execute(tg_user.id)
+            user, _ = await interactor.execute(tg_user.id, tg_user.username)
             data["user"] = user
-        except ObjectNotFoundError:
-            # User should exist after creation, but handle edge case
+            user_cache.set(tg_user.id, user)
+        except ObjectAlreadyExistsError:
+            # Username is taken by another telegram account
             data["user"] = None
 
         return await handler(event, data)
@@ -0,0 +1,37 @@
+import asyncio
+import logging
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+# Telegram ждет ответа на вебхук 60 секунд, дольше ждать уже принятые апдейты нет смысла
+DRAIN_TIMEOUT = 55
+
+
+class DrainingRequestHandler(SimpleRequestHandler):
+    """Отвечает Telegram сразу, а обрабатывает апдейт в фоне.
+
+    При остановке сервера дожидается обработки уже принятых апдейтов: Telegram получил
+    на них 200 и повторно их не пришлет.
+    """
+
+    async def close(self) -> None:
+        pending = self._background_feed_update_tasks
+        if pending:
+            logger.info("Waiting for %s webhook updates to finish", len(pending))
+            _, not_done = await asyncio.wait(pending, timeout=DRAIN_TIMEOUT)
+            if not_done:
+                logger.warning("%s webhook updates were not finished before shutdown", len(not_done))
+        await super().close()
+
+
+def build_webhook_app(dp: Dispatcher, bot: Bot, path: str, secret_token: str) -> web.Application:
+    app = web.Application()
+    # Обработчик регистрируется раньше setup_application: на остановке сначала дорабатываются
+    # принятые апдейты, потом выполняются shutdown-хуки диспетчера
+    DrainingRequestHandler(dispatcher=dp, bot=bot, secret_token=secret_token).register(app, path=path)
+    setup_application(app, dp, bot=bot)
+    return app
@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 
 PART_SIZE = 10 * 1024 * 1024
+CHUNK_SIZE = 1024 * 1024
 
 
 class IS3Storage(ABC):
@@ -21,3 +23,26 @@ class IS3Storage(ABC):
     async def get_bytes(self, filename: str) -> bytes | None:
         """Получает байты обьекта из s3 хранилища"""
         ...
+
+    @abstractmethod
+    async def put_stream(self, filename: str, chunks: AsyncIterator[bytes], is_temporary: bool = False) -> str:
+        """
+        Загружает объект в s3 хранилище по частям, не собирая его целиком в памяти
+        Args:
+            filename: название объекта
+            chunks: асинхронный итератор байтов объекта
+            is_temporary: является ли файл временным, будет удален через 1 день (сохраняется в папку `tmp`)
+        Returns:
+            адрес файла в хранилище
+        """
+        ...
+
+    @abstractmethod
+    async def get_stream(self, filename: str, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes] | None:
+        """Открывает объект в s3 хранилище и возвращает итератор по его частям, None - если объекта нет"""
+        ...
+
+    @abstractmethod
+    async def delete(self, filename: str) -> None:
+        """Удаляет объект из s3 хранилища, отсутствующий объект не считается ошибкой"""
+        ...
@@ -1,17 +1,17 @@
-import asyncio
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from aiogram import Bot
 
 from btc_challenge.events.adapters.sqlite.repository import EventRepository
+from btc_challenge.events.application.cache import get_active_event_cache
 from btc_challenge.push_ups.adapters.sqlite.repository import PushUpRepository
 from btc_challenge.push_ups.application.interactors.get_all_users_stats_by_date import (
     GetAllUsersStatsByDateInteractor,
 )
-from btc_challenge.shared.adapters.sqlite.session import get_async_session
-from btc_challenge.shared.providers import DatetimeProvider, TimeZone
-from btc_challenge.shared.tasks.send_to_groups import send_notification_to_groups
+from btc_challenge.shared.adapters.sqlite.session import get_async_readonly_session, get_async_session
+from btc_challenge.shared.providers import DatetimeProvider
+from btc_challenge.shared.tasks.outbox import enqueue_group_notification, wake_outbox_worker
 from btc_challenge.users.adapters.sqlite.repository import UserRepository
 
 logger = logging.getLogger(__name__)
@@ -19,13 +19,11 @@ logger = logging.getLogger(__name__)
 
 async def send_daily_notification(bot: Bot, target_date: datetime) -> None:
     """Send daily stats report to groups."""
-    async with get_async_session() as session:
+    # Отчет собирается на read-only пуле и не ждет пишущие соединения
+    async with get_async_readonly_session() as session:
         # Get stats for the target date
-        interactor = GetAllUsersStatsByDateInteractor(
-            push_up_repository=PushUpRepository(session),
-            user_repository=UserRepository(session),
-        )
-        stats_list = await interactor.execute(date=target_date)
+        interactor = GetAllUsersStatsByDateInteractor(push_up_repository=PushUpRepository(session))
+        stats_list = await interactor.execute(date=target_date, with_videos=False)
         if not stats_list:
             return
 
@@ -36,36 +34,14 @@ async def send_daily_notification(bot: Bot, target_date: datetime) -> None:
 
         # Получаем текущий активный ивент
         event_repository = EventRepository(session)
-        active_event = await event_repository.get_current_active_event()
+        active_event = await get_active_event_cache().get_current(event_repository)
 
         # Получаем статистику с начала ивента, если есть активный ивент
         event_stats = {}
         total_event_pushups = 0
         if active_event:
-            user_repository = UserRepository(session)
-            all_users = await user_repository.get_many(is_verified=True)
-            user_oids = [user.oid for user in all_users]
-
-            # Получаем все отжимания с начала ивента до конца текущего дня
-            event_begin = active_event.start_at.replace(hour=0, minute=0, second=0, microsecond=0)
-            event_end = target_date.replace(hour=23, minute=59, second=59, microsecond=999999)
-
-            push_up_repository = PushUpRepository(session)
-            all_event_pushups = await push_up_repository.get_by_user_oids_and_date(
-                user_oids=user_oids,
-                begin_date=event_begin,
-                end_date=event_end,
-            )
-
-            # Группируем по пользователям
-            user_map = {user.oid: user for user in all_users}
-            for push_up in all_event_pushups:
-                user = user_map.get(push_up.user_oid)
-                if user:
-                    if user.username not in event_stats:
-                        event_stats[user.username] = 0
-                    event_stats[user.username] += push_up.count
-                    total_event_pushups += push_up.count
+            event_stats = await event_repository.get_participant_totals(active_event.oid)
+            total_event_pushups = sum(event_stats.values())
 
         # Получаем список тех, кто не выполнил отжимания
         user_repository = UserRepository(session)
@@ -84,8 +60,8 @@ async def send_daily_notification(bot: Bot, target_date: datetime) -> None:
         for idx, stats in enumerate(stats_list, start=1):
             medal = medals.get(idx, f'{idx}.')
             event_info = ''
-            if active_event and stats.username in event_stats:
-                event_info = f' (всего в ивенте: {event_stats[stats.username]})'
+            if active_event and stats.user_oid in event_stats:
+                event_info = f' (всего в ивенте: {event_stats[stats.user_oid]})'
             stats_text += (
                 f'{medal} @{stats.username}\n'
                 f'Отжиманий: {stats.total_count} ({stats.push_ups_count} подходов){event_info}\n\n'
@@ -97,30 +73,17 @@ async def send_daily_notification(bot: Bot, target_date: datetime) -> None:
             for username in inactive_users:
                 stats_text += f'@{username}\n'
 
-        # Send report to groups
-        await send_notification_to_groups(bot, session, stats_text)
+    # Send report to groups
+    async with get_async_session() as session:
+        await enqueue_group_notification(session, f'daily_report:{date_str}', stats_text)
 
         await session.commit()
+    wake_outbox_worker()
 
 
-async def daily_notification_task(bot: Bot) -> None:
-    """Background task to send daily report at 00:05."""
-    while True:
-        try:
-            # Calculate next 00:05
-            now = DatetimeProvider.provide(TimeZone.MOSCOW)
-            next_notification_time = now.replace(hour=0, minute=5, second=0, microsecond=0)
-            if now >= next_notification_time:
-                next_notification_time += timedelta(days=1)
-
-            sleep_time = (next_notification_time - now).total_seconds()
-            logger.info('Next daily notification at %s in %s seconds', next_notification_time, sleep_time)
-            await asyncio.sleep(sleep_time)
-
-            # Send report for previous day
-            target_date = DatetimeProvider.provide()
-            logger.info('Sending daily notification for %s', target_date.strftime('%d.%m.%Y'))
-            await send_daily_notification(bot, target_date)
-        except Exception as e:
-            logger.error('Error in daily_notification_task: %s', e)
-            await asyncio.sleep(60)
+async def daily_notification_job(bot: Bot) -> None:
+    """Scheduled job sending the daily report at 00:05."""
+    # Send report for previous day
+    target_date = DatetimeProvider.provide()
+    logger.info('Sending daily notification for %s', target_date.strftime('%d.%m.%Y'))
+    await send_daily_notification(bot, target_date)
@@ -1,14 +1,13 @@
-import asyncio
 import logging
-from datetime import timedelta
 
 from aiogram import Bot
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from btc_challenge.events.adapters.sqlite.repository import EventRepository
+from btc_challenge.events.application.cache import get_active_event_cache
 from btc_challenge.events.domain.entity import Event
 from btc_challenge.shared.adapters.sqlite.session import get_async_session
-from btc_challenge.shared.providers import DatetimeProvider, TimeZone
-from btc_challenge.shared.tasks.send_to_groups import send_notification_to_groups
+from btc_challenge.shared.tasks.outbox import enqueue_group_notification, enqueue_notification, wake_outbox_worker
 from btc_challenge.shared.utils import create_event_notification_text
 from btc_challenge.users.adapters.sqlite.repository import UserRepository
 from btc_challenge.users.domain.repository import IUserRepository
@@ -16,59 +15,35 @@ from btc_challenge.users.domain.repository import IUserRepository
 logger = logging.getLogger(__name__)
 
 
-async def send_event_daily_notification_to_participant(
-    bot: Bot,
+async def enqueue_event_daily_notification(
+    session: AsyncSession,
     event: Event,
     user_repository: IUserRepository,
 ) -> None:
+    """Enqueue the daily task of the event for its participants and groups."""
     participants = await user_repository.get_many(oids=event.participant_oids)
     notification_text = create_event_notification_text(event)
-    for participant in participants:
-        try:
-            await bot.send_message(
-                chat_id=participant.telegram_id,
-                text=notification_text,
-            )
-        except Exception:
-            pass
+    notification_key = f'event:{event.oid}:day:{event.day_number}'
+    await enqueue_notification(
+        session,
+        notification_key,
+        [participant.telegram_id for participant in participants],
+        notification_text,
+    )
+    await enqueue_group_notification(session, notification_key, notification_text)
 
 
 async def send_event_daily_notification(bot: Bot) -> None:
     """Send daily notification to event participants and groups at 5:00 about required pushups."""
-    now = DatetimeProvider.provide()
-
     async with get_async_session() as session:
         event_repository = EventRepository(session)
         user_repository = UserRepository(session)
 
-        active_events = await event_repository.get_active_events(now)
+        active_events = await get_active_event_cache().get_active_events(event_repository)
         for event in active_events:
             if not event.participant_oids:
                 continue
 
-            # Send to participants
-            await send_event_daily_notification_to_participant(bot, event, user_repository)
-
-            # Send to groups
-            notification_text = create_event_notification_text(event)
-            await send_notification_to_groups(bot, session, notification_text)
+            await enqueue_event_daily_notification(session, event, user_repository)
             await session.commit()
-
-
-async def event_daily_notification_task(bot: Bot) -> None:
-    """Background task to send daily notifications to event participants at 5:00."""
-    while True:
-        try:
-            # Calculate next 8:00
-            now = DatetimeProvider.provide(TimeZone.MOSCOW)
-            next_notification_time = now.replace(hour=8, minute=0, second=0, microsecond=0)
-            if now >= next_notification_time:
-                next_notification_time += timedelta(days=1)
-
-            sleep_seconds = (next_notification_time - now).total_seconds()
-            await asyncio.sleep(sleep_seconds)
-
-            await send_event_daily_notification(bot)
-        except Exception as e:
-            logger.error('Error in event_daily_notification_task: %s', e)
-            await asyncio.sleep(60)
+    wake_outbox_worker()
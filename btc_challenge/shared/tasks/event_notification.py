@@ -1,23 +1,28 @@
-import asyncio
 import logging
 from datetime import timedelta
+from uuid import UUID
 
 from aiogram import Bot
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 from btc_challenge.events.adapters.sqlite.repository import EventRepository
+from btc_challenge.events.application.cache import get_active_event_cache
 from btc_challenge.events.domain.entity import Event
-from btc_challenge.shared.adapters.sqlite.session import get_async_session
+from btc_challenge.shared.adapters.sqlite.session import get_async_readonly_session, get_async_session
+from btc_challenge.shared.date import as_utc
+from btc_challenge.shared.errors import ObjectNotFoundError
 from btc_challenge.shared.providers import DatetimeProvider
-from btc_challenge.shared.tasks.event_daily_notification import (
-    send_event_daily_notification_to_participant,
-)
-from btc_challenge.shared.tasks.send_to_groups import send_notification_to_groups
-from btc_challenge.shared.utils import create_event_notification_text
+from btc_challenge.shared.tasks.event_daily_notification import enqueue_event_daily_notification
+from btc_challenge.shared.tasks.outbox import enqueue_group_notification, enqueue_notification, wake_outbox_worker
+from btc_challenge.shared.tasks.scheduler import get_scheduler
 from btc_challenge.users.adapters.sqlite.repository import UserRepository
 
 logger = logging.getLogger(__name__)
 
+EVENT_REMINDER_JOB = 'event_reminder'
+EVENT_START_JOB = 'event_start'
+EVENT_REMINDER_ADVANCE = timedelta(hours=1)
+
 
 async def send_pre_event_reminders(bot: Bot, event: Event) -> None:
     """Send reminder 1 hour before event to users who haven't joined yet and to all groups."""
@@ -43,25 +48,23 @@ async def send_pre_event_reminders(bot: Bot, event: Event) -> None:
         )
 
         # Send to verified users who are not participants
-        for user in all_users:
-            if user.oid not in event.participant_oids:
-                try:
-                    await bot.send_message(
-                        chat_id=user.telegram_id,
-                        text=reminder_text,
-                        reply_markup=keyboard,
-                    )
-                except Exception:
-                    # User might have blocked the bot
-                    pass
+        notification_key = f'event:{event.oid}:reminder'
+        await enqueue_notification(
+            session,
+            notification_key,
+            [user.telegram_id for user in all_users if user.oid not in event.participant_oids],
+            reminder_text,
+            keyboard,
+        )
 
         # Send to active chats (groups)
-        await send_notification_to_groups(bot, session, reminder_text, keyboard)
+        await enqueue_group_notification(session, notification_key, reminder_text, keyboard)
 
-        # Mark reminder notification as sent
+        # Mark reminder notification as sent in the same transaction
         event.reminder_notification_sent = True
         await event_repository.save(event)
         await session.commit()
+    wake_outbox_worker()
 
 
 async def send_start_notification(bot: Bot, event: Event) -> None:
@@ -85,62 +88,72 @@ async def send_start_notification(bot: Bot, event: Event) -> None:
             f'👥 Участников: {len(participants)}\n{participant_list}'
         )
 
-        # Send to all participants
-        for participant in participants:
-            try:
-                await bot.send_message(
-                    chat_id=participant.telegram_id,
-                    text=notification_text,
-                )
-            except Exception:
-                # User might have blocked the bot
-                pass
-        await send_notification_to_groups(bot, session, notification_text)
-
-        # Mark start notification as sent
+        # Send to all participants and groups
+        notification_key = f'event:{event.oid}:start'
+        await enqueue_notification(
+            session,
+            notification_key,
+            [participant.telegram_id for participant in participants],
+            notification_text,
+        )
+        await enqueue_group_notification(session, notification_key, notification_text)
+        await enqueue_event_daily_notification(session, event, user_repository)
+
+        # Mark start notification as sent in the same transaction
         event.start_notification_sent = True
         await event_repository.save(event)
         await session.commit()
-        await send_event_daily_notification_to_participant(bot, event, user_repository)
-
-        reminder_text = create_event_notification_text(event)
-        await send_notification_to_groups(bot, session, reminder_text)
+    # Ивент стал активным
+    get_active_event_cache().invalidate()
+    wake_outbox_worker()
 
 
-async def event_notification_task(bot: Bot) -> None:
-    """Background task to send event notifications."""
-    while True:
+async def _get_event(event_oid: str) -> Event | None:
+    async with get_async_readonly_session() as session:
         try:
-            now = DatetimeProvider.provide()
-            async with get_async_session() as session:
-                event_repository = EventRepository(session)
-
-                # Check for events starting in 1 hour (with 2-minute window)
-                one_hour_later = now + timedelta(hours=1)
-                one_hour_later_end = one_hour_later + timedelta(minutes=2)
-                logger.info(
-                    'Checking for events starting in 1 hour (with 2-minute window): %s - %s',
-                    one_hour_later,
-                    one_hour_later_end,
-                )
-                events_starting_soon = await event_repository.get_events_starting_soon(
-                    one_hour_later,
-                    one_hour_later_end,
-                )
-
-                for event in events_starting_soon:
-                    if not event.reminder_notification_sent:
-                        await send_pre_event_reminders(bot, event)
-
-                not_started_events = await event_repository.get_events_starting_now(now)
-                logger.info('Events starting now: %s', len(not_started_events))
-                for event in not_started_events:
-                    logger.info('Sending start notification for event: %s', event.title)
-                    if not event.is_started:
-                        await send_start_notification(bot, event)
-            await asyncio.sleep(60)  # Check every minute
-
-        except Exception as e:
-            # Log error but keep the task running
-            logger.error('Error in event_notification_task: %s', e)
-            await asyncio.sleep(60)
+            return await EventRepository(session).get_by_oid(UUID(event_oid))
+        except ObjectNotFoundError:
+            return None
+
+
+async def event_reminder_job(bot: Bot, event_oid: str) -> None:
+    """Scheduled job sending the reminder 1 hour before the event starts."""
+    event = await _get_event(event_oid)
+    if event is None or event.completed_at is not None or event.reminder_notification_sent:
+        return
+    if as_utc(event.start_at) <= DatetimeProvider.provide():
+        return  # Бот не работал в момент напоминания - после начала оно уже не нужно
+    await send_pre_event_reminders(bot, event)
+
+
+async def event_start_job(bot: Bot, event_oid: str) -> None:
+    """Scheduled job sending the start notification when the event starts."""
+    event = await _get_event(event_oid)
+    if event is None or event.completed_at is not None or event.start_notification_sent:
+        return
+    logger.info('Sending start notification for event: %s', event.title)
+    await send_start_notification(bot, event)
+
+
+async def schedule_event_jobs(event: Event) -> None:
+    """Schedule the reminder and the start notification of a new or changed event."""
+    scheduler = get_scheduler()
+    if event.completed_at is not None:
+        await scheduler.unschedule(f'{EVENT_REMINDER_JOB}:{event.oid}')
+        await scheduler.unschedule(f'{EVENT_START_JOB}:{event.oid}')
+        return
+
+    reminder_at = as_utc(event.start_at) - EVENT_REMINDER_ADVANCE
+    # Ивент, созданный меньше чем за час до начала, обходится без напоминания
+    if not event.reminder_notification_sent and reminder_at > DatetimeProvider.provide():
+        await scheduler.schedule(f'{EVENT_REMINDER_JOB}:{event.oid}', reminder_at)
+    if not event.start_notification_sent:
+        await scheduler.schedule(f'{EVENT_START_JOB}:{event.oid}', event.start_at)
+
+
+async def schedule_pending_event_jobs() -> None:
+    """Schedule jobs of all events that haven't started yet, e.g. created before an update."""
+    async with get_async_readonly_session() as session:
+        events = await EventRepository(session).get_uncompleted_events()
+    for event in events:
+        await schedule_event_jobs(event)
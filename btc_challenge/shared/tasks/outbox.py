@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import time
+from collections.abc import Iterable
+from datetime import timedelta
+
+from aiogram import Bot
+from aiogram.types import InlineKeyboardMarkup
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from btc_challenge.chats.adapters.sqlite.repository import ChatRepository
+from btc_challenge.chats.application.cache import get_active_chat_cache
+from btc_challenge.config import AppConfig
+from btc_challenge.outbox.adapters.sqlite.repository import OutboxRepository
+from btc_challenge.outbox.domain.entity import OutboxMessage
+from btc_challenge.shared.adapters.sqlite.session import get_async_session
+from btc_challenge.shared.adapters.telegram.broadcast import get_broadcaster
+from btc_challenge.shared.providers import DatetimeProvider
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = 100
+# Только для вебхука с несколькими процессами: другие воркеры не могут разбудить задачу
+OUTBOX_POLL_INTERVAL = 60
+OUTBOX_PRUNE_INTERVAL = 24 * 60 * 60
+# Ключ уведомления защищает от повторной отправки, пока строка хранится - срок с запасом
+OUTBOX_RETENTION = timedelta(days=7)
+
+_outbox_wakeup = asyncio.Event()
+
+
+async def enqueue_notification(
+    session: AsyncSession,
+    notification_key: str,
+    chat_ids: Iterable[int],
+    text: str,
+    keyboard: InlineKeyboardMarkup | None = None,
+    is_group: bool = False,
+) -> None:
+    """Add a notification to the outbox in the caller's transaction.
+
+    Args:
+        session: Database session, the caller commits it and then calls `wake_outbox_worker`
+        notification_key: Identifies the notification, enqueuing the same key for a chat twice is a no-op
+        chat_ids: Recipients
+        text: Message text to send
+        keyboard: Optional inline keyboard
+        is_group: Recipients are group chats, they are deactivated if delivery fails
+    """
+    reply_markup = keyboard.model_dump_json(exclude_none=True) if keyboard else None
+    messages = [
+        OutboxMessage.create(
+            notification_key=notification_key,
+            chat_id=chat_id,
+            text=text,
+            reply_markup=reply_markup,
+            is_group=is_group,
+        )
+        for chat_id in chat_ids
+    ]
+    await OutboxRepository(session).add_many(messages)
+
+
+async def enqueue_group_notification(
+    session: AsyncSession,
+    notification_key: str,
+    text: str,
+    keyboard: InlineKeyboardMarkup | None = None,
+) -> None:
+    """Add a notification for all active groups to the outbox."""
+    chats = await get_active_chat_cache().get_active_chats(ChatRepository(session))
+    await enqueue_notification(
+        session,
+        notification_key,
+        [chat.telegram_chat_id for chat in chats],
+        text,
+        keyboard,
+        is_group=True,
+    )
+
+
+def wake_outbox_worker() -> None:
+    """Tell the worker that new messages were committed to the outbox."""
+    _outbox_wakeup.set()
+
+
+async def deliver_outbox_batch(bot: Bot, limit: int = OUTBOX_BATCH_SIZE) -> int:
+    """Send one batch of pending messages and record the outcome. Returns the number of messages sent."""
+    async with get_async_session() as session:
+        pending = await OutboxRepository(session).get_pending(limit)
+
+    # One message per chat per batch keeps the order of messages within a chat
+    batch: dict[int, OutboxMessage] = {}
+    for message in pending:
+        batch.setdefault(message.chat_id, message)
+    if not batch:
+        return 0
+
+    async def send(chat_id: int) -> None:
+        message = batch[chat_id]
+        reply_markup = InlineKeyboardMarkup.model_validate_json(message.reply_markup) if message.reply_markup else None
+        await bot.send_message(chat_id=chat_id, text=message.text, reply_markup=reply_markup)
+
+    results = await get_broadcaster(bot).send(batch.keys(), send)
+
+    failed_groups: list[int] = []
+    async with get_async_session() as session:
+        outbox_repository = OutboxRepository(session)
+        await outbox_repository.mark_sent([batch[result.chat_id].oid for result in results if result.ok])
+        for result in results:
+            if result.ok:
+                continue
+            message = batch[result.chat_id]
+            logger.warning('Failed to deliver %s to chat %s: %s', message.notification_key, message.chat_id, result.error)
+            await outbox_repository.mark_failed(message.oid, str(result.error))
+            if message.is_group:
+                failed_groups.append(message.chat_id)
+        # Группы, куда не удалось отправить, отключаются одним запросом
+        await ChatRepository(session).deactivate_many(failed_groups)
+        await session.commit()
+    if failed_groups:
+        get_active_chat_cache().discard(failed_groups)
+    return len(batch)
+
+
+async def prune_outbox(retention: timedelta = OUTBOX_RETENTION) -> int:
+    """Delete delivered and failed messages older than `retention`. Returns the number of deleted messages."""
+    async with get_async_session() as session:
+        deleted = await OutboxRepository(session).delete_processed(DatetimeProvider.provide() - retention)
+        await session.commit()
+    return deleted
+
+
+async def outbox_worker_task(bot: Bot) -> None:
+    """Background task draining the outbox, resumes whatever was left pending before a restart."""
+    next_prune = time.monotonic()
+    poll_interval = OUTBOX_POLL_INTERVAL if AppConfig.webhook.multiprocess else None
+    while True:
+        try:
+            _outbox_wakeup.clear()
+            while await deliver_outbox_batch(bot):
+                pass
+            if time.monotonic() >= next_prune:
+                deleted = await prune_outbox()
+                if deleted:
+                    logger.info('Deleted %s processed outbox messages', deleted)
+                next_prune = time.monotonic() + OUTBOX_PRUNE_INTERVAL
+            # В одном процессе сообщения добавляются вместе с wake_outbox_worker, ждем его или очистки
+            timeout = max(next_prune - time.monotonic(), 0)
+            if poll_interval is not None:
+                timeout = min(timeout, poll_interval)
+            try:
+                await asyncio.wait_for(_outbox_wakeup.wait(), timeout=timeout)
+            except TimeoutError:
+                pass
+        except Exception as e:
+            logger.error('Error in outbox_worker_task: %s', e)
+            await asyncio.sleep(60)
@@ -0,0 +1,219 @@
+import asyncio
+import heapq
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from functools import lru_cache
+
+from aiogram import Bot
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert
+
+from btc_challenge.shared.adapters.sqlite.scheduler.model import ScheduledJobORM
+from btc_challenge.shared.adapters.sqlite.session import get_async_session
+from btc_challenge.shared.date import as_utc
+from btc_challenge.shared.providers import DatetimeProvider, TimeZone
+
+logger = logging.getLogger(__name__)
+
+JOB_RETRY_DELAY = timedelta(seconds=60)
+JOB_MAX_ATTEMPTS = 5
+DAILY_MISFIRE_GRACE = timedelta(hours=1)
+
+JobHandler = Callable[..., Awaitable[None]]
+
+
+@dataclass(slots=True)
+class _JobSpec:
+    handler: JobHandler
+    daily_at: time | None
+    misfire_grace: timedelta | None
+
+
+def next_daily_run(at: time, now: datetime) -> datetime:
+    """Ближайшее время `at` по Москве после `now`, в UTC."""
+    now_moscow = now.astimezone(TimeZone.MOSCOW)
+    run_at = now_moscow.replace(hour=at.hour, minute=at.minute, second=0, microsecond=0)
+    if run_at <= now_moscow:
+        run_at += timedelta(days=1)
+    return as_utc(run_at)
+
+
+class Scheduler:
+    """Runs timed jobs from a heap and sleeps until the nearest one is due.
+
+    A job is a row in `scheduled_jobs` keyed by `<name>` or `<name>:<argument>`, so it survives a
+    restart. The handler registered for the name is called as `handler(bot, *arguments)`. Daily jobs
+    are rescheduled after every run, one-shot jobs are deleted. A job that is late by more than its
+    grace period (the bot was down) is skipped, a failed one-shot job is retried after `JOB_RETRY_DELAY`
+    and dropped after `JOB_MAX_ATTEMPTS` attempts.
+    """
+
+    def __init__(self) -> None:
+        self._specs: dict[str, _JobSpec] = {}
+        self._heap: list[tuple[datetime, str]] = []
+        self._due: dict[str, datetime] = {}  # Актуальное время задачи, остальные записи в куче устарели
+        self._attempts: dict[str, int] = {}  # Неудачные попытки разовых задач, сбрасываются при перезапуске
+        self._wakeup = asyncio.Event()
+        self._running = False
+
+    def register(
+        self,
+        name: str,
+        handler: JobHandler,
+        daily_at: time | None = None,
+        misfire_grace: timedelta | None = None,
+    ) -> None:
+        """
+        Args:
+            name: имя задачи, первая часть ключа
+            handler: корутина, вызывается с ботом и аргументами из ключа
+            daily_at: время по Москве для ежедневной задачи, она планируется сама при запуске
+            misfire_grace: насколько задача может опоздать, None - выполняется при любом опоздании
+        """
+        if daily_at is not None and misfire_grace is None:
+            misfire_grace = DAILY_MISFIRE_GRACE
+        self._specs[name] = _JobSpec(handler=handler, daily_at=daily_at, misfire_grace=misfire_grace)
+
+    async def schedule(self, key: str, due_at: datetime) -> None:
+        """Schedule the job or move it to a new time. Can be called from any process."""
+        due_at = as_utc(due_at)
+        async with get_async_session() as session:
+            stmt = insert(ScheduledJobORM).values(key=key, due_at=due_at, updated_at=DatetimeProvider.provide())
+            await session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[ScheduledJobORM.key],
+                    set_={'due_at': stmt.excluded.due_at, 'updated_at': stmt.excluded.updated_at},
+                ),
+            )
+            await session.commit()
+        self._attempts.pop(key, None)
+        if self._running:
+            self._push(key, due_at)
+
+    async def unschedule(self, key: str) -> None:
+        async with get_async_session() as session:
+            await session.execute(delete(ScheduledJobORM).where(ScheduledJobORM.key == key))
+            await session.commit()
+        self._due.pop(key, None)
+        self._attempts.pop(key, None)
+
+    async def run(self, bot: Bot, resync_interval: float | None = None) -> None:
+        """
+        Args:
+            bot: передается в обработчики задач
+            resync_interval: как часто перечитывать задачи из базы, None - только при запуске.
+                Нужен, если задачи планируют другие процессы
+        """
+        self._running = True
+        loop = asyncio.get_running_loop()
+        try:
+            await self._load()
+            next_resync = loop.time() + resync_interval if resync_interval else None
+            while True:
+                self._wakeup.clear()
+                now = DatetimeProvider.provide()
+                job = self._peek()
+                if job is not None and job[0] <= now:
+                    heapq.heappop(self._heap)
+                    await self._run_job(bot, job[1], job[0], now)
+                    continue
+
+                timeout = (job[0] - now).total_seconds() if job else None
+                if next_resync is not None:
+                    resync_in = max(next_resync - loop.time(), 0)
+                    timeout = resync_in if timeout is None else min(timeout, resync_in)
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                except TimeoutError:
+                    pass
+                if resync_interval and next_resync is not None and loop.time() >= next_resync:
+                    await self._load()
+                    next_resync = loop.time() + resync_interval
+        finally:
+            self._running = False
+
+    async def _load(self) -> None:
+        """Rebuild the heap from the database, daily jobs without a row are scheduled for their next run."""
+        async with get_async_session() as session:
+            cursor = await session.execute(select(ScheduledJobORM.key, ScheduledJobORM.due_at))
+            rows = cursor.all()
+        self._heap = []
+        self._due = {}
+        for key, due_at in rows:
+            self._push(key, as_utc(due_at))
+
+        now = DatetimeProvider.provide()
+        for name, spec in self._specs.items():
+            if spec.daily_at is not None and name not in self._due:
+                await self.schedule(name, next_daily_run(spec.daily_at, now))
+        logger.info('Loaded %s scheduled jobs', len(self._due))
+
+    def _push(self, key: str, due_at: datetime) -> None:
+        self._due[key] = due_at
+        heapq.heappush(self._heap, (due_at, key))
+        self._wakeup.set()
+
+    def _peek(self) -> tuple[datetime, str] | None:
+        # Перепланированные и отмененные задачи остаются в куче, пропускаем их
+        while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0] if self._heap else None
+
+    async def _run_job(self, bot: Bot, key: str, due_at: datetime, now: datetime) -> None:
+        name, *arguments = key.split(':')
+        spec = self._specs.get(name)
+        if spec is None:
+            logger.warning('No handler for scheduled job %s, dropping it', key)
+            await self._finish(key, due_at)
+            return
+
+        if spec.misfire_grace is not None and now - due_at > spec.misfire_grace:
+            logger.warning('Scheduled job %s missed its time %s, skipping', key, due_at)
+        else:
+            logger.info('Running scheduled job %s', key)
+            try:
+                await spec.handler(bot, *arguments)
+            except Exception as e:
+                logger.error('Error in scheduled job %s: %s', key, e)
+                # Ежедневная задача просто ждет следующего дня, разовая повторяется несколько раз
+                attempts = self._attempts.get(key, 0) + 1
+                if spec.daily_at is None and self._due.get(key) == due_at:
+                    if attempts < JOB_MAX_ATTEMPTS:
+                        await self.schedule(key, now + JOB_RETRY_DELAY)
+                        self._attempts[key] = attempts
+                        return
+                    logger.error('Scheduled job %s failed %s times, dropping it', key, attempts)
+
+        if spec.daily_at is not None:
+            await self.schedule(key, next_daily_run(spec.daily_at, DatetimeProvider.provide()))
+        else:
+            await self._finish(key, due_at)
+
+    async def _finish(self, key: str, due_at: datetime) -> None:
+        """Delete a one-shot job unless it was rescheduled while running."""
+        if self._due.get(key) != due_at:
+            return
+        async with get_async_session() as session:
+            await session.execute(
+                delete(ScheduledJobORM).where(ScheduledJobORM.key == key, ScheduledJobORM.due_at == due_at),
+            )
+            await session.commit()
+        del self._due[key]
+        self._attempts.pop(key, None)
+
+
+@lru_cache(1)
+def get_scheduler() -> Scheduler:
+    return Scheduler()
+
+
+async def scheduler_task(bot: Bot, resync_interval: float | None = None) -> None:
+    """Background task running scheduled notifications."""
+    while True:
+        try:
+            await get_scheduler().run(bot, resync_interval)
+        except Exception as e:
+            logger.error('Error in scheduler_task: %s', e)
+            await asyncio.sleep(60)
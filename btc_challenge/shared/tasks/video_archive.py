@@ -0,0 +1,223 @@
+import asyncio
+import hashlib
+import logging
+import tempfile
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import PurePosixPath
+from typing import IO, Any
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest
+
+from btc_challenge.push_ups.adapters.sqlite.repository import PushUpRepository, VideoFingerprintRepository
+from btc_challenge.push_ups.domain.entity import ArchiveStatus
+from btc_challenge.shared.adapters.minio.storage import init_minio_storage
+from btc_challenge.shared.adapters.sqlite.session import get_async_session
+from btc_challenge.shared.providers import DatetimeProvider
+from btc_challenge.shared.storage import CHUNK_SIZE, IS3Storage
+from btc_challenge.stored_object.adapters.sqlite.repository import StoredObjectRepository
+from btc_challenge.stored_object.domain.entity import StoredObject
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_BATCH_SIZE = 20
+ARCHIVE_CONCURRENCY = 3
+ARCHIVE_POLL_INTERVAL = 60
+ARCHIVE_DOWNLOAD_TIMEOUT = 300
+ARCHIVE_PREFIX = 'videos/sha256/'
+ARCHIVE_GC_INTERVAL = 24 * 60 * 60
+ARCHIVE_GC_BATCH_SIZE = 100
+ARCHIVE_MAX_ATTEMPTS = 5
+ARCHIVE_RETRY_DELAY = timedelta(minutes=5)  # Удваивается после каждой неудачной попытки
+
+_archive_wakeup = asyncio.Event()
+
+
+def wake_video_archive() -> None:
+    """Tell the worker that new push-up videos were committed."""
+    _archive_wakeup.set()
+
+
+@dataclass
+class _DownloadStats:
+    size: int = 0
+    sha256: Any = field(default_factory=hashlib.sha256)
+
+
+async def _download_to_spool(bot: Bot, file_path: str, spool: IO[bytes]) -> _DownloadStats:
+    # Ключ объекта строится по хэшу, поэтому файл сначала скачивается во временный файл на диске
+    stats = _DownloadStats()
+    stream = bot.session.stream_content(
+        url=bot.session.api.file_url(bot.token, file_path),
+        timeout=ARCHIVE_DOWNLOAD_TIMEOUT,
+        raise_for_status=True,
+    )
+    async for chunk in stream:
+        stats.size += len(chunk)
+        stats.sha256.update(chunk)
+        await asyncio.to_thread(spool.write, chunk)
+    return stats
+
+
+async def _read_spool(spool: IO[bytes]) -> AsyncIterator[bytes]:
+    await asyncio.to_thread(spool.seek, 0)
+    while chunk := await asyncio.to_thread(spool.read, CHUNK_SIZE):
+        yield chunk
+
+
+def _content_key(content_hash: str, suffix: str) -> str:
+    return f'{ARCHIVE_PREFIX}{content_hash[:2]}/{content_hash}{suffix}'
+
+
+async def archive_video(bot: Bot, storage: IS3Storage, telegram_file_id: str) -> None:
+    """Copy one video from Telegram to the object store and link it to its push-ups."""
+    try:
+        file = await bot.get_file(telegram_file_id)
+    except TelegramBadRequest as e:
+        # Например, файл больше 20 МБ - Bot API его не отдает
+        logger.warning('Cannot archive video %s: %s', telegram_file_id, e)
+        async with get_async_session() as session:
+            await PushUpRepository(session).set_archive_status(telegram_file_id, ArchiveStatus.FAILED)
+            await session.commit()
+        return
+
+    file_path = PurePosixPath(file.file_path or '')
+    with await asyncio.to_thread(tempfile.TemporaryFile) as spool:
+        stats = await _download_to_spool(bot, str(file_path), spool)
+        content_hash = stats.sha256.hexdigest()
+        async with get_async_session() as session:
+            stored_object = await StoredObjectRepository(session).get_by_content_hash(content_hash)
+        if stored_object is None:
+            # Такое содержимое еще не хранится - загружаем, иначе новый подход просто ссылается на старый объект
+            storage_key = await storage.put_stream(_content_key(content_hash, file_path.suffix), _read_spool(spool))
+            stored_object = StoredObject.create(
+                file_name=file_path.name,
+                storage_key=storage_key,
+                size=stats.size,
+                extension=file_path.suffix.lstrip('.'),
+                content_hash=content_hash,
+            )
+
+    async with get_async_session() as session:
+        push_up_repository = PushUpRepository(session)
+        stored_object_repository = StoredObjectRepository(session)
+        fingerprint_repository = VideoFingerprintRepository(session)
+        # Параллельная загрузка того же содержимого могла создать объект первой - тогда ссылаемся на него
+        stored_object = await stored_object_repository.get_or_create(stored_object)
+        references = await push_up_repository.set_archive_status(
+            telegram_file_id,
+            ArchiveStatus.ARCHIVED,
+            stored_object_oid=stored_object.oid,
+        )
+        await stored_object_repository.add_references(stored_object.oid, references)
+        # Тот же файл, загруженный заново, получает новый file_unique_id, но совпадает по содержимому.
+        # Видео архивируются параллельно, поэтому помечаются все копии после самой ранней, а не только текущая
+        await fingerprint_repository.set_content_hash(file.file_unique_id, content_hash)
+        fingerprints = await fingerprint_repository.get_by_content_hash(content_hash)
+        if fingerprints:
+            original, *copies = fingerprints
+            for copy in copies:
+                push_up = await push_up_repository.get_by_oid(copy.push_up_oid)
+                if push_up and not push_up.is_duplicate:
+                    logger.warning('Video %s duplicates %s by content', copy.file_unique_id, original.file_unique_id)
+                    await push_up_repository.mark_duplicates(push_up.telegram_file_id)
+        else:
+            # Подходы с этим видео созданы до таблицы отпечатков - сравнивать не с чем
+            logger.info('No fingerprint for video %s, skipping the duplicate check', file.file_unique_id)
+        await session.commit()
+
+
+async def archive_videos_batch(bot: Bot, storage: IS3Storage, limit: int = ARCHIVE_BATCH_SIZE) -> int:
+    """Archive one batch of pending videos. Returns the number of videos archived, postponed or marked failed."""
+    async with get_async_session() as session:
+        pending = await PushUpRepository(session).get_pending_archive(limit)
+
+    # Одно видео может быть у нескольких подходов (штрафные дни) - загружаем его один раз
+    attempts: dict[str, int] = {}
+    for push_up in pending:
+        attempts[push_up.telegram_file_id] = max(attempts.get(push_up.telegram_file_id, 0), push_up.archive_attempts)
+    file_ids = list(attempts)
+    semaphore = asyncio.Semaphore(ARCHIVE_CONCURRENCY)
+
+    async def archive(telegram_file_id: str) -> None:
+        async with semaphore:
+            await archive_video(bot, storage, telegram_file_id)
+
+    results = await asyncio.gather(*(archive(file_id) for file_id in file_ids), return_exceptions=True)
+    processed = 0
+    for file_id, result in zip(file_ids, results, strict=True):
+        if isinstance(result, Exception):
+            logger.error('Failed to archive video %s: %s', file_id, result)
+            await _record_failure(file_id, attempts[file_id] + 1)
+        processed += 1
+    return processed
+
+
+async def _record_failure(telegram_file_id: str, attempt: int) -> None:
+    """Postpone the video with a growing delay, after `ARCHIVE_MAX_ATTEMPTS` mark it failed."""
+    async with get_async_session() as session:
+        repository = PushUpRepository(session)
+        if attempt >= ARCHIVE_MAX_ATTEMPTS:
+            logger.warning('Giving up archiving video %s after %s attempts', telegram_file_id, attempt)
+            await repository.set_archive_status(telegram_file_id, ArchiveStatus.FAILED)
+        else:
+            # Отложенные видео не выбираются в очередь, поэтому не загораживают новые
+            retry_at = DatetimeProvider.provide() + ARCHIVE_RETRY_DELAY * 2 ** (attempt - 1)
+            await repository.postpone_archive(telegram_file_id, retry_at)
+        await session.commit()
+
+
+async def sweep_stored_objects(storage: IS3Storage, limit: int = ARCHIVE_GC_BATCH_SIZE) -> int:
+    """Delete content-addressed objects that no push-up refers to. Returns the number of deleted objects."""
+    async with get_async_session() as session:
+        repository = StoredObjectRepository(session)
+        # Подходы удаляются вместе с пользователями каскадом, мимо счетчика - пересчитываем его перед сборкой
+        await repository.recount_references()
+        await session.commit()
+        unreferenced = await repository.get_unreferenced(limit)
+
+    deleted = 0
+    for stored_object in unreferenced:
+        # Транзакции короткие: запись в базу не должна ждать сетевого запроса к хранилищу
+        async with get_async_session() as session:
+            claimed = await StoredObjectRepository(session).claim_unreferenced(stored_object.oid)
+            await session.commit()
+        if not claimed:
+            continue
+        # Строка удаляется только после объекта. Если хранилище недоступно, пересчет ссылок при
+        # следующей сборке снимет отметку, и удаление повторится
+        await storage.delete(stored_object.storage_key)
+        async with get_async_session() as session:
+            await StoredObjectRepository(session).delete_claimed(stored_object.oid)
+            await session.commit()
+        deleted += 1
+    return deleted
+
+
+async def video_archive_task(bot: Bot) -> None:
+    """Background task mirroring push-up videos from Telegram into the object store."""
+    storage: IS3Storage | None = None
+    next_sweep = time.monotonic()
+    while True:
+        try:
+            if storage is None:
+                storage = await asyncio.to_thread(init_minio_storage)
+            _archive_wakeup.clear()
+            while await archive_videos_batch(bot, storage):
+                pass
+            # Сборка идет в той же задаче, что и архивация, поэтому не удалит объект, на который сейчас ссылаются
+            if time.monotonic() >= next_sweep:
+                deleted = await sweep_stored_objects(storage)
+                if deleted:
+                    logger.info('Deleted %s unreferenced stored objects', deleted)
+                next_sweep = time.monotonic() + ARCHIVE_GC_INTERVAL
+            try:
+                await asyncio.wait_for(_archive_wakeup.wait(), timeout=ARCHIVE_POLL_INTERVAL)
+            except TimeoutError:
+                pass
+        except Exception as e:
+            logger.error('Error in video_archive_task: %s', e)
+            await asyncio.sleep(60)
@@ -11,6 +11,8 @@ class SqliteStoredObjectMapper:
             storage_key=stored_object_orm.storage_key,
             size=stored_object_orm.size,
             extension=stored_object_orm.extension,
+            content_hash=stored_object_orm.content_hash,
+            ref_count=stored_object_orm.ref_count,
             created_at=stored_object_orm.created_at,
             updated_at=stored_object_orm.updated_at,
         )
@@ -23,6 +25,22 @@ class SqliteStoredObjectMapper:
             storage_key=stored_object.storage_key,
             size=stored_object.size,
             extension=stored_object.extension,
+            content_hash=stored_object.content_hash,
+            ref_count=stored_object.ref_count,
             created_at=stored_object.created_at,
             updated_at=stored_object.updated_at,
         )
+
+    @classmethod
+    def to_values(cls, stored_object: StoredObject) -> dict:
+        return {
+            'oid': stored_object.oid,
+            'file_name': stored_object.file_name,
+            'storage_key': stored_object.storage_key,
+            'size': stored_object.size,
+            'extension': stored_object.extension,
+            'content_hash': stored_object.content_hash,
+            'ref_count': stored_object.ref_count,
+            'created_at': stored_object.created_at,
+            'updated_at': stored_object.updated_at,
+        }
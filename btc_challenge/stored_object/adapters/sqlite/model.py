@@ -1,4 +1,5 @@
-from sqlalchemy.orm import Mapped
+from sqlalchemy import Index
+from sqlalchemy.orm import Mapped, mapped_column
 
 from btc_challenge.shared.adapters.sqlite.mixins import DatetimeMixin, IdentityMixin
 from btc_challenge.shared.adapters.sqlite.models import BaseORM
@@ -6,8 +7,15 @@ from btc_challenge.shared.adapters.sqlite.models import BaseORM
 
 class StoredObjectORM(BaseORM, IdentityMixin, DatetimeMixin):
     __tablename__ = 'stored_object'
+    __table_args__ = (
+        # Одно содержимое хранится один раз
+        Index('ix_stored_object_content_hash', 'content_hash', unique=True),
+        Index('ix_stored_object_ref_count', 'ref_count'),
+    )
 
     file_name: Mapped[str]
     storage_key: Mapped[str]
     size: Mapped[int]
     extension: Mapped[str]
+    content_hash: Mapped[str | None]
+    ref_count: Mapped[int] = mapped_column(default=0, server_default='0')
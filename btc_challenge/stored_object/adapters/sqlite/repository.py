@@ -1,13 +1,20 @@
+from typing import cast
 from uuid import UUID
 
-from sqlalchemy import delete, select
+from sqlalchemy import CursorResult, delete, func, select, update
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from btc_challenge.push_ups.adapters.sqlite.model import PushUpORM
+from btc_challenge.shared.providers import DatetimeProvider
 from btc_challenge.stored_object.adapters.sqlite.mapper import SqliteStoredObjectMapper
 from btc_challenge.stored_object.adapters.sqlite.model import StoredObjectORM
 from btc_challenge.stored_object.domain.entity import StoredObject
 from btc_challenge.stored_object.domain.repository import IStoredObjectRepository
 
+# Счетчик ссылок объекта, который сейчас удаляется из хранилища
+_DELETING_REF_COUNT = -1
+
 
 class StoredObjectRepository(IStoredObjectRepository):
     def __init__(self, session: AsyncSession):
@@ -33,3 +40,65 @@ class StoredObjectRepository(IStoredObjectRepository):
         cursor = await self._session.execute(query)
         rows = cursor.scalars().all()
         return [self._mapper.to_entity(row) for row in rows]
+
+    async def get_by_content_hash(self, content_hash: str) -> StoredObject | None:
+        query = select(StoredObjectORM).where(StoredObjectORM.content_hash == content_hash)
+        cursor = await self._session.execute(query)
+        row = cursor.scalar_one_or_none()
+        return self._mapper.to_entity(row) if row else None
+
+    async def get_or_create(self, stored_object: StoredObject) -> StoredObject:
+        query = insert(StoredObjectORM).on_conflict_do_nothing(index_elements=[StoredObjectORM.content_hash])
+        await self._session.execute(query, self._mapper.to_values(stored_object))
+        if stored_object.content_hash is None:
+            return stored_object
+        existing = await self.get_by_content_hash(stored_object.content_hash)
+        return existing or stored_object
+
+    async def add_references(self, oid: UUID, count: int) -> None:
+        query = (
+            update(StoredObjectORM)
+            .where(StoredObjectORM.oid == oid)
+            .values(ref_count=StoredObjectORM.ref_count + count, updated_at=DatetimeProvider.provide())
+        )
+        await self._session.execute(query)
+
+    async def recount_references(self) -> None:
+        references = (
+            select(func.count())
+            .where(PushUpORM.stored_object_oid == StoredObjectORM.oid)
+            .correlate(StoredObjectORM)
+            .scalar_subquery()
+        )
+        query = (
+            update(StoredObjectORM)
+            .where(StoredObjectORM.content_hash.is_not(None))
+            .values(ref_count=references)
+        )
+        await self._session.execute(query)
+
+    async def get_unreferenced(self, limit: int = 100) -> list[StoredObject]:
+        query = (
+            select(StoredObjectORM)
+            .where(StoredObjectORM.ref_count == 0, StoredObjectORM.content_hash.is_not(None))
+            .limit(limit)
+        )
+        cursor = await self._session.execute(query)
+        rows = cursor.scalars().all()
+        return [self._mapper.to_entity(row) for row in rows]
+
+    async def claim_unreferenced(self, oid: UUID) -> bool:
+        query = (
+            update(StoredObjectORM)
+            .where(StoredObjectORM.oid == oid, StoredObjectORM.ref_count == 0)
+            .values(ref_count=_DELETING_REF_COUNT, updated_at=DatetimeProvider.provide())
+        )
+        cursor = cast(CursorResult, await self._session.execute(query))
+        return cursor.rowcount > 0
+
+    async def delete_claimed(self, oid: UUID) -> None:
+        query = delete(StoredObjectORM).where(
+            StoredObjectORM.oid == oid,
+            StoredObjectORM.ref_count == _DELETING_REF_COUNT,
+        )
+        await self._session.execute(query)
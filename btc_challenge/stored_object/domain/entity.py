@@ -12,11 +12,20 @@ class StoredObject:
     storage_key: str
     size: int
     extension: str
+    content_hash: str | None  # sha256 содержимого, по нему строится storage_key
+    ref_count: int  # Сколько подходов ссылаются на объект, 0 - кандидат на удаление
     created_at: datetime
     updated_at: datetime
 
     @classmethod
-    def create(cls, file_name: str, storage_key: str, size: int, extension: str) -> 'StoredObject':
+    def create(
+        cls,
+        file_name: str,
+        storage_key: str,
+        size: int,
+        extension: str,
+        content_hash: str | None = None,
+    ) -> 'StoredObject':
         now = DatetimeProvider.provide()
         return cls(
             oid=uuid4(),
@@ -24,6 +33,8 @@ class StoredObject:
             storage_key=storage_key,
             size=size,
             extension=extension,
+            content_hash=content_hash,
+            ref_count=0,
             created_at=now,
             updated_at=now,
         )
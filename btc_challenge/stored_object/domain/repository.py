@@ -16,3 +16,32 @@ class IStoredObjectRepository(ABC):
 
     @abstractmethod
     async def get_many(self, limit: int = 100, offset: int = 0) -> list[StoredObject]: ...
+
+    @abstractmethod
+    async def get_by_content_hash(self, content_hash: str) -> StoredObject | None: ...
+
+    @abstractmethod
+    async def get_or_create(self, stored_object: StoredObject) -> StoredObject:
+        """Return the object with the same content hash, creating `stored_object` if there is none."""
+
+    @abstractmethod
+    async def add_references(self, oid: UUID, count: int) -> None: ...
+
+    @abstractmethod
+    async def recount_references(self) -> None:
+        """Recompute reference counts from the push-ups that link to each object."""
+
+    @abstractmethod
+    async def get_unreferenced(self, limit: int = 100) -> list[StoredObject]:
+        """Content-addressed objects that no push-up links to."""
+
+    @abstractmethod
+    async def claim_unreferenced(self, oid: UUID) -> bool:
+        """Mark the object as being deleted if it is still unreferenced, returns whether it was marked.
+
+        A marked object is not returned by `get_unreferenced` until `recount_references` resets it.
+        """
+
+    @abstractmethod
+    async def delete_claimed(self, oid: UUID) -> None:
+        """Delete the row of an object marked by `claim_unreferenced`."""
@@ -1,19 +1,55 @@
 import asyncio
+import logging
+from datetime import time
 
 from aiogram import Bot
 
-from btc_challenge.shared.tasks.daily_notification import daily_notification_task
-from btc_challenge.shared.tasks.event_daily_notification import event_daily_notification_task
-from btc_challenge.shared.tasks.event_notification import event_notification_task
-from btc_challenge.shared.tasks.event_reminder import event_reminder_task
+from btc_challenge.shared.tasks.daily_notification import daily_notification_job
+from btc_challenge.shared.tasks.event_daily_notification import send_event_daily_notification
+from btc_challenge.shared.tasks.event_notification import (
+    EVENT_REMINDER_JOB,
+    EVENT_START_JOB,
+    event_reminder_job,
+    event_start_job,
+    schedule_pending_event_jobs,
+)
+from btc_challenge.shared.tasks.event_reminder import send_pushup_reminder_to_inactive_participants
+from btc_challenge.shared.tasks.outbox import outbox_worker_task
+from btc_challenge.shared.tasks.scheduler import get_scheduler, scheduler_task
+from btc_challenge.shared.tasks.video_archive import video_archive_task
 
+logger = logging.getLogger(__name__)
 
-def init_tasks(bot: Bot) -> None:
+
+def init_scheduler() -> None:
+    scheduler = get_scheduler()
+    # Время ежедневных задач - по Москве
+    scheduler.register('daily_report', daily_notification_job, daily_at=time(0, 5))
+    scheduler.register('event_daily_notification', send_event_daily_notification, daily_at=time(8, 0))
+    scheduler.register('event_inactive_reminder', send_pushup_reminder_to_inactive_participants, daily_at=time(20, 0))
+    scheduler.register(EVENT_REMINDER_JOB, event_reminder_job)
+    scheduler.register(EVENT_START_JOB, event_start_job)
+
+
+async def run_scheduler(bot: Bot, resync_interval: float | None) -> None:
+    try:
+        # Задачи ивентов, созданных до обновления или без запущенного планировщика
+        await schedule_pending_event_jobs()
+    except Exception as e:
+        logger.error('Failed to schedule pending events: %s', e)
+    await scheduler_task(bot, resync_interval)
+
+
+def init_tasks(bot: Bot, resync_interval: float | None = None) -> list[asyncio.Task[None]]:
+    """
+    Args:
+        bot: экземпляр бота
+        resync_interval: как часто планировщик перечитывает задачи из базы, если ивенты создают другие процессы
+    """
+    init_scheduler()
     tasks = [
-        daily_notification_task(bot),
-        event_notification_task(bot),
-        event_daily_notification_task(bot),
-        event_reminder_task(bot),
+        run_scheduler(bot, resync_interval),
+        outbox_worker_task(bot),
+        video_archive_task(bot),
     ]
-    for task in tasks:
-        asyncio.create_task(task)
+    return [asyncio.create_task(task) for task in tasks]
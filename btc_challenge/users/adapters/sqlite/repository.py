@@ -1,9 +1,12 @@
+from dataclasses import asdict
 from datetime import datetime
 from uuid import UUID
 
 from sqlalchemy import Select, select
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from btc_challenge.shared.errors import ObjectAlreadyExistsError
 from btc_challenge.users.adapters.sqlite.mapper import SqliteUserMapper
 from btc_challenge.users.adapters.sqlite.model import UserORM
 from btc_challenge.users.domain.entity import User
@@ -23,6 +26,23 @@ class UserRepository(IUserRepository):
         orm = self._mapper.to_model(user)
         await self._session.merge(orm)
 
+    async def get_or_create(self, user: User) -> tuple[User, bool]:
+        existing_user = await self.get_by_telegram_id(user.telegram_id)
+        if existing_user:
+            return existing_user, False
+
+        query = insert(UserORM).values(**asdict(user)).on_conflict_do_nothing().returning(UserORM)
+        cursor = await self._session.execute(query)
+        row = cursor.scalar_one_or_none()
+        if row:
+            return self._mapper.to_entity(row), True
+
+        # Registered concurrently, or the username is taken by another telegram_id
+        existing_user = await self.get_by_telegram_id(user.telegram_id)
+        if not existing_user:
+            raise ObjectAlreadyExistsError
+        return existing_user, False
+
     async def _get_by(self, query: Select[tuple[UserORM]]) -> User | None:
         cursor = await self._session.execute(query)
         row = cursor.scalar_one_or_none()
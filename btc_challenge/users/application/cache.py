@@ -0,0 +1,22 @@
+from functools import lru_cache
+
+from btc_challenge.config import AppConfig
+from btc_challenge.shared.cache import TTLCache
+from btc_challenge.users.domain.entity import User
+
+USER_CACHE_SIZE = 1024
+USER_CACHE_TTL = 5 * 60
+# Вебхук с несколькими процессами: верификация в другом процессе видна через это время
+USER_CACHE_MULTIPROCESS_TTL = 5.0
+
+
+class UserCache(TTLCache[int, User]):
+    """Users keyed by telegram_id, filled by UserMiddleware and invalidated by user interactors."""
+
+    def __init__(self, maxsize: int = USER_CACHE_SIZE, ttl: float = USER_CACHE_TTL):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+
+
+@lru_cache(1)
+def get_user_cache() -> UserCache:
+    return UserCache(ttl=USER_CACHE_MULTIPROCESS_TTL if AppConfig.webhook.multiprocess else USER_CACHE_TTL)
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 
 from btc_challenge.shared.application.commiter import ICommiter
+from btc_challenge.shared.errors import ObjectAlreadyExistsError
 from btc_challenge.users.domain.entity import User
 from btc_challenge.users.domain.repository import IUserRepository
 
@@ -19,7 +20,10 @@ class CreateUserInteractor:
             msg = "Username cannot be empty"
             raise ValueError(msg)
 
-        user = User.create(telegram_id=user_id, username=username)
-        await self.user_repository.create(user)
+        user, is_created = await self.user_repository.get_or_create(
+            User.create(telegram_id=user_id, username=username),
+        )
+        if not is_created:
+            raise ObjectAlreadyExistsError
         await self.commiter.commit()
         return user
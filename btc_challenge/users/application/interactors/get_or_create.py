@@ -0,0 +1,27 @@
+from dataclasses import dataclass
+
+from btc_challenge.shared.application.commiter import ICommiter
+from btc_challenge.users.domain.entity import User
+from btc_challenge.users.domain.repository import IUserRepository
+
+
+@dataclass
+class GetOrCreateUserInteractor:
+    user_repository: IUserRepository
+    commiter: ICommiter
+
+    async def execute(self, user_id: int, username: str) -> tuple[User, bool]:
+        if user_id <= 0:
+            msg = "User id must be positive"
+            raise ValueError(msg)
+
+        if not username or not username.strip():
+            msg = "Username cannot be empty"
+            raise ValueError(msg)
+
+        user, is_created = await self.user_repository.get_or_create(
+            User.create(telegram_id=user_id, username=username),
+        )
+        if is_created:
+            await self.commiter.commit()
+        return user, is_created
@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from btc_challenge.shared.application.commiter import ICommiter
 from btc_challenge.shared.errors import ObjectNotFoundError
 from btc_challenge.shared.providers import DatetimeProvider
+from btc_challenge.users.application.cache import UserCache
 from btc_challenge.users.domain.repository import IUserRepository
 
 
@@ -10,6 +11,7 @@ from btc_challenge.users.domain.repository import IUserRepository
 class VerifyUserInteractor:
     user_repository: IUserRepository
     commiter: ICommiter
+    user_cache: UserCache
 
     async def execute(self, telegram_id: int, is_verified: bool) -> None:
         user = await self.user_repository.get_by_telegram_id(telegram_id)
@@ -21,3 +23,4 @@ class VerifyUserInteractor:
         user.updated_at = DatetimeProvider.provide()
         await self.user_repository.update(user)
         await self.commiter.commit()
+        self.user_cache.invalidate(telegram_id)
@@ -12,6 +12,11 @@ class IUserRepository(ABC):
     @abstractmethod
     async def update(self, user: User) -> None: ...
 
+    @abstractmethod
+    async def get_or_create(self, user: User) -> tuple[User, bool]:
+        """Returns the user with the same telegram_id, inserting `user` if there is none yet"""
+        ...
+
     @abstractmethod
     async def get_by_oid(self, oid: UUID) -> User | None: ...
 
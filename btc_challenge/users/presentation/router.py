@@ -1,6 +1,6 @@
 from aiogram import Router, filters, types
-from punq import Container
 
+from btc_challenge.container import RequestContainer
 from btc_challenge.shared.errors import ObjectAlreadyExistsError
 from btc_challenge.shared.presentation.commands import Commands
 from btc_challenge.users.application.interactors.create import CreateUserInteractor
@@ -9,7 +9,7 @@ user_router = Router()
 
 
 @user_router.message(filters.Command(Commands.START))
-async def cmd_start(message: types.Message, container: Container) -> None:
+async def cmd_start(message: types.Message, container: RequestContainer) -> None:
     if not message.from_user:
         return
     user_id, username = message.from_user.id, message.from_user.username
@@ -1,7 +1,8 @@
 from aiogram import Bot, F, Router, filters, types
-from punq import Container
 
 from btc_challenge.config import AppConfig
+from btc_challenge.container import RequestContainer
+from btc_challenge.shared.adapters.telegram.broadcast import get_broadcaster
 from btc_challenge.shared.errors import ObjectNotFoundError
 from btc_challenge.shared.presentation.commands import Commands
 from btc_challenge.users.application.interactors.verify import VerifyUserInteractor
@@ -11,7 +12,7 @@ verification_router = Router()
 
 
 @verification_router.message(filters.Command(Commands.CONFIRMATION))
-async def cmd_confirmation(message: types.Message, bot: Bot, container: Container) -> None:
+async def cmd_confirmation(message: types.Message, bot: Bot, container: RequestContainer) -> None:
     if not message.from_user:
         return
 
@@ -49,22 +50,18 @@ async def cmd_confirmation(message: types.Message, bot: Bot, container: Containe
     admin_message = (
         f"🔔 Запрос на верификацию\n\nUser ID: {user_id}\nUsername: @{username}\nИмя: {message.from_user.full_name}"
     )
-    for admin_id in AppConfig.telegram.admin_ids:
-        try:
-            await bot.send_message(
-                chat_id=admin_id,
-                text=admin_message,
-                reply_markup=keyboard,
-            )
-        except Exception:
-            # Admin might have blocked the bot or chat doesn't exist
-            pass
+    # Admin might have blocked the bot or chat doesn't exist, failures are ignored
+    await get_broadcaster(bot).send_message(
+        AppConfig.telegram.admin_ids,
+        text=admin_message,
+        reply_markup=keyboard,
+    )
 
     await message.answer("Запрос на верификацию отправлен администраторам. Ожидай подтверждения.")
 
 
 @verification_router.callback_query(F.data.startswith("verify_"))
-async def process_verification(callback: types.CallbackQuery, bot: Bot, container: Container) -> None:
+async def process_verification(callback: types.CallbackQuery, bot: Bot, container: RequestContainer) -> None:
     if not callback.data or not callback.from_user or not callback.message:
         return
 
@@ -0,0 +1,11 @@
+import os
+
+# Настройки, без которых не импортируется btc_challenge.config. Тесты не ходят в Telegram и MinIO
+for key, value in {
+    'BOT_TOKEN': '1:test',
+    'MINIO_BUCKET_NAME': 'test',
+    'MINIO_HOST': 'localhost:9000',
+    'MINIO_ACCESS_KEY': 'test',
+    'MINIO_SECRET_KEY': 'test',
+}.items():
+    os.environ.setdefault(key, value)
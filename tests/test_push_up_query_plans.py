@@ -0,0 +1,125 @@
+import sqlite3
+import tempfile
+import unittest
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from btc_challenge.config import AppConfig
+from btc_challenge.push_ups.adapters.sqlite.model import PushUpStreakORM
+from btc_challenge.push_ups.adapters.sqlite.repository import PushUpRepository
+from btc_challenge.users.adapters.sqlite.model import UserORM
+
+ROOT = Path(__file__).resolve().parents[1]
+PUSH_UP_INDEXES = ('ix_push_up_user_oid_created_at', 'ix_push_up_created_at')
+
+
+class PushUpQueryPlanTest(unittest.IsolatedAsyncioTestCase):
+    """The stats queries must stay index range scans over push_up as the table grows."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls._database_path = str(Path(cls._tmp.name) / 'test.db')
+        cls._original_path = AppConfig.sqlite.database_path
+        AppConfig.sqlite.database_path = cls._database_path
+        config = Config(str(ROOT / 'alembic.ini'))
+        config.set_main_option('script_location', str(ROOT / 'alembic'))
+        command.upgrade(config, 'head')
+
+        cls._user_oid = uuid4()
+        engine = create_engine(AppConfig.sqlite.sync_url)
+        with engine.begin() as connection:
+            connection.execute(
+                insert(UserORM).values(
+                    oid=cls._user_oid,
+                    telegram_id=1,
+                    username='user',
+                    is_verified=True,
+                    created_at=datetime.now(UTC),
+                    updated_at=datetime.now(UTC),
+                ),
+            )
+        engine.dispose()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        AppConfig.sqlite.database_path = cls._original_path
+        cls._tmp.cleanup()
+
+    async def asyncSetUp(self) -> None:
+        self._engine = create_async_engine(f'sqlite+aiosqlite:///{self._database_path}')
+        self._statements: list[tuple[str, tuple]] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001
+            if statement.lstrip().upper().startswith('SELECT'):
+                self._statements.append((statement, parameters))
+
+        event.listen(self._engine.sync_engine, 'before_cursor_execute', record)
+        self._session = AsyncSession(self._engine)
+
+    async def asyncTearDown(self) -> None:
+        await self._session.close()
+        await self._engine.dispose()
+
+    def _plans(self) -> list[str]:
+        self.assertTrue(self._statements)
+        with sqlite3.connect(self._database_path) as connection:
+            return [
+                ' | '.join(row[3] for row in connection.execute(f'EXPLAIN QUERY PLAN {statement}', parameters))
+                for statement, parameters in self._statements
+            ]
+
+    def assert_index_only_range(self, plans: list[str], indexes: tuple[str, ...] = PUSH_UP_INDEXES) -> None:
+        for plan in plans:
+            with self.subTest(plan=plan):
+                self.assertNotIn('SCAN push_up', plan)
+                self.assertNotIn('USE TEMP B-TREE', plan)
+                self.assertTrue(any(index in plan for index in indexes), plan)
+
+    async def test_get_by_user_oid_and_date(self) -> None:
+        now = datetime.now(UTC)
+        await PushUpRepository(self._session).get_by_user_oid_and_date(self._user_oid, now - timedelta(days=1), now)
+        self.assert_index_only_range(self._plans())
+
+    async def test_get_by_user_oids_and_date(self) -> None:
+        now = datetime.now(UTC)
+        await PushUpRepository(self._session).get_by_user_oids_and_date(
+            [self._user_oid, uuid4()],
+            now - timedelta(days=1),
+            now,
+        )
+        self.assert_index_only_range(self._plans())
+
+    async def test_get_many(self) -> None:
+        now = datetime.now(UTC)
+        await PushUpRepository(self._session).get_many(now - timedelta(days=1), now)
+        self.assert_index_only_range(self._plans())
+
+    async def test_get_missed_days(self) -> None:
+        # Серия начинается позже ивента - нужен поиск по дневным суммам до нее
+        today = date.today()
+        await self._session.execute(
+            insert(PushUpStreakORM).values(
+                user_oid=self._user_oid,
+                first_day=today - timedelta(days=2),
+                last_day=today - timedelta(days=1),
+            ),
+        )
+        start = datetime.now(UTC) - timedelta(days=10)
+        await PushUpRepository(self._session).get_missed_days(self._user_oid, start)
+        plans = self._plans()
+        self.assertEqual(len(plans), 2)
+        self.assert_index_only_range(
+            plans,
+            indexes=('sqlite_autoindex_push_up_streaks_1', 'sqlite_autoindex_daily_push_up_totals_1'),
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()